@@ -0,0 +1,94 @@
+import json
+import os
+
+from django.conf import settings
+from PIL import features
+
+from utils.media import make_renditions
+
+AVATAR_RENDITION_SIZES = tuple(sorted(
+    getattr(settings, 'AVATAR_RENDITION_SIZES', (64, 128, 256))))
+AVATAR_RENDITION_FORMAT = getattr(settings, 'AVATAR_RENDITION_FORMAT', 'WEBP')
+
+EXTENSIONS = {'WEBP': 'webp', 'JPEG': 'jpg'}
+
+
+def rendition_format():
+    # WebP needs a Pillow built with libwebp, JPEG always works
+    if AVATAR_RENDITION_FORMAT == 'WEBP' and not features.check('webp'):
+        return 'JPEG'
+    return AVATAR_RENDITION_FORMAT
+
+
+def parse_size(value):
+    """
+    The rendition edge asked for by a ``?size=`` value, None when absent
+    or not a positive number.
+    """
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return None
+    return size if size > 0 else None
+
+
+def parse_renditions(value):
+    """
+    ``{edge: storage name}`` from the JSON of ``Profile.avatar_renditions``.
+    """
+    try:
+        renditions = json.loads(value or '{}')
+    except ValueError:
+        return {}
+    return {int(size): name for size, name in renditions.items()}
+
+
+def get_renditions(profile):
+    """
+    ``{edge: storage name}`` of the renditions of the avatar of
+    ``profile``, empty until the rendition job has run.
+    """
+    return parse_renditions(profile.avatar_renditions)
+
+
+def rendition_name(original, renditions, size=None):
+    """
+    Storage name of the avatar to show at ``size`` pixels, given the name
+    of the ``original`` and the JSON of its ``renditions``: the smallest
+    rendition at least that large, else the largest one. Without a size,
+    or before the renditions exist, it is the original.
+    """
+    if not original:
+        return None
+    renditions = parse_renditions(renditions) if size is not None else {}
+    if not renditions:
+        return original
+    fitting = [edge for edge in sorted(renditions) if edge >= size]
+    return renditions[fitting[0] if fitting else max(renditions)]
+
+
+def avatar_name(profile, size=None):
+    """
+    ``rendition_name()`` of the avatar of ``profile``.
+    """
+    if profile is None:
+        return None
+    return rendition_name(
+        profile.avatar.name, profile.avatar_renditions, size)
+
+
+def save_renditions(profile):
+    """
+    Store the renditions of the avatar of ``profile`` next to it under
+    ``avatars/`` and return their ``{edge: storage name}``.
+    """
+    image_format = rendition_format()
+    storage = profile.avatar.storage
+    stem, _ = os.path.splitext(profile.avatar.name)
+    renditions = make_renditions(
+        profile.avatar, AVATAR_RENDITION_SIZES, image_format)
+    return {
+        size: storage.save(
+            '{}_{}.{}'.format(stem, size, EXTENSIONS[image_format]), content)
+        for size, content in renditions.items()
+    }
@@ -1,6 +1,34 @@
 from django.contrib.auth.base_user import BaseUserManager
+from django.db.models import Q, QuerySet
 
-class UserManager(BaseUserManager):
+
+# indexed for a prefix match: by their unique or user_*_idx index on MySQL,
+# whose collation is case-insensitive, by the user_*_upper_idx expression
+# indexes on PostgreSQL, where istartswith compares UPPER(col)
+SEARCH_FIELDS = ('email', 'first_name', 'last_name', 'oin')
+
+
+class UserQuerySet(QuerySet):
+
+    def search(self, term):
+        """
+        Users with ``term`` as a case-insensitive prefix of one of
+        ``SEARCH_FIELDS``. Prefix only: ``LIKE 'term%'`` can use the
+        indexes, a contains match can not.
+        """
+        match = Q()
+        for field in SEARCH_FIELDS:
+            match |= Q(**{'{}__istartswith'.format(field): term})
+        return self.filter(match)
+
+    def with_role(self, role):
+        """
+        Users whose profile has ``role``, joined into the same query.
+        """
+        return self.filter(profile__role=role)
+
+
+class UserManager(BaseUserManager.from_queryset(UserQuerySet)):
     use_in_migrations = True
 
     def _create_user(self, email, password, **extra_fields):
@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.20 on 2026-10-18 07:40
+from __future__ import unicode_literals
+
+import json
+
+from django.db import migrations, models
+
+
+def queue_avatar_renditions(apps, schema_editor):
+    # avatars stored before renditions existed get them from the worker
+    Profile = apps.get_model('account', 'Profile')
+    Job = apps.get_model('jobs', 'Job')
+    Job.objects.bulk_create([
+        Job(
+            task='account.avatar_renditions',
+            payload=json.dumps({'profile_id': str(pk)}),
+        )
+        for pk in Profile.objects.exclude(avatar='').exclude(
+            avatar__isnull=True).values_list('pk', flat=True)
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0001_initial'),
+        ('jobs', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='avatar_renditions',
+            field=models.TextField(blank=True, default='{}', verbose_name='avatar renditions'),
+        ),
+        migrations.RunPython(
+            queue_avatar_renditions, migrations.RunPython.noop),
+    ]
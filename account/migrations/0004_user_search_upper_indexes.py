@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+# PostgreSQL compiles istartswith to UPPER("col"::text) LIKE UPPER(%s),
+# which only an index on that very expression can serve, with the pattern
+# operator class so that LIKE can use it outside the C locale
+INDEX_NAME = 'user_{}_upper_idx'
+# account.managers.SEARCH_FIELDS
+SEARCH_FIELDS = ('email', 'first_name', 'last_name', 'oin')
+
+
+def create_upper_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        # MySQL compares with a case-insensitive collation, the plain
+        # indexes of 0003 serve the prefix match there
+        return
+    table = apps.get_model('account', 'User')._meta.db_table
+    for field in SEARCH_FIELDS:
+        schema_editor.execute(
+            'CREATE INDEX {} ON {} (UPPER({}::text) text_pattern_ops)'.format(
+                schema_editor.quote_name(INDEX_NAME.format(field)),
+                schema_editor.quote_name(table),
+                schema_editor.quote_name(field),
+            ))
+
+
+def drop_upper_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field in SEARCH_FIELDS:
+        schema_editor.execute('DROP INDEX IF EXISTS {}'.format(
+            schema_editor.quote_name(INDEX_NAME.format(field))))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('account', '0003_user_search_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_upper_indexes, drop_upper_indexes),
+    ]
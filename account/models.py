@@ -5,7 +5,7 @@ from django.db import models
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save, post_delete
 from django.dispatch import receiver
 from django.core.urlresolvers import reverse
 
@@ -13,6 +13,8 @@ from django.core.urlresolvers import reverse
 from .managers import UserManager
 from utils.helper import generate_oin
 from utils.constants import ROLES
+from utils.roles import invalidate_role
+from utils.denylist import token_denylist
 
 # Create your models here.
 
@@ -39,6 +41,16 @@ class User(AbstractBaseUser, PermissionsMixin):
         verbose_name = _('user')
         verbose_name_plural = _('users')
         ordering = ['date_joined',]
+        indexes = [
+            # prefix search of the admin user list (UserQuerySet.search),
+            # email and oin are covered by their unique indexes
+            models.Index(fields=['first_name'], name='user_first_name_idx'),
+            models.Index(fields=['last_name'], name='user_last_name_idx'),
+            # keyset pages of the admin user list
+            models.Index(
+                fields=['is_staff', 'created_at', 'id'],
+                name='user_staff_created_idx'),
+        ]
 
     def get_full_name(self):
         full_name = '{} {}'.format(self.first_name, self.last_name)
@@ -53,6 +65,8 @@ class User(AbstractBaseUser, PermissionsMixin):
 
 # to avoid circular import
 from utils.base_model import BaseModel
+from utils.media import remember_file, file_changed
+from jobs.queue import enqueue
 
 
 class Profile(BaseModel):
@@ -68,10 +82,18 @@ class Profile(BaseModel):
     avatar = models.ImageField(_('avatar'), max_length=1024, upload_to="avatars/", 
                                 null=True, blank=True,
                                 help_text="max size should be 10 MB")
+    # JSON {edge: storage name} of the resized copies of the avatar, made
+    # by a background job (account.tasks), see account.avatars
+    avatar_renditions = models.TextField(_('avatar renditions'), blank=True,
+                                         default='{}')
 
     class Meta():
         verbose_name = _('profile')
         verbose_name_plural = _('profile')
+        indexes = [
+            # role filter of the admin user list, joined on user
+            models.Index(fields=['role', 'user'], name='profile_role_user_idx'),
+        ]
 
     def __str__(self):
         return '{}'.format(self.user)
@@ -89,7 +111,8 @@ class ProfileSetting(BaseModel):
 
 @receiver(post_save, sender=User)
 def create_profile(sender, instance, created, **kwargs):
-    if created:
+    # account.services.create_account inserts the profile itself
+    if created and not getattr(instance, '_skip_profile_signal', False):
         if instance.is_superuser:
             # admin
             Profile.objects.create(user=instance, role=3)
@@ -98,8 +121,29 @@ def create_profile(sender, instance, created, **kwargs):
             Profile.objects.create(user=instance, role=1)
 
 
+@receiver(post_save, sender=User)
+def revoke_inactive_user_tokens(sender, instance, created, **kwargs):
+    if not created and not instance.is_active:
+        token_denylist.revoke_user(instance.pk)
+
+
 @receiver(post_save, sender=Profile)
 def initialize_profile_settings(sender, instance, created, *args, **kwargs):
-    if created:
+    if created and not getattr(instance, '_skip_profile_signal', False):
         ProfileSetting.objects.create(profile=instance)
 
+
+@receiver([post_save, post_delete], sender=Profile)
+def invalidate_profile_role(sender, instance, **kwargs):
+    invalidate_role(instance.user_id)
+
+
+@receiver(post_init, sender=Profile)
+def remember_profile_avatar(sender, instance, **kwargs):
+    remember_file(instance, 'avatar')
+
+
+@receiver(post_save, sender=Profile)
+def queue_avatar_renditions(sender, instance, created, **kwargs):
+    if file_changed(instance, 'avatar', created):
+        enqueue('account.avatar_renditions', profile_id=instance.pk)
@@ -1,18 +1,33 @@
 # restframework imports
 from rest_framework import serializers
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework.validators import UniqueValidator
 #jwt
 from rest_framework_simplejwt.serializers import (
     TokenObtainPairSerializer,
+    TokenRefreshSerializer,
 )
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
 # djnago imports
 from django.contrib.auth import get_user_model
 from django.contrib.auth.hashers import check_password
+from django.utils.translation import ugettext_lazy as _
 #utils
 from utils import res_codes
+from utils.constants import (
+    ROLE_CLAIM, EMAIL_CLAIM, IS_ACTIVE_CLAIM, INSTRUCTOR, ADMIN, ROLES,
+)
+from utils.denylist import token_denylist
+from utils.projection import ValuesProjection
+from utils.roles import get_cached_role
+from utils.storage_urls import storage_url_cache
 
 # in house apps import
+from .avatars import avatar_name, parse_size, rendition_name
 from .models import Profile
+from .services import create_account
 
 User = get_user_model()
 
@@ -55,22 +70,8 @@ class UserCreateSerializer(serializers.ModelSerializer):
         }
 
     def create(self, validated_data):
-        profile_data = validated_data.pop('profile')
-        user_obj = User.objects.create(**validated_data)
-        user_obj.set_password(validated_data['password'])
-        user_obj.save()
-        profile = user_obj.profile
-        profile_serializer = ProfileSerializer(
-            profile,
-            data = profile_data
-            )
-        if profile_serializer.is_valid():
-            profile_serializer.save()
-        else:
-            raise serializers.ValidationError(
-                profile_serializer.errors
-                )
-        return user_obj
+        # the nested profile is validated with the user already
+        return create_account(**validated_data)
 
     def update(self, instance, validated_data):
         profile_data = validated_data.pop('profile')
@@ -82,7 +83,52 @@ class UserCreateSerializer(serializers.ModelSerializer):
 
 
 
-class SubscriberAuthSerializer(TokenObtainPairSerializer):
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Issues tokens carrying the user's role, email and active flag as
+    claims, so that later requests can be authenticated and role checked
+    without loading the user or its profile.
+    """
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[ROLE_CLAIM] = user.profile.role
+        token[EMAIL_CLAIM] = user.email
+        token[IS_ACTIVE_CLAIM] = user.is_active
+        return token
+
+
+class RoleTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Re-reads the role (through the role cache), the email and the active
+    flag when a new access token is issued, so a role change or a
+    deactivation reaches clients within one access token lifetime instead
+    of lasting as long as the refresh token. Revoked refresh tokens and
+    inactive users are refused.
+    """
+
+    def validate(self, attrs):
+        refresh = RefreshToken(attrs['refresh'])
+        if token_denylist.is_revoked(refresh):
+            raise InvalidToken(_('Token has been revoked'))
+
+        user_id = refresh[api_settings.USER_ID_CLAIM]
+        user = User.objects.filter(**{
+            api_settings.USER_ID_FIELD: user_id,
+        }).values('email', 'is_active').first()
+        if user is None or not user['is_active']:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive')
+
+        access = refresh.access_token
+        access[ROLE_CLAIM] = get_cached_role(user_id)
+        access[EMAIL_CLAIM] = user['email']
+        access[IS_ACTIVE_CLAIM] = user['is_active']
+        return {'access': str(access)}
+
+
+class SubscriberAuthSerializer(RoleTokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
         # if self.user.profile.role != 1:
@@ -95,10 +141,10 @@ class SubscriberAuthSerializer(TokenObtainPairSerializer):
         return data
 
 
-class InstructorAuthSerializer(TokenObtainPairSerializer):
+class InstructorAuthSerializer(RoleTokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
-        if self.user.profile.role != 2:
+        if self.user.profile.role != INSTRUCTOR:
             raise serializers.ValidationError(
                 res_codes.get_response_dict(
                     res_codes.NO_ACCESS
@@ -108,10 +154,10 @@ class InstructorAuthSerializer(TokenObtainPairSerializer):
         return data
 
 
-class AdminAuthSerializer(TokenObtainPairSerializer):
+class AdminAuthSerializer(RoleTokenObtainPairSerializer):
     def validate(self, attrs):
         data = super().validate(attrs)
-        if self.user.profile.role != 3:
+        if self.user.profile.role != ADMIN:
             raise serializers.ValidationError(
                 res_codes.get_response_dict(
                     res_codes.NO_ACCESS
@@ -136,8 +182,38 @@ class ProfileDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class UserDetailSerializer(serializers.ModelSerializer):
+class AvatarSerializerMixin(object):
+    """
+    Adds the ``avatar`` URL of a user. ``?size=<px>`` selects the smallest
+    rendition at least that large, otherwise ``default_avatar_size``
+    applies (None for the original upload).
+    """
+    default_avatar_size = None
+
+    def get_avatar_size(self):
+        request = self.context.get('request')
+        size = None
+        if request is not None:
+            size = parse_size(request.query_params.get('size'))
+        return size or self.default_avatar_size
+
+    def avatar_url(self, name):
+        """
+        URL of the avatar stored as ``name``, from ``storage_url_cache``.
+        """
+        if name is None:
+            return None
+        return storage_url_cache.url(
+            Profile._meta.get_field('avatar').storage, name)
+
+    def get_avatar(self, user):
+        return self.avatar_url(avatar_name(
+            getattr(user, 'profile', None), self.get_avatar_size()))
+
+
+class UserDetailSerializer(AvatarSerializerMixin, serializers.ModelSerializer):
     profile = ProfileDetailSerializer()
+    avatar = serializers.SerializerMethodField()
 
     class Meta:
         model = User
@@ -146,11 +222,15 @@ class UserDetailSerializer(serializers.ModelSerializer):
             'first_name',
             'last_name',
             'email',
+            'avatar',
             'profile',
         ]
 
 
-class UserListSerializer(serializers.ModelSerializer):
+class UserListSerializer(AvatarSerializerMixin, serializers.ModelSerializer):
+    avatar = serializers.SerializerMethodField()
+
+    default_avatar_size = 64
 
     class Meta:
         model = User
@@ -159,8 +239,56 @@ class UserListSerializer(serializers.ModelSerializer):
             'first_name',
             'last_name',
             'email',
+            'avatar',
+        ]
+
+
+class UserListProjection(AvatarSerializerMixin, ValuesProjection):
+    """
+    ``UserListSerializer`` rendered from ``values()`` rows.
+    """
+    serializer_class = UserListSerializer
+    # keyset cursor, whichever fields are asked for
+    extra_columns = (
+        'id',
+        'created_at',
+    )
+    project_columns = {
+        'avatar': ('profile__avatar', 'profile__avatar_renditions'),
+    }
+
+    default_avatar_size = UserListSerializer.default_avatar_size
+
+    def project_avatar(self, rows):
+        size = self.get_avatar_size()
+        return [
+            self.avatar_url(rendition_name(
+                row['profile__avatar'], row['profile__avatar_renditions'],
+                size))
+            for row in rows
         ]
 
+
+class UserSearchSerializer(serializers.Serializer):
+    """
+    Query parameters of the admin user list: ``search`` prefix, ``role``
+    and the comma separated ``fields`` to render.
+    """
+    search = serializers.CharField(
+        required=False, allow_blank=True, max_length=255)
+    role = serializers.ChoiceField(choices=ROLES, required=False)
+    fields = serializers.CharField(required=False)
+
+    def validate_fields(self, value):
+        fields = [name.strip() for name in value.split(',') if name.strip()]
+        unknown = set(fields) - set(UserListProjection.get_field_names())
+        if not fields or unknown:
+            raise serializers.ValidationError(
+                'Choose among {}.'.format(
+                    ', '.join(UserListProjection.get_field_names())))
+        return fields
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     password = serializers.CharField(required=True)
     new_password = serializers.CharField(required=True)
@@ -186,4 +314,5 @@ class ChangePasswordSerializer(serializers.Serializer):
     def update(self, instance, validated_data):
         instance.set_password(validated_data['new_password'])
         instance.save()
+        token_denylist.revoke_user(instance.pk)
         return instance
\ No newline at end of file
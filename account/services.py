@@ -0,0 +1,35 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from utils.constants import ADMIN, SUBSCRIBER
+from .models import Profile, ProfileSetting
+
+User = get_user_model()
+
+
+@transaction.atomic
+def create_account(email, password, profile=None, **fields):
+    """
+    Create a user with its ``Profile`` and ``ProfileSetting`` in one
+    transaction: the password is hashed once and each row is written by a
+    single INSERT, the profile with ``profile`` fields already set.
+
+    The ``create_profile`` and ``initialize_profile_settings`` receivers
+    are told to stand aside through ``_skip_profile_signal``; users made
+    anywhere else (``create_user``, the Django admin) still get their rows
+    from them.
+    """
+    user = User(email=User.objects.normalize_email(email), **fields)
+    user.set_password(password)
+    user._skip_profile_signal = True
+    user.save(force_insert=True)
+
+    profile = Profile(
+        user=user,
+        role=ADMIN if user.is_superuser else SUBSCRIBER,
+        **(profile or {})
+    )
+    profile._skip_profile_signal = True
+    profile.save(force_insert=True)
+    ProfileSetting.objects.create(profile=profile)
+    return user
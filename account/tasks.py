@@ -0,0 +1,30 @@
+import json
+
+from django.utils import timezone
+
+from jobs.registry import task
+from .avatars import get_renditions, save_renditions
+from .models import Profile
+
+
+@task('account.avatar_renditions')
+def avatar_renditions(profile_id):
+    try:
+        profile = Profile.objects.only(
+            'avatar', 'avatar_renditions').get(pk=profile_id)
+    except Profile.DoesNotExist:
+        return
+    if not profile.avatar:
+        return
+    previous = get_renditions(profile)
+    renditions = save_renditions(profile)
+    # update, not save: no signal, and only while the avatar is unchanged
+    updated = Profile.objects.filter(
+        pk=profile_id, avatar=profile.avatar.name,
+    ).update(
+        avatar_renditions=json.dumps(renditions),
+        last_modified_at=timezone.now(),
+    )
+    stale = previous if updated else renditions
+    for name in stale.values():
+        profile.avatar.storage.delete(name)
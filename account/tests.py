@@ -1,3 +1,393 @@
-from django.test import TestCase
+import json
+import tempfile
+import time
+from unittest import mock, skipUnless
+from io import BytesIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from account.avatars import get_renditions
+from account.managers import SEARCH_FIELDS
+from account.models import Profile, ProfileSetting
+from account.serializers import (
+    AdminAuthSerializer, SubscriberAuthSerializer, UserListProjection,
+    UserListSerializer,
+)
+from utils.authentication import StatelessJWTAuthentication
+from utils.constants import ROLE_CLAIM, SUBSCRIBER, INSTRUCTOR, ADMIN
+from utils.denylist import token_denylist
+from utils.storage_urls import storage_url_cache
+
+User = get_user_model()
+
+
+class RoleClaimTest(TestCase):
+    admin_path = '/api/courses/admin/course/'
+
+    def setUp(self):
+        cache.clear()
+        token_denylist.clear()
+        self.admin = User.objects.create_user(
+            email='admin@oddnary.test', password='password', is_superuser=True)
+        self.client = APIClient()
+
+    def login(self):
+        response = self.client.post('/api/account/admin/login/', {
+            'email': 'admin@oddnary.test',
+            'password': 'password',
+        })
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def authenticate(self, token):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(token))
+
+    def test_login_embeds_role_claim(self):
+        tokens = self.login()
+        self.assertEqual(AccessToken(tokens['access'])[ROLE_CLAIM], ADMIN)
+
+    def test_claim_answers_admin_check_without_profile_query(self):
+        self.authenticate(self.login()['access'])
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.admin_path)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([
+            query for query in context.captured_queries
+            if Profile._meta.db_table in query['sql']
+        ])
+        Profile.objects.filter(user=self.admin).update(role=SUBSCRIBER)
+        # the claim is trusted until the access token expires
+        response = self.client.get(self.admin_path)
+        self.assertEqual(response.status_code, 200)
+
+    def test_token_without_claim_falls_back_to_role_cache(self):
+        self.authenticate(RefreshToken.for_user(self.admin).access_token)
+        self.assertEqual(self.client.get(self.admin_path).status_code, 200)
+
+        profile = self.admin.profile
+        profile.role = SUBSCRIBER
+        profile.save()
+        self.assertEqual(self.client.get(self.admin_path).status_code, 403)
+
+    def test_refresh_reads_current_role(self):
+        refresh = self.login()['refresh']
+        profile = self.admin.profile
+        profile.role = SUBSCRIBER
+        profile.save()
+        response = self.client.post(
+            '/api/account/token/refresh/', {'refresh': refresh})
+        access = AccessToken(response.data['data']['access'])
+        self.assertEqual(access[ROLE_CLAIM], SUBSCRIBER)
+
+    def test_refresh_refuses_deactivated_user(self):
+        refresh = self.login()['refresh']
+        self.admin.is_active = False
+        self.admin.save()
+        response = self.client.post(
+            '/api/account/token/refresh/', {'refresh': refresh})
+        self.assertEqual(response.status_code, 401)
+
+    def test_refresh_refuses_revoked_token(self):
+        refresh = self.login()['refresh']
+        # tokens issued within the revoking second are let through
+        time.sleep(1)
+        token_denylist.revoke_user(self.admin.pk)
+        response = self.client.post(
+            '/api/account/token/refresh/', {'refresh': refresh})
+        self.assertEqual(response.status_code, 401)
+
+
+class StatelessAuthenticationTest(TestCase):
+    path = '/api/courses/user/courses/'
+
+    def setUp(self):
+        cache.clear()
+        token_denylist.clear()
+        self.user = User.objects.create_user(
+            email='user@oddnary.test', password='password')
+        self.client = APIClient()
+        self.token = SubscriberAuthSerializer.get_token(self.user).access_token
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer {}'.format(self.token))
+
+    def test_user_is_built_from_claims(self):
+        with CaptureQueriesContext(connection) as stateless:
+            response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+
+        # a token without the claims falls back to the user lookup
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(
+            RefreshToken.for_user(self.user).access_token))
+        with CaptureQueriesContext(connection) as stateful:
+            response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            len(stateless.captured_queries) + 1,
+            len(stateful.captured_queries))
+
+    def test_deferred_fields_load_in_one_query(self):
+        validated = StatelessJWTAuthentication().get_validated_token(
+            str(self.token).encode())
+        user = StatelessJWTAuthentication().get_user(validated)
+        self.assertEqual(user.pk, self.user.pk)
+        self.assertEqual(user.email, self.user.email)
+        self.assertEqual(user.token_role, SUBSCRIBER)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.oin, self.user.oin)
+            self.assertEqual(user.date_joined, self.user.date_joined)
+            self.assertFalse(user.is_superuser)
+
+    def test_password_change_revokes_issued_tokens(self):
+        # tokens issued within the revoking second are let through
+        time.sleep(1)
+        response = self.client.put('/api/account/change-password/', {
+            'password': 'password',
+            'new_password': 'changed',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.path).status_code, 401)
+
+        token = SubscriberAuthSerializer.get_token(self.user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(token))
+        self.assertEqual(self.client.get(self.path).status_code, 200)
+
+
+class AvatarRenditionTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        storage_url_cache.clear()
+        self.addCleanup(storage_url_cache.clear)
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings = override_settings(MEDIA_ROOT=media_root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.admin = User.objects.create_user(
+            email='admin@oddnary.test', password='password', is_superuser=True)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(
+            AdminAuthSerializer.get_token(self.admin).access_token))
+
+    def upload_avatar(self, user):
+        from PIL import Image
+
+        image = BytesIO()
+        Image.new('RGBA', (512, 256), (255, 0, 0, 128)).save(image, 'PNG')
+        user.profile.avatar.save('me.png', ContentFile(image.getvalue()))
+        return Profile.objects.get(user=user)
+
+    def test_renditions_are_made_by_the_worker(self):
+        from PIL import Image
+
+        profile = self.upload_avatar(self.admin)
+        self.assertEqual(get_renditions(profile), {})
+
+        call_command('run_jobs', once=True, verbosity=0)
+        profile.refresh_from_db()
+        renditions = get_renditions(profile)
+        self.assertEqual(sorted(renditions), [64, 128, 256])
+        for size, name in renditions.items():
+            self.assertTrue(name.startswith('avatars/'))
+            with profile.avatar.storage.open(name) as stored:
+                with Image.open(stored) as rendition:
+                    self.assertEqual(rendition.size, (size, size // 2))
+
+    def test_size_selects_rendition(self):
+        profile = self.upload_avatar(self.admin)
+        response = self.client.get('/api/account/user/', {'size': 100})
+        # no renditions yet, the original stands in
+        self.assertTrue(
+            response.data['data']['avatar'].endswith(profile.avatar.name))
+
+        call_command('run_jobs', once=True, verbosity=0)
+        profile.refresh_from_db()
+        response = self.client.get('/api/account/user/', {'size': 100})
+        self.assertTrue(response.data['data']['avatar'].endswith(
+            get_renditions(profile)[128]))
+        response = self.client.get('/api/account/user/')
+        self.assertTrue(
+            response.data['data']['avatar'].endswith(profile.avatar.name))
+
+    def test_list_urls_come_from_cache(self):
+        for index in range(3):
+            self.upload_avatar(User.objects.create_user(
+                email='user{}@oddnary.test'.format(index),
+                password='password'))
+        call_command('run_jobs', once=True, verbosity=0)
+
+        storage = Profile._meta.get_field('avatar').storage
+        path = '/api/account/admin/users/'
+        with mock.patch.object(
+                type(storage._wrapped), 'url', autospec=True,
+                side_effect=lambda self, name: '/media/' + name) as url:
+            response = self.client.get(path)
+            self.assertEqual(url.call_count, 3)
+            # the admin has no avatar
+            self.assertEqual(len([
+                user for user in response.data['data'] if user['avatar']
+            ]), 3)
+            for query in ({}, {'stream': 1}):
+                url.reset_mock()
+                response = self.client.get(path, query)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(url.call_count, 0)
+
+    def test_list_projection_matches_serializer(self):
+        self.upload_avatar(User.objects.create_user(
+            email='user@oddnary.test', password='password'))
+        User.objects.create_user(
+            email='plain@oddnary.test', password='password')
+        call_command('run_jobs', once=True, verbosity=0)
+
+        users = User.objects.order_by('email')
+        self.assertEqual(
+            UserListProjection(
+                UserListProjection.values(users), many=True).data,
+            json.loads(json.dumps(UserListSerializer(
+                users.select_related('profile'), many=True).data)))
+
+
+class UserSearchTest(TestCase):
+    path = '/api/account/admin/users/'
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            email='admin@oddnary.test', password='password', is_superuser=True)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(
+            AdminAuthSerializer.get_token(self.admin).access_token))
+        self.ada = self.create_user('ada@oddnary.test', 'Ada', 'Lovelace')
+        self.alan = self.create_user(
+            'turing@oddnary.test', 'Alan', 'Turing', role=INSTRUCTOR)
+
+    def create_user(self, email, first_name, last_name, role=SUBSCRIBER):
+        user = User.objects.create_user(
+            email=email, password='password',
+            first_name=first_name, last_name=last_name)
+        Profile.objects.filter(user=user).update(role=role)
+        return user
+
+    def emails(self, **params):
+        response = self.client.get(self.path, params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(user['email'] for user in response.data['data'])
+
+    def test_prefix_search(self):
+        self.assertEqual(self.emails(search='ada'), ['ada@oddnary.test'])
+        self.assertEqual(self.emails(search='TUR'), ['turing@oddnary.test'])
+        self.assertEqual(self.emails(search='Lovel'), ['ada@oddnary.test'])
+        self.assertEqual(
+            self.emails(search=self.alan.oin[:8]), ['turing@oddnary.test'])
+        # prefixes only
+        self.assertEqual(self.emails(search='ovelace'), [])
+
+    def test_role_filter_is_joined(self):
+        self.assertEqual(
+            self.emails(role=INSTRUCTOR), ['turing@oddnary.test'])
+        with CaptureQueriesContext(connection) as few:
+            self.emails(role=SUBSCRIBER)
+        for index in range(5):
+            self.create_user(
+                'user{}@oddnary.test'.format(index), 'first', 'last')
+        subscribers = Profile.objects.filter(role=SUBSCRIBER).count()
+        with CaptureQueriesContext(connection) as many:
+            self.assertEqual(len(self.emails(role=SUBSCRIBER)), subscribers)
+        self.assertEqual(len(few), len(many))
+
+    def test_fields_projection(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.path, {'fields': 'email,id', 'page_size': 1})
+        self.assertEqual(
+            [list(user) for user in response.data['data']], [['id', 'email']])
+        self.assertFalse(any(
+            'avatar' in query['sql'] for query in queries.captured_queries))
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(
+            [list(user) for user in response.data['data']], [['id', 'email']])
+
+    def test_invalid_params(self):
+        for params in ({'fields': 'password'}, {'role': 9}):
+            response = self.client.get(self.path, params)
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.data['code'], 1008)
+
+    def test_admins_only(self):
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(
+            SubscriberAuthSerializer.get_token(self.ada).access_token))
+        self.assertEqual(self.client.get(self.path).status_code, 403)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'UPPER() indexes are PostgreSQL')
+class UserSearchIndexTest(TestCase):
+
+    def test_prefix_search_uses_upper_indexes(self):
+        sql, params = User.objects.search('ada').query.sql_with_params()
+        with connection.cursor() as cursor:
+            # the table is empty, make the planner show what it can use
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('EXPLAIN ' + sql, params)
+            plan = '\n'.join(row[0] for row in cursor.fetchall())
+        for field in SEARCH_FIELDS:
+            self.assertIn('user_{}_upper_idx'.format(field), plan)
+
+
+class SignUpTest(TestCase):
+    path = '/api/account/signup/'
+    payload = {
+        'email': 'Ada@Oddnary.test',
+        'first_name': 'Ada',
+        'last_name': 'Lovelace',
+        'password': 'password',
+        'profile': {
+            'country': 'UK',
+            'organization': 'Analytical Engine',
+            'date_of_birth': '1815-12-10',
+        },
+    }
+
+    def signup(self):
+        return APIClient().post(self.path, self.payload, format='json')
+
+    def test_inserts_each_row_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.signup()
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['profile']['country'], 'UK')
+        writes = [
+            query['sql'].split()[0] for query in queries.captured_queries
+            if query['sql'].split()[0] in ('INSERT', 'UPDATE', 'DELETE')
+        ]
+        self.assertEqual(writes, ['INSERT'] * 3)
+
+        user = User.objects.get(email='Ada@oddnary.test')
+        self.assertTrue(user.check_password('password'))
+        self.assertEqual(user.profile.role, SUBSCRIBER)
+        self.assertEqual(user.profile.organization, 'Analytical Engine')
+        self.assertTrue(
+            ProfileSetting.objects.filter(profile=user.profile).exists())
+
+    def test_rolls_back_as_a_whole(self):
+        with mock.patch.object(
+                ProfileSetting.objects, 'create', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.signup()
+        self.assertFalse(User.objects.filter(email='Ada@oddnary.test').exists())
+
+    def test_signals_still_create_rows_elsewhere(self):
+        user = User.objects.create_user(
+            email='admin@oddnary.test', password='password', is_superuser=True)
+        self.assertEqual(user.profile.role, ADMIN)
+        self.assertTrue(
+            ProfileSetting.objects.filter(profile=user.profile).exists())
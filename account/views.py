@@ -1,12 +1,11 @@
+from functools import partial
+
 # restframework imports
 from rest_framework.generics import CreateAPIView
-from rest_framework.response import Response
-from rest_framework import status
 from rest_framework.permissions import IsAuthenticated
 #jwt
 from rest_framework_simplejwt.views import TokenViewBase
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 #djnago imports
 from django.conf import settings
 from rest_framework.views import APIView
@@ -15,12 +14,16 @@ from django.contrib.auth import get_user_model
 from .serializers import (
 	UserCreateSerializer, SubscriberAuthSerializer,
 	InstructorAuthSerializer, AdminAuthSerializer,
-	UserDetailSerializer, UserListSerializer,
-	ChangePasswordSerializer,
+	UserDetailSerializer, UserListProjection, UserSearchSerializer,
+	ChangePasswordSerializer, RoleTokenRefreshSerializer,
 )
+from .models import Profile
 
 from utils import res_codes
 from utils.permissions import IsAdmin
+from utils.conditional import ConditionalGetMixin
+from utils.pagination import KeysetPagination
+from utils.streaming import StreamingListMixin
 
 User = get_user_model()
 
@@ -128,19 +131,13 @@ class SignUpView(APIView):
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
 			user_obj = serializer.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.SIGNUP_SUCCESS,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
+			return res_codes.respond(
+				res_codes.SIGNUP_SUCCESS,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
-			),
-			status=status.HTTP_400_BAD_REQUEST
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
 
 
@@ -154,11 +151,9 @@ class LoginViewBase(TokenViewBase):
 		except TokenError as e:
 			raise InvalidToken(e.args[0])
 
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.LOGIN_SUCCESS,
-				serializer.validated_data,
-			)
+		return res_codes.respond(
+			res_codes.LOGIN_SUCCESS,
+			serializer.validated_data,
 		)
 
 
@@ -223,13 +218,19 @@ class RefreshTokenAPIView(LoginViewBase):
 		}
 	}
 	"""
-	serializer_class = TokenRefreshSerializer
+	serializer_class = RoleTokenRefreshSerializer
 
 
-class UserDetailApiView(APIView):
+class UserDetailApiView(ConditionalGetMixin, APIView):
 	permission_classes = (IsAuthenticated,)
 	serializer_class = UserDetailSerializer
 
+	def get_etag_querysets(self):
+		return [
+			User.objects.filter(pk=self.request.user.pk),
+			Profile.objects.filter(user__pk=self.request.user.pk),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		# Response (Success)
@@ -269,14 +270,14 @@ class UserDetailApiView(APIView):
 		}
 		'''
 		"""
-		serializer = self.serializer_class(request.user)
-		return Response(
-				res_codes.get_response_dict(
-					res_codes.SUCCESS,
-					serializer.data,
-				),
-				status=status.HTTP_200_OK,
-			)
+		serializer = self.serializer_class(
+			request.user,
+			context={'request': request},
+		)
+		return res_codes.respond(
+			res_codes.SUCCESS,
+			serializer.data,
+		)
 
 	def patch(self, request, *args, **kwargs):
 		"""
@@ -333,28 +334,49 @@ class UserDetailApiView(APIView):
 		)
 		if serializer.is_valid():
 			serializer.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.USER_PROFILE_UPDATED,
-					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+			return res_codes.respond(
+				res_codes.USER_PROFILE_UPDATED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors
-			),
-			status=status.HTTP_400_BAD_REQUEST
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
 
 
-class UserListApiView(APIView):
-	permissions = (IsAuthenticated, IsAdmin,)
-	serializer_class = UserListSerializer
+class UserListApiView(ConditionalGetMixin, StreamingListMixin, APIView):
+	permission_classes = (IsAuthenticated, IsAdmin,)
+	serializer_class = UserListProjection
+	pagination_class = KeysetPagination
+
+	def filter_users(self, params):
+		users = User.objects.filter(is_staff=False)
+		if params.get('search'):
+			users = users.search(params['search'])
+		if 'role' in params:
+			users = users.with_role(params['role'])
+		return users
+
+	def get_etag_querysets(self):
+		params = UserSearchSerializer(data=self.request.query_params)
+		if not params.is_valid():
+			# answered with INVALID_QUERY_PARAMS
+			return []
+		users = self.get_etag_page(self.filter_users(params.validated_data))
+		return [
+			users,
+			# avatars
+			Profile.objects.filter(user__in=users),
+		]
 
 	def get(self, request, *args, **kwargs):
 		"""
+		#Query params
+		```
+		search: prefix of email, first_name, last_name or oin
+		role: 1 (subscriber), 2 (instructor) or 3 (admin)
+		fields: comma separated, e.g. id,email
+		```
 		#Response
 		{
 		    "data": [
@@ -369,21 +391,38 @@ class UserListApiView(APIView):
 		    "msg": "Request processed successfully"
 		}
 		"""
-		users = User.objects.filter(is_staff=False)
+		params = UserSearchSerializer(data=request.query_params)
+		if not params.is_valid():
+			return res_codes.respond(
+				res_codes.INVALID_QUERY_PARAMS,
+				params.errors,
+			)
+		users = self.filter_users(params.validated_data)
+		fields = params.validated_data.get('fields')
+		users = self.serializer_class.values(users, fields)
+		if self.wants_stream(request):
+			return self.get_streaming_response(
+				users,
+				partial(self.serializer_class, fields=fields),
+			)
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(users, request, view=self)
 		serializer = self.serializer_class(
-			users,
-			many=True)
-		return Response(
+			page,
+			many=True,
+			context={'request': request},
+			fields=fields,
+		)
+		return paginator.get_paginated_response(
 			res_codes.get_response_dict(
 				res_codes.SUCCESS,
 				serializer.data,
-			),
-			status=status.HTTP_200_OK,
+			)
 		)
 
 
 class PasswordResetApiView(APIView):
-	permissions = (IsAuthenticated,)
+	permission_classes = (IsAuthenticated,)
 	serializer_class = ChangePasswordSerializer
 
 	def put(self, request, *args, **kwargs):
@@ -430,16 +469,8 @@ class PasswordResetApiView(APIView):
 			)
 		if serializer.is_valid():
 			serializer.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.PASSWORD_UPDATE_SUCCESS,
-				),
-				status=status.HTTP_200_OK,
-			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors
-			),
-			status=status.HTTP_400_BAD_REQUEST
+			return res_codes.respond(res_codes.PASSWORD_UPDATE_SUCCESS)
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
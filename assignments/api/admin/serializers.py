@@ -12,6 +12,10 @@ from courses.models import (
     Course,
     CourseSection,
     )
+from utils.direct_upload import (
+    UploadTicketSerializer,
+    FinalizeUploadSerializer,
+    )
 User = get_user_model()
 
 
@@ -77,6 +81,43 @@ class AssignmentFileCreateSerializer(serializers.ModelSerializer):
         ]
 
 
+class AssignmentFileUploadTicketSerializer(UploadTicketSerializer):
+    assignment = serializers.PrimaryKeyRelatedField(
+        queryset=Assignment.objects.all(),
+        required=True
+        )
+
+    class Meta:
+        model = AssignmentFile
+        parent_field = 'assignment'
+
+
+class AssignmentFileFinalizeSerializer(FinalizeUploadSerializer):
+    name = serializers.CharField(required=True)
+    description = serializers.CharField(required=True)
+    index = serializers.IntegerField(required=True)
+    is_active = serializers.BooleanField(required=False)
+
+    class Meta:
+        model = AssignmentFile
+        parent_field = 'assignment'
+        fields = [
+            'id',
+            'ticket',
+            'assignment',
+            'name',
+            'file',
+            'description',
+            'index',
+            'is_active',
+        ]
+        read_only_fields = [
+            'id',
+            'assignment',
+            'file',
+        ]
+
+
 class AssignmentFilleUpdateSerializer(serializers.ModelSerializer):
     
     class Meta:
@@ -88,4 +129,12 @@ class AssignmentFilleUpdateSerializer(serializers.ModelSerializer):
             'description',
             'index',
             'is_active',
+            'size',
+            'checksum',
+            'content_type',
+        ]
+        read_only_fields = [
+            'size',
+            'checksum',
+            'content_type',
         ]
\ No newline at end of file
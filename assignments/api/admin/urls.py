@@ -7,6 +7,8 @@ from .views import (
     AssignmentUpdateApiView,
     AssignmentFileCreateAPIView,
     AssignmentFileUpdateApiView,
+    AssignmentFileUploadTicketAPIView,
+    AssignmentFileFinalizeUploadAPIView,
     )
 
 urlpatterns = [
@@ -30,4 +32,14 @@ urlpatterns = [
         AssignmentFileUpdateApiView.as_view(),
         name='assignment_file_update',
     ),
+    url(
+        r'^assignment-file-ticket/$',
+        AssignmentFileUploadTicketAPIView.as_view(),
+        name='assignment_file_ticket',
+    ),
+    url(
+        r'^assignment-file-finalize/$',
+        AssignmentFileFinalizeUploadAPIView.as_view(),
+        name='assignment_file_finalize',
+    ),
 ]
\ No newline at end of file
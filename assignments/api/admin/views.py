@@ -1,6 +1,5 @@
 # restframework imports
-from rest_framework.response import Response
-from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 #djnago imports
@@ -11,12 +10,15 @@ from .serializers import (
 	AssignmentUpdateSerializer,
 	AssignmentFileCreateSerializer,
 	AssignmentFilleUpdateSerializer,
+	AssignmentFileUploadTicketSerializer,
+	AssignmentFileFinalizeSerializer,
 )
 from assignments.models import (
 	Assignment,
 	AssignmentFile,
 )
 from utils.permissions import IsAdmin
+from utils.conditional import ConditionalGetMixin
 from utils import res_codes
 
 User = get_user_model()
@@ -131,23 +133,17 @@ class AssignmentCreateAPIView(APIView):
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
 			serializer.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.ASSIGNMENT_CREATED,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
+			return res_codes.respond(
+				res_codes.ASSIGNMENT_CREATED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
-			),
-			status=status.HTTP_400_BAD_REQUEST
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
 
 
-class AssignmentUpdateApiView(APIView):
+class AssignmentUpdateApiView(ConditionalGetMixin, APIView):
 	"""
 	Retrieve, update or delete a course section instance.
 	"""
@@ -160,6 +156,11 @@ class AssignmentUpdateApiView(APIView):
 		except Assignment.DoesNotExist:
 			return None
 
+	def get_etag_querysets(self):
+		return [
+			Assignment.objects.filter(pk=self.kwargs.get('pk')),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		#Response
@@ -187,19 +188,11 @@ class AssignmentUpdateApiView(APIView):
 		assignment = self.get_object()
 		if assignment:
 			serializer = self.serializer_class(assignment)
-			return Response(
-					res_codes.get_response_dict(
-						res_codes.SUCCESS,
-						serializer.data,
-					),
-					status=status.HTTP_200_OK,
-				)
-		return Response(
-					res_codes.get_response_dict(
-						res_codes.PK_NOT_FOUND
-					),
-					status=status.HTTP_400_BAD_REQUEST
-				)
+			return res_codes.respond(
+				res_codes.SUCCESS,
+				serializer.data,
+			)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def patch(self, request, *args, **kwargs):
 		"""
@@ -297,26 +290,15 @@ class AssignmentUpdateApiView(APIView):
 			)
 			if serializer.is_valid():
 				serializer.save()
-				return Response(
-					res_codes.get_response_dict(
-						res_codes.ASSIGNMENT_UPDATED,
-						serializer.data,
-					),
-					status=status.HTTP_200_OK,
+				return res_codes.respond(
+					res_codes.ASSIGNMENT_UPDATED,
+					serializer.data,
 				)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.INVALID_POST_DATA,
-					serializer.errors
-				),
-				status=status.HTTP_400_BAD_REQUEST
+			return res_codes.respond(
+				res_codes.INVALID_POST_DATA,
+				serializer.errors,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def delete(self, request, *args, **kwargs):
 		"""
@@ -352,18 +334,8 @@ class AssignmentUpdateApiView(APIView):
 			assignment.is_active = False
 			assignment.is_deleted = True
 			assignment.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.ASSIGNMENT_DELETED
-				),
-				status=status.HTTP_204_NO_CONTENT,
-			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+			return res_codes.respond(res_codes.ASSIGNMENT_DELETED)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 
 class AssignmentFileCreateAPIView(APIView):
@@ -456,23 +428,17 @@ class AssignmentFileCreateAPIView(APIView):
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
 			serializer.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.ASSIGNMENT_FILE_CREATED,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
+			return res_codes.respond(
+				res_codes.ASSIGNMENT_FILE_CREATED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
-			),
-			status=status.HTTP_400_BAD_REQUEST
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
 
 
-class AssignmentFileUpdateApiView(APIView):
+class AssignmentFileUpdateApiView(ConditionalGetMixin, APIView):
 	"""
 	Retrieve, update or delete a course section instance.
 	"""
@@ -481,10 +447,17 @@ class AssignmentFileUpdateApiView(APIView):
 
 	def get_object(self, pk):
 		try:
-			return AssignmentFile.objects.get(pk=pk)
+			return AssignmentFile.objects.select_related(
+				'assignment',
+			).get(pk=pk)
 		except AssignmentFile.DoesNotExist:
 			return None
 
+	def get_etag_querysets(self):
+		return [
+			AssignmentFile.objects.filter(pk=self.kwargs.get('pk')),
+		]
+
 	def get(self, request, pk, format=None):
 		"""
 		#Response
@@ -512,19 +485,11 @@ class AssignmentFileUpdateApiView(APIView):
 		assignment_file = self.get_object(pk)
 		if assignment_file:
 			serializer = self.serializer_class(assignment_file)
-			return Response(
-					res_codes.get_response_dict(
-						res_codes.SUCCESS,
-						serializer.data,
-					),
-					status=status.HTTP_200_OK,
-				)
-		return Response(
-					res_codes.get_response_dict(
-						res_codes.PK_NOT_FOUND
-					),
-					status=status.HTTP_400_BAD_REQUEST
-				)
+			return res_codes.respond(
+				res_codes.SUCCESS,
+				serializer.data,
+			)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def put(self, request, pk, format=None):
 		"""
@@ -596,26 +561,15 @@ class AssignmentFileUpdateApiView(APIView):
 			)
 			if serializer.is_valid():
 				serializer.save()
-				return Response(
-					res_codes.get_response_dict(
-						res_codes.ASSIGNMENT_FILE_UPDATED,
-						serializer.data,
-					),
-					status=status.HTTP_200_OK,
+				return res_codes.respond(
+					res_codes.ASSIGNMENT_FILE_UPDATED,
+					serializer.data,
 				)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.INVALID_POST_DATA,
-					serializer.errors
-				),
-				status=status.HTTP_400_BAD_REQUEST
+			return res_codes.respond(
+				res_codes.INVALID_POST_DATA,
+				serializer.errors,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def delete(self, request, pk, format=None):
 		"""
@@ -651,15 +605,109 @@ class AssignmentFileUpdateApiView(APIView):
 			assignment_file.is_active = False
 			assignment_file.is_deleted = True
 			assignment_file.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.ASSIGNMENT_FILE_DELETED
-				),
-				status=status.HTTP_204_NO_CONTENT,
+			return res_codes.respond(res_codes.ASSIGNMENT_FILE_DELETED)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
+
+
+class AssignmentFileUploadTicketAPIView(APIView):
+	permission_classes = (IsAuthenticated, IsAdmin)
+	serializer_class = AssignmentFileUploadTicketSerializer
+
+	def post(self, request, *args, **kwargs):
+		"""
+		Phase one of a direct upload: returns a ticket and the URL the
+		file is PUT to, straight to the storage instead of through here.
+		### Body:
+		```
+		{
+		    "assignment": "8b30e0cc-e70e-48f8-a0ec-245c6134fb45",
+		    "filename": "notes.pdf",
+		    "content_type": "application/pdf"
+		}
+		```
+		#### Response (success):
+		```
+		{
+		    "code": 2002,
+		    "msg": "Upload ticket issued",
+		    "data": {
+		        "ticket": "eyJtb2RlbCI6ImNvdXJzZXMuY291cnNlZmlsZSJ9:1hFe2x:...",
+		        "upload": {
+		            "url": "https://bucket.s3.amazonaws.com/media/...",
+		            "method": "PUT",
+		            "headers": {
+		                "Content-Type": "application/pdf"
+		            }
+		        },
+		        "expires_in": 900
+		    }
+		}
+		```
+		"""
+		serializer = self.serializer_class(
+			data=request.data,
+			context={'request': request},
+		)
+		if serializer.is_valid():
+			serializer.save()
+			return res_codes.respond(
+				res_codes.UPLOAD_TICKET_ISSUED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
\ No newline at end of file
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
+		)
+
+
+class AssignmentFileFinalizeUploadAPIView(APIView):
+	permission_classes = (IsAuthenticated, IsAdmin)
+	serializer_class = AssignmentFileFinalizeSerializer
+
+	def post(self, request, *args, **kwargs):
+		"""
+		Phase two of a direct upload: creates the assignment file once the file
+		of the ticket is found in the storage.
+		### Body:
+		```
+		{
+		    "ticket": "eyJtb2RlbCI6ImNvdXJzZXMuY291cnNlZmlsZSJ9:1hFe2x:...",
+		    "name": "notes",
+		    "description": "lecture notes",
+		    "index": 0,
+		    "is_active": true
+		}
+		```
+		#### Response (error):
+		```
+		{
+		    "code": 1000,
+		    "msg": "Invalid post data provided",
+		    "data": {
+		        "ticket": [
+		            "Uploaded file not found."
+		        ]
+		    }
+		}
+		```
+		"""
+		serializer = self.serializer_class(
+			data=request.data,
+			context={'request': request},
+		)
+		if serializer.is_valid():
+			try:
+				serializer.save()
+			except ValidationError as e:
+				return res_codes.respond(
+					res_codes.INVALID_POST_DATA,
+					e.detail,
+				)
+			return res_codes.respond(
+				res_codes.ASSIGNMENT_FILE_CREATED,
+				serializer.data,
+			)
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
+		)
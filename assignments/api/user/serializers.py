@@ -10,11 +10,17 @@ from assignments.models import (
     AssignmentSolution,
     AssignmentSolutionFile,
     )
+from utils.storage_urls import CachedFileURLMixin
+from utils.direct_upload import (
+    UploadTicketSerializer,
+    FinalizeUploadSerializer,
+    )
 
 User = get_user_model()
 
 
-class AssignmentFileListSerializer(serializers.ModelSerializer):
+class AssignmentFileListSerializer(CachedFileURLMixin,
+                                   serializers.ModelSerializer):
     assignment = serializers.PrimaryKeyRelatedField(
         queryset=Assignment.objects.all()
         )
@@ -72,7 +78,8 @@ class AssignmentSolutionDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class AssignmentSolutionFileListSerializer(serializers.ModelSerializer):
+class AssignmentSolutionFileListSerializer(CachedFileURLMixin,
+                                            serializers.ModelSerializer):
     assignment_solution = serializers.PrimaryKeyRelatedField(
         queryset=AssignmentSolution.objects.all()
         )
@@ -99,9 +106,11 @@ class AssignmentSolutionDetailWithFileSerializer(serializers.ModelSerializer):
         ]
 
 
-class AssignmentSolutionFileUploadSerializer(serializers.ModelSerializer):
+class AssignmentSolutionFileUploadSerializer(CachedFileURLMixin,
+                                             serializers.ModelSerializer):
+    # the upload path needs the assignment
     assignment_solution = serializers.PrimaryKeyRelatedField(
-        queryset=AssignmentSolution.objects.all()
+        queryset=AssignmentSolution.objects.select_related('assignment')
         )
     name = serializers.CharField(required=True)
     comment = serializers.CharField(required=True)
@@ -117,4 +126,42 @@ class AssignmentSolutionFileUploadSerializer(serializers.ModelSerializer):
             'name',
             'comment',
             'file',
-        ]
\ No newline at end of file
+        ]
+
+
+class AssignmentSolutionFileUploadTicketSerializer(UploadTicketSerializer):
+    assignment_solution = serializers.PrimaryKeyRelatedField(
+        queryset=AssignmentSolution.objects.select_related('assignment')
+        )
+
+    class Meta:
+        model = AssignmentSolutionFile
+        parent_field = 'assignment_solution'
+
+    def validate_assignment_solution(self, value):
+        if value.user_id != self.context['request'].user.pk:
+            raise serializers.ValidationError(
+                'You can only upload files to your own solutions.')
+        return value
+
+
+class AssignmentSolutionFileFinalizeSerializer(FinalizeUploadSerializer):
+    name = serializers.CharField(required=True)
+    comment = serializers.CharField(required=True)
+
+    class Meta:
+        model = AssignmentSolutionFile
+        parent_field = 'assignment_solution'
+        fields = [
+            'id',
+            'ticket',
+            'assignment_solution',
+            'name',
+            'comment',
+            'file',
+        ]
+        read_only_fields = [
+            'id',
+            'assignment_solution',
+            'file',
+        ]
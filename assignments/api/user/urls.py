@@ -9,6 +9,8 @@ from .views import (
     AssignmentSolutionDetailAPIView,
     AssignmentSolutionFileUploadAPIView,
     AssignmentSolutionDetailWithFileAPIView,
+    AssignmentSolutionFileUploadTicketAPIView,
+    AssignmentSolutionFileFinalizeUploadAPIView,
     )
 
 urlpatterns = [
@@ -42,4 +44,14 @@ urlpatterns = [
         AssignmentSolutionFileUploadAPIView.as_view(),
         name='assignment_solution_file_upload',
     ),
+    url(
+        r'^assignment-solution-file-ticket/$',
+        AssignmentSolutionFileUploadTicketAPIView.as_view(),
+        name='assignment_solution_file_ticket',
+    ),
+    url(
+        r'^assignment-solution-file-finalize/$',
+        AssignmentSolutionFileFinalizeUploadAPIView.as_view(),
+        name='assignment_solution_file_finalize',
+    ),
 ]
\ No newline at end of file
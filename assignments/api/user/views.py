@@ -1,6 +1,5 @@
 # restframework imports
-from rest_framework.response import Response
-from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 #djnago imports
@@ -12,17 +11,25 @@ from .serializers import (
 	AssignmentSolutionDetailSerializer,
 	AssignmentSolutionFileUploadSerializer,
 	AssignmentSolutionDetailWithFileSerializer,
+	AssignmentSolutionFileUploadTicketSerializer,
+	AssignmentSolutionFileFinalizeSerializer,
 )
 from assignments.models import (
 	Assignment,
+	AssignmentFile,
 	AssignmentSolution,
+	AssignmentSolutionFile,
 )
 from utils import res_codes
+from utils.conditional import ConditionalGetMixin
+from utils.pagination import CourseIndexPagination, KeysetPagination
+from utils.authentication import StatelessJWTAuthentication
 
 User = get_user_model()
 
 
-class AssignmentDetailAPIView(APIView):
+class AssignmentDetailAPIView(ConditionalGetMixin, APIView):
+	authentication_classes = (StatelessJWTAuthentication,)
 	permission_classes = (IsAuthenticated,)
 	serializer_class = AssignmentDetailSerializer
 
@@ -35,6 +42,16 @@ class AssignmentDetailAPIView(APIView):
 		except Assignment.DoesNotExist:
 			return None
 
+	def get_etag_querysets(self):
+		pk = self.kwargs.get('pk')
+		return [
+			Assignment.objects.filter(
+				pk=pk,
+				course__author=self.request.user
+			),
+			AssignmentFile.objects.filter(assignment__pk=pk),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		#Response
@@ -72,24 +89,18 @@ class AssignmentDetailAPIView(APIView):
 		assignment = self.get_object()
 		if assignment:
 			serializer = self.serializer_class(assignment)
-			return Response(
-					res_codes.get_response_dict(
-						res_codes.SUCCESS,
-						serializer.data,
-					),
-					status=status.HTTP_200_OK,
-				)
-		return Response(
-					res_codes.get_response_dict(
-						res_codes.PK_NOT_FOUND
-					),
-					status=status.HTTP_400_BAD_REQUEST
-				)
+			return res_codes.respond(
+				res_codes.SUCCESS,
+				serializer.data,
+			)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 
-class CourseAssignmentDetailAPIView(APIView):
+class CourseAssignmentDetailAPIView(ConditionalGetMixin, APIView):
+	authentication_classes = (StatelessJWTAuthentication,)
 	permission_classes = (IsAuthenticated,)
 	serializer_class = AssignmentDetailSerializer
+	pagination_class = CourseIndexPagination
 
 	def get_object(self):
 		return Assignment.objects.filter(
@@ -97,6 +108,13 @@ class CourseAssignmentDetailAPIView(APIView):
 			course__author=self.request.user
 			)
 
+	def get_etag_querysets(self):
+		assignments = self.get_etag_page(self.get_object())
+		return [
+			assignments,
+			AssignmentFile.objects.filter(assignment__in=assignments),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		#Response
@@ -158,17 +176,18 @@ class CourseAssignmentDetailAPIView(APIView):
 		}
 		```
 		"""
-		assignment = self.get_object()
+		assignment = self.get_object().prefetch_related('files')
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(assignment, request, view=self)
 		serializer = self.serializer_class(
-			assignment,
+			page,
 			many=True
 			)
-		return Response(
+		return paginator.get_paginated_response(
 				res_codes.get_response_dict(
 					res_codes.SUCCESS,
 					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+				)
 			)
 
 
@@ -242,25 +261,21 @@ class AssignmentSolutionCreateAPIView(APIView):
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
 			serializer.save(user=request.user)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.ASSIGNMENT_SOLUTION_CREATED,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
+			return res_codes.respond(
+				res_codes.ASSIGNMENT_SOLUTION_CREATED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
-			),
-			status=status.HTTP_400_BAD_REQUEST
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
 
 
-class AssignmentSolutionDetailAPIView(APIView):
+class AssignmentSolutionDetailAPIView(ConditionalGetMixin, APIView):
+	authentication_classes = (StatelessJWTAuthentication,)
 	permission_classes = (IsAuthenticated,)
 	serializer_class = AssignmentSolutionDetailSerializer
+	pagination_class = KeysetPagination
 
 	def get_object(self):
 		return AssignmentSolution.objects.filter(
@@ -268,6 +283,11 @@ class AssignmentSolutionDetailAPIView(APIView):
 			user=self.request.user
 			)
 
+	def get_etag_querysets(self):
+		return [
+			self.get_etag_page(self.get_object()),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		#Response
@@ -293,22 +313,25 @@ class AssignmentSolutionDetailAPIView(APIView):
 		}
 		"""
 		assignment_solution = self.get_object()
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(assignment_solution, request, view=self)
 		serializer = self.serializer_class(
-			assignment_solution,
+			page,
 			many=True
 			)
-		return Response(
+		return paginator.get_paginated_response(
 				res_codes.get_response_dict(
 					res_codes.SUCCESS,
 					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+				)
 			)
 
 
-class AssignmentSolutionDetailWithFileAPIView(APIView):
+class AssignmentSolutionDetailWithFileAPIView(ConditionalGetMixin, APIView):
+	authentication_classes = (StatelessJWTAuthentication,)
 	permission_classes = (IsAuthenticated,)
 	serializer_class = AssignmentSolutionDetailWithFileSerializer
+	pagination_class = KeysetPagination
 
 	def get_object(self):
 		return AssignmentSolution.objects.filter(
@@ -316,6 +339,14 @@ class AssignmentSolutionDetailWithFileAPIView(APIView):
 			user=self.request.user
 			)
 
+	def get_etag_querysets(self):
+		solutions = self.get_etag_page(self.get_object())
+		return [
+			solutions,
+			AssignmentSolutionFile.objects.filter(
+				assignment_solution__in=solutions),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		#Response
@@ -348,17 +379,18 @@ class AssignmentSolutionDetailWithFileAPIView(APIView):
 		    "msg": "Such pk not found"
 		}
 		"""
-		assignment_solution = self.get_object()
+		assignment_solution = self.get_object().prefetch_related('files')
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(assignment_solution, request, view=self)
 		serializer = self.serializer_class(
-			assignment_solution,
+			page,
 			many=True
 			)
-		return Response(
+		return paginator.get_paginated_response(
 				res_codes.get_response_dict(
 					res_codes.SUCCESS,
 					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+				)
 			)
 
 
@@ -442,17 +474,113 @@ class AssignmentSolutionFileUploadAPIView(APIView):
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
 			serializer.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.ASSIGNMENT_SOLUTION_FILE_UPLOADED,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
+			return res_codes.respond(
+				res_codes.ASSIGNMENT_SOLUTION_FILE_UPLOADED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
\ No newline at end of file
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
+		)
+
+
+class AssignmentSolutionFileUploadTicketAPIView(APIView):
+	permission_classes = (IsAuthenticated,)
+	serializer_class = AssignmentSolutionFileUploadTicketSerializer
+
+	def post(self, request, *args, **kwargs):
+		"""
+		Phase one of a direct upload: returns a ticket and the URL the
+		file is PUT to, straight to the storage instead of through here.
+		### Body:
+		```
+		{
+		    "assignment_solution": "8b30e0cc-e70e-48f8-a0ec-245c6134fb45",
+		    "filename": "notes.pdf",
+		    "content_type": "application/pdf"
+		}
+		```
+		#### Response (success):
+		```
+		{
+		    "code": 2002,
+		    "msg": "Upload ticket issued",
+		    "data": {
+		        "ticket": "eyJtb2RlbCI6ImNvdXJzZXMuY291cnNlZmlsZSJ9:1hFe2x:...",
+		        "upload": {
+		            "url": "https://bucket.s3.amazonaws.com/media/...",
+		            "method": "PUT",
+		            "headers": {
+		                "Content-Type": "application/pdf"
+		            }
+		        },
+		        "expires_in": 900
+		    }
+		}
+		```
+		"""
+		serializer = self.serializer_class(
+			data=request.data,
+			context={'request': request},
+		)
+		if serializer.is_valid():
+			serializer.save()
+			return res_codes.respond(
+				res_codes.UPLOAD_TICKET_ISSUED,
+				serializer.data,
+			)
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
+		)
+
+
+class AssignmentSolutionFileFinalizeUploadAPIView(APIView):
+	permission_classes = (IsAuthenticated,)
+	serializer_class = AssignmentSolutionFileFinalizeSerializer
+
+	def post(self, request, *args, **kwargs):
+		"""
+		Phase two of a direct upload: creates the solution file once the file
+		of the ticket is found in the storage.
+		### Body:
+		```
+		{
+		    "ticket": "eyJtb2RlbCI6ImNvdXJzZXMuY291cnNlZmlsZSJ9:1hFe2x:...",
+		    "name": "solution",
+		    "comment": "my solution"
+		}
+		```
+		#### Response (error):
+		```
+		{
+		    "code": 1000,
+		    "msg": "Invalid post data provided",
+		    "data": {
+		        "ticket": [
+		            "Uploaded file not found."
+		        ]
+		    }
+		}
+		```
+		"""
+		serializer = self.serializer_class(
+			data=request.data,
+			context={'request': request},
+		)
+		if serializer.is_valid():
+			try:
+				serializer.save()
+			except ValidationError as e:
+				return res_codes.respond(
+					res_codes.INVALID_POST_DATA,
+					e.detail,
+				)
+			return res_codes.respond(
+				res_codes.ASSIGNMENT_SOLUTION_FILE_UPLOADED,
+				serializer.data,
+			)
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
+		)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.20 on 2026-10-18 07:21
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assignments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['course', 'is_active', 'is_deleted', 'index'], name='assignment_active_index_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(fields=['course', 'index', 'id'], name='assignment_course_index_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='assignmentsolution',
+            index=models.Index(fields=['assignment', 'user', 'created_at', 'id'], name='solution_user_created_idx'),
+        ),
+    ]
@@ -1,8 +1,12 @@
 from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from django.contrib.auth import get_user_model
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
 
-from utils.base_model import BaseModel
+from jobs.queue import enqueue
+from utils.base_model import BaseModel, FileMetadataModel
+from utils.media import remember_file, file_changed
 from utils.upload_location import (
     assignment_file_location,
     assignment_solution_file_location
@@ -29,9 +33,18 @@ class Assignment(BaseModel):
 
     class Meta:
         ordering = ('course', 'index', '-created_at',)
-
-
-class AssignmentFile(BaseModel):
+        indexes = [
+            models.Index(
+                fields=['course', 'is_active', 'is_deleted', 'index'],
+                name='assignment_active_index_idx'),
+            # keyset pages of a course's assignments, in index order
+            models.Index(
+                fields=['course', 'index', 'id'],
+                name='assignment_course_index_idx'),
+        ]
+
+
+class AssignmentFile(BaseModel, FileMetadataModel):
     assignment = models.ForeignKey(Assignment, related_name='files')
     name = models.CharField(_('name'), max_length=512)
     file = models.FileField(_('file'), max_length=2048, upload_to=assignment_file_location)
@@ -55,6 +68,13 @@ class AssignmentSolution(BaseModel):
     def __str__(self):
         return "{}".format(self.assignment)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['assignment', 'user', 'created_at', 'id'],
+                name='solution_user_created_idx'),
+        ]
+
 
 class AssignmentSolutionFile(BaseModel):
     assignment_solution = models.ForeignKey(AssignmentSolution, related_name='files')
@@ -66,3 +86,12 @@ class AssignmentSolutionFile(BaseModel):
         return "{} - {}".format(self.assignment_solution, self.name)
 
 
+@receiver(post_init, sender=AssignmentFile)
+def remember_assignment_file(sender, instance, **kwargs):
+    remember_file(instance)
+
+
+@receiver(post_save, sender=AssignmentFile)
+def queue_assignment_file_metadata(sender, instance, created, **kwargs):
+    if file_changed(instance, created=created):
+        enqueue('assignments.file_metadata', assignment_file_id=instance.pk)
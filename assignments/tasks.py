@@ -0,0 +1,8 @@
+from jobs.registry import task
+from utils.media import record_file_metadata
+from .models import AssignmentFile
+
+
+@task('assignments.file_metadata')
+def assignment_file_metadata(assignment_file_id):
+    record_file_metadata(AssignmentFile, assignment_file_id)
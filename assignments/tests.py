@@ -1,3 +1,158 @@
-from django.test import TestCase
+import json
+import tempfile
+from unittest import skipUnless
+from uuid import uuid4
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from account.serializers import AdminAuthSerializer, SubscriberAuthSerializer
+from assignments.models import (
+    Assignment,
+    AssignmentFile,
+    AssignmentSolution,
+    AssignmentSolutionFile,
+)
+from courses.models import Course
+from courses.tests import explain
+from jobs.models import Job
+
+User = get_user_model()
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite')
+class AssignmentIndexTest(TestCase):
+
+    def test_course_assignments_page(self):
+        assignments = Assignment.objects.filter(
+            course__id=uuid4()).order_by('course_id', 'index', 'id')[:11]
+        plan = explain(assignments)
+        self.assertIn('assignment_course_index_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_user_solutions_page(self):
+        solutions = AssignmentSolution.objects.filter(
+            assignment__id=uuid4(), user=uuid4()).order_by('-created_at', '-id')[:11]
+        plan = explain(solutions)
+        self.assertIn('solution_user_created_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+
+class CourseAssignmentPageTest(TestCase):
+
+    def test_pages_keep_index_order(self):
+        user = User.objects.create_user(
+            email='user@oddnary.test', password='password')
+        course = Course.objects.create(author=user, name='course')
+        # created in reverse, newest first would turn them around
+        for index in (4, 3, 2, 1, 0):
+            Assignment.objects.create(
+                course=course, name='assignment', index=index)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(
+            SubscriberAuthSerializer.get_token(user).access_token))
+
+        seen = []
+        path = '/api/assignments/user/course-assignments/{}/'.format(
+            course.pk)
+        params = {'page_size': 2}
+        while path:
+            response = client.get(path, params)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(
+                assignment['index'] for assignment in response.data['data'])
+            path, params = response.data['next'], {}
+        self.assertEqual(seen, [0, 1, 2, 3, 4])
+
+
+class SolutionFileUploadQueryTest(TestCase):
+    path = '/api/assignments/user/assignment-solution-file/'
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings = override_settings(MEDIA_ROOT=media_root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.user = User.objects.create_user(
+            email='user@oddnary.test', password='password')
+        course = Course.objects.create(name='course')
+        self.assignment = Assignment.objects.create(
+            course=course, name='assignment')
+        self.solution = AssignmentSolution.objects.create(
+            assignment=self.assignment, user=self.user, comment='solution')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(
+            SubscriberAuthSerializer.get_token(self.user).access_token))
+
+    def test_upload_path_reads_no_parent_past_the_solution(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.path, {
+                'assignment_solution': str(self.solution.pk),
+                'name': 'solution',
+                'comment': 'my solution',
+                'file': SimpleUploadedFile('solution.py', b'print(1)'),
+            }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        solution_file = AssignmentSolutionFile.objects.get()
+        self.assertEqual(
+            solution_file.file.name, '{}/{}/{}/solution.py'.format(
+                self.assignment.course_id, self.assignment.pk,
+                solution_file.pk))
+        # the assignment comes joined to the solution lookup
+        for model in (Assignment, Course):
+            self.assertFalse([
+                query for query in context.captured_queries
+                if 'FROM "{}"'.format(model._meta.db_table) in query['sql']
+            ])
+
+
+class AssignmentFileDirectUploadTest(TestCase):
+
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings = override_settings(
+            MEDIA_ROOT=media_root.name,
+            DEFAULT_FILE_STORAGE='utils.storage.DirectUploadFileSystemStorage',
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        admin = User.objects.create_user(
+            email='admin@oddnary.test', password='password', is_superuser=True)
+        self.assignment = Assignment.objects.create(
+            course=Course.objects.create(name='course'), name='assignment')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer {}'.format(
+            AdminAuthSerializer.get_token(admin).access_token))
+
+    def test_finalize_queues_file_metadata(self):
+        response = self.client.post(
+            '/api/assignments/admin/assignment-file-ticket/', {
+                'assignment': str(self.assignment.pk),
+                'filename': 'task.pdf',
+            })
+        self.assertEqual(response.status_code, 201)
+        ticket = response.data['data']
+        response = self.client.put(ticket['upload']['url'], b'%PDF-1.4',
+                                   content_type='application/pdf')
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.post(
+            '/api/assignments/admin/assignment-file-finalize/', {
+                'ticket': ticket['ticket'],
+                'name': 'task',
+                'description': 'task sheet',
+                'index': 0,
+            })
+        self.assertEqual(response.status_code, 201)
+        assignment_file = AssignmentFile.objects.get()
+        self.assertEqual(
+            [json.loads(payload) for payload in Job.objects.filter(
+                task='assignments.file_metadata',
+            ).values_list('payload', flat=True)],
+            [{'assignment_file_id': str(assignment_file.pk)}])
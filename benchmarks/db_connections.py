@@ -0,0 +1,94 @@
+"""
+Database connection churn of API requests, with and without persistent
+connections.
+
+    python benchmarks/db_connections.py [--requests 200] [--threads 4]
+        [--path /api/courses/public/category/]
+
+Requests go through the WSGI handler in process, so Django opens and
+closes connections exactly as it does behind a server. Reported are the
+connections opened and the time per request with ``CONN_MAX_AGE`` 0 and
+60. A test database is created for the configured ``default`` database
+(``DJANGO_SETTINGS_MODULE``, oddnary.settings.test by default) and
+dropped afterwards; with SQLite it is a temporary file, as Django never
+closes connections to an in-memory database.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'oddnary.settings.test')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db import connections  # noqa: E402
+from django.db.backends.signals import connection_created  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+
+class ConnectionCounter(object):
+
+    def __init__(self):
+        self.count = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, **kwargs):
+        with self.lock:
+            self.count += 1
+
+
+def request(application, path):
+    environ = RequestFactory().get(path).environ
+    response = application(environ, lambda status, headers: None)
+    b''.join(response)
+    # fires request_finished, where Django closes expired connections
+    response.close()
+
+
+def run(path, requests, threads, conn_max_age):
+    connections.databases['default']['CONN_MAX_AGE'] = conn_max_age
+    application = get_wsgi_application()
+    counter = ConnectionCounter()
+    connection_created.connect(counter)
+    started = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(lambda _: request(application, path), range(requests)))
+    elapsed = time.perf_counter() - started
+    connection_created.disconnect(counter)
+    return counter.count, elapsed / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--path', default='/api/courses/public/category/')
+    args = parser.parse_args()
+
+    connection = connections['default']
+    if connection.vendor == 'sqlite':
+        connection.settings_dict['TEST']['NAME'] = os.path.join(
+            tempfile.mkdtemp(), 'db_connections.sqlite3')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        print('{:<14} {:>12} {:>12}'.format(
+            'CONN_MAX_AGE', 'connections', 'ms/request'))
+        for conn_max_age in (0, 60):
+            opened, per_request = run(
+                args.path, args.requests, args.threads, conn_max_age)
+            print('{:<14} {:>12} {:>12.2f}'.format(
+                conn_max_age, opened, per_request))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,818 @@
+"""
+Latency, query count and peak memory of every endpoint of the API, each
+HTTP method it answers, against a seeded database.
+
+    python benchmarks/endpoints.py [--users 10000] [--courses 2000]
+        [--sections 20] [--files 10] [--solutions 50000] [--requests 20]
+        [--warm] [--output endpoints.json]
+
+A test database is created for the configured ``default`` database
+(``DJANGO_SETTINGS_MODULE``, oddnary.settings.test by default), seeded
+with the given volumes and dropped afterwards. Files go to a temporary
+``MEDIA_ROOT`` served by ``DirectUploadFileSystemStorage``, so the direct
+upload routes work too.
+
+Every URL under ``/api/`` is requested ``--requests`` times per method its
+view answers, through the Django test client, authenticated with the JWT
+of the admin that authors the courses. GET path parameters are filled
+with the seeded object giving the largest successful response; the other
+methods, and GETs that need more than that (the metrics token), are sent
+by the request builder of their route in ``BUILDERS``. A builder runs
+before the clock starts and may create what its request consumes (an
+upload ticket, a session holding the whole file). Each request that
+changes data runs in a transaction rolled back afterwards, so every
+repetition sees the seeded database; ``on_commit`` hooks do not run. The
+Django cache is cleared before each request unless ``--warm`` is given.
+
+The report is JSON (stdout or ``--output``) with p50 / p95 latency in
+milliseconds, queries and peak traced memory per endpoint and method,
+keys sorted so that two runs diff line by line.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import math
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'oddnary.settings.test')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.core.files.uploadedfile import SimpleUploadedFile  # noqa: E402
+from django.core.serializers.json import DjangoJSONEncoder  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.test import Client, override_settings  # noqa: E402
+from django.test.client import (  # noqa: E402
+    BOUNDARY, MULTIPART_CONTENT, encode_multipart,
+)
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from django.urls import get_resolver  # noqa: E402
+
+from account.models import Profile  # noqa: E402
+from account.serializers import AdminAuthSerializer  # noqa: E402
+from assignments.models import (  # noqa: E402
+    Assignment, AssignmentFile, AssignmentSolution,
+)
+from courses.models import (  # noqa: E402
+    Category, CategoryCourseRelation, Course, CourseDetailTab,
+    CourseDetailTabList, CourseFile, CourseFileUploadSession, CourseSection,
+    UserMyCourseLibrary,
+)
+from courses.uploads import write_chunk  # noqa: E402
+from utils import metrics, nplusone  # noqa: E402
+from utils.constants import INSTRUCTOR  # noqa: E402
+from utils.denylist import token_denylist  # noqa: E402
+from utils.metrics import view_name  # noqa: E402
+
+User = get_user_model()
+
+# N+1 queries are logged to stderr instead of failing the endpoint, as on
+# staging
+nplusone.NPLUSONE_RAISE = False
+# probing path parameters answers 404s, server errors are still logged
+logging.getLogger('django.request').setLevel(logging.ERROR)
+# the metrics route answers requests with this bearer token only
+metrics.METRICS_TOKEN = metrics.METRICS_TOKEN or 'benchmark'
+
+METHODS = ('get', 'post', 'put', 'patch', 'delete')
+PASSWORD = 'password'
+UPLOAD_CONTENT = b'%PDF-1.4 benchmark' * 64
+
+GROUP = re.compile(r'\(\?P<\w+>[^)]*\)')
+# kinds of seeded objects tried, in order, for a path parameter
+KINDS = (
+    Course, CourseSection, CourseFile, CourseDetailTab, CourseDetailTabList,
+    Category, CategoryCourseRelation, Assignment, AssignmentFile,
+    CourseFileUploadSession,
+)
+
+
+def seed(args):
+    admin = User.objects.create_user(
+        email='admin@oddnary.test', password=PASSWORD, is_superuser=True)
+    # the logins of the other roles
+    User.objects.create_user(
+        email='subscriber@oddnary.test', password=PASSWORD)
+    instructor = User.objects.create_user(
+        email='instructor@oddnary.test', password=PASSWORD)
+    Profile.objects.filter(user=instructor).update(role=INSTRUCTOR)
+    users = User.objects.bulk_create(
+        User(email='user{}@oddnary.test'.format(index),
+             first_name='first', last_name='last')
+        for index in range(args.users))
+    # bulk_create skips the signal creating the admin's profile
+    Profile.objects.bulk_create(Profile(user=user) for user in users)
+
+    courses = Course.objects.bulk_create(
+        Course(author=admin, name='course {}'.format(index),
+               description='learn', is_active=True)
+        for index in range(args.courses))
+    sections = CourseSection.objects.bulk_create(
+        CourseSection(course=course, name='section', index=index,
+                      is_active=True)
+        for course in courses for index in range(args.sections))
+    CourseFile.objects.bulk_create(
+        CourseFile(section=section, name='file', index=index, is_active=True,
+                   file='{}/{}/file-{}.pdf'.format(
+                       section.course_id, section.id, index))
+        for section in sections for index in range(args.files))
+    tabs = CourseDetailTab.objects.bulk_create(
+        CourseDetailTab(course=course, name='tab', index=index,
+                        is_active=True)
+        for course in courses for index in range(2))
+    CourseDetailTabList.objects.bulk_create(
+        CourseDetailTabList(course_detail_tab=tab, content='item',
+                            index=index, is_active=True)
+        for tab in tabs for index in range(3))
+
+    categories = Category.objects.bulk_create(
+        Category(name='category {}'.format(index)) for index in range(20))
+    CategoryCourseRelation.objects.bulk_create(
+        CategoryCourseRelation(
+            category=categories[index % len(categories)], course=course)
+        for index, course in enumerate(courses))
+    UserMyCourseLibrary.objects.bulk_create(
+        UserMyCourseLibrary(user=admin, course=course)
+        for course in courses[:50])
+    CourseFileUploadSession.objects.create(
+        section=sections[0], filename='lecture.mp4', size=1024 ** 3,
+        created_by=admin)
+
+    assignments = Assignment.objects.bulk_create(
+        Assignment(course=course, name='assignment', index=0, is_active=True)
+        for course in courses)
+    AssignmentFile.objects.bulk_create(
+        AssignmentFile(assignment=assignment, name='file', index=index,
+                       file='{}/file-{}.pdf'.format(assignment.id, index))
+        for assignment in assignments for index in range(2))
+    # one solution of the admin per assignment, the rest spread over users
+    solutions = [
+        AssignmentSolution(assignment=assignment, user=admin, comment='mine')
+        for assignment in assignments[:args.solutions]
+    ]
+    solutions.extend(
+        AssignmentSolution(
+            assignment=assignments[index % len(assignments)],
+            user=users[index % len(users)], comment='solution')
+        for index in range(args.solutions - len(solutions)))
+    AssignmentSolution.objects.bulk_create(solutions)
+    return admin
+
+
+def endpoints(patterns, prefix=''):
+    """
+    ``(pattern, name, view)`` of every URL, included URLconfs flattened.
+    """
+    for pattern in patterns:
+        regex = prefix + pattern.regex.pattern.lstrip('^')
+        if hasattr(pattern, 'url_patterns'):
+            yield from endpoints(pattern.url_patterns, regex)
+        else:
+            yield regex.rstrip('$'), pattern.name, pattern.callback
+
+
+def view_methods(callback):
+    """
+    The methods of ``METHODS`` the view of ``callback`` answers. Class
+    based views (DRF's ``api_view`` included) tell by their handlers, a
+    plain function view is taken to answer GET.
+    """
+    view = getattr(callback, 'view_class', None)
+    if view is None:
+        return ['get']
+    return [method for method in METHODS if hasattr(view, method)]
+
+
+def json_body(data):
+    return {
+        'data': json.dumps(data, cls=DjangoJSONEncoder),
+        'content_type': 'application/json',
+    }
+
+
+def multipart_body(data):
+    # the test client only encodes multipart bodies for POST by itself
+    return {
+        'data': encode_multipart(BOUNDARY, data),
+        'content_type': MULTIPART_CONTENT,
+    }
+
+
+def upload(name='notes.pdf'):
+    return SimpleUploadedFile(name, UPLOAD_CONTENT, 'application/pdf')
+
+
+class Fixture(object):
+    """
+    The seeded rows the request builders act on, all of the admin's
+    course, and a counter for values that have to be unique.
+    """
+
+    def __init__(self, admin, client):
+        self.admin = admin
+        self.client = client
+        self.course = Course.objects.filter(author=admin).first()
+        self.section = self.course.sections.first()
+        self.course_file = self.section.files.first()
+        self.tab = self.course.detail_tabs.first()
+        self.tab_list = self.tab.lists.first()
+        self.category = Category.objects.first()
+        self.relation = CategoryCourseRelation.objects.first()
+        self.library_entry = UserMyCourseLibrary.objects.filter(
+            user=admin).first()
+        self.assignment = Assignment.objects.filter(course=self.course).first()
+        self.assignment_file = self.assignment.files.first()
+        self.solution = AssignmentSolution.objects.filter(user=admin).first()
+        self._numbers = itertools.count()
+
+    def number(self):
+        return next(self._numbers)
+
+    def new_course(self):
+        return Course.objects.create(author=self.admin, name='new course')
+
+    def ticket(self, path, **data):
+        """
+        Issue a direct upload ticket through ``path`` and upload the file.
+        """
+        response = self.client.post(
+            path, **json_body(dict(data, filename='notes.pdf')))
+        ticket = json.loads(response.content.decode('utf-8'))['data']
+        self.client.put(
+            ticket['upload']['url'], UPLOAD_CONTENT,
+            content_type='application/pdf')
+        return ticket['ticket']
+
+    def upload_session(self, complete=False):
+        session = CourseFileUploadSession.objects.create(
+            section=self.section, filename='lecture.mp4',
+            size=len(UPLOAD_CONTENT), created_by=self.admin)
+        if complete:
+            session = write_chunk(
+                session, 0, len(UPLOAD_CONTENT),
+                hashlib.sha256(UPLOAD_CONTENT).hexdigest(),
+                BytesIO(UPLOAD_CONTENT))
+        return session
+
+
+# request builders, by view and method: ``builder(fixture)`` returns the
+# path and the test client arguments of one request
+BUILDERS = {}
+
+
+def builds(view, *methods):
+    def register(builder):
+        for method in methods:
+            BUILDERS[view, method] = builder
+        return builder
+    return register
+
+
+def account_view(name):
+    return 'account.views.' + name
+
+
+def course_admin_view(name):
+    return 'courses.api.admin.views.' + name
+
+
+def assignment_admin_view(name):
+    return 'assignments.api.admin.views.' + name
+
+
+def assignment_user_view(name):
+    return 'assignments.api.user.views.' + name
+
+
+@builds(account_view('SignUpView'), 'post')
+def build_signup(fixture):
+    return '/api/account/signup/', json_body({
+        'email': 'signup{}@oddnary.test'.format(fixture.number()),
+        'first_name': 'first',
+        'last_name': 'last',
+        'password': PASSWORD,
+        'profile': {
+            'country': 'India',
+            'organization': 'School',
+            'date_of_birth': '2000-01-01',
+        },
+    })
+
+
+def build_login(path, email):
+    def build(fixture):
+        return path, json_body({'email': email, 'password': PASSWORD})
+    return build
+
+
+builds(account_view('SubscriberLoginAPIView'), 'post')(build_login(
+    '/api/account/subscriber/login/', 'subscriber@oddnary.test'))
+builds(account_view('InstructorLoginAPIView'), 'post')(build_login(
+    '/api/account/instructor/login/', 'instructor@oddnary.test'))
+builds(account_view('AdminLoginAPIView'), 'post')(build_login(
+    '/api/account/admin/login/', 'admin@oddnary.test'))
+
+
+@builds(account_view('RefreshTokenAPIView'), 'post')
+def build_refresh(fixture):
+    return '/api/account/token/refresh/', json_body({
+        'refresh': str(AdminAuthSerializer.get_token(fixture.admin)),
+    })
+
+
+@builds(account_view('UserDetailApiView'), 'patch')
+def build_user_update(fixture):
+    return '/api/account/user/', json_body({
+        'first_name': 'renamed',
+        'profile': {'country': 'India', 'organization': 'School'},
+    })
+
+
+@builds(account_view('PasswordResetApiView'), 'put')
+def build_password_change(fixture):
+    return '/api/account/change-password/', json_body({
+        'password': PASSWORD, 'new_password': PASSWORD,
+    })
+
+
+@builds(course_admin_view('CourseCreateListAPIView'), 'post')
+def build_course_create(fixture):
+    return '/api/courses/admin/course/', json_body({
+        'name': 'course', 'description': 'learn', 'is_active': True,
+        'category': fixture.category.pk,
+    })
+
+
+def build_detail(path, attribute, data):
+    """
+    Builder of the PATCH (``data``) or DELETE of the fixture row
+    ``attribute`` at ``path``.
+    """
+    def build(fixture):
+        url = path.format(getattr(fixture, attribute).pk)
+        return url, json_body(data) if data is not None else {}
+    return build
+
+
+for view, path, attribute, data in [
+        ('CourseUpdateApiView', 'course/{}/', 'course',
+         {'name': 'renamed'}),
+        ('CourseSectionUpdateApiView', 'course-section/{}/', 'section',
+         {'name': 'renamed'}),
+        ('CourseFileUpdateAPIView', 'course-section-file/{}/', 'course_file',
+         {'name': 'renamed'}),
+        ('CourseDetailTabUpdateAPIView', 'course-detail-tab/{}/', 'tab',
+         {'name': 'renamed'}),
+        ('CourseDetailTabListUpdateApiView', 'course-detail-tab-list/{}/',
+         'tab_list', {'content': 'renamed'}),
+        ('CategoryUpdateApiView', 'category/{}/', 'category',
+         {'description': 'renamed'}),
+        ]:
+    path = '/api/courses/admin/' + path
+    builds(course_admin_view(view), 'patch')(
+        build_detail(path, attribute, data))
+    builds(course_admin_view(view), 'delete')(
+        build_detail(path, attribute, None))
+
+builds(assignment_admin_view('AssignmentUpdateApiView'), 'patch')(
+    build_detail('/api/assignments/admin/assignment/{}/', 'assignment',
+                 {'name': 'renamed'}))
+builds(assignment_admin_view('AssignmentUpdateApiView'), 'delete')(
+    build_detail('/api/assignments/admin/assignment/{}/', 'assignment', None))
+builds(assignment_admin_view('AssignmentFileUpdateApiView'), 'delete')(
+    build_detail('/api/assignments/admin/assignment-file/{}/',
+                 'assignment_file', None))
+builds(course_admin_view('CategoryCourseUpdateApiView'), 'delete')(
+    build_detail('/api/courses/admin/category-course/{}/', 'relation', None))
+
+
+@builds(course_admin_view('CategoryCourseUpdateApiView'), 'patch')
+def build_category_course_update(fixture):
+    return (
+        '/api/courses/admin/category-course/{}/'.format(fixture.relation.pk),
+        json_body({
+            'category': fixture.category.pk,
+            'course': fixture.new_course().pk,
+        }))
+
+
+@builds(course_admin_view('CourseSectionCreateApiView'), 'post')
+def build_section_create(fixture):
+    return '/api/courses/admin/course-section-create/', json_body({
+        'course': fixture.course.pk, 'name': 'section', 'index': 0,
+    })
+
+
+@builds(course_admin_view('CourseFileCreateAPIView'), 'post')
+def build_course_file_create(fixture):
+    return '/api/courses/admin/course-section-file-create/', {'data': {
+        'section': fixture.section.pk, 'name': 'file',
+        'description': 'notes', 'index': 0, 'file': upload(),
+    }}
+
+
+@builds(course_admin_view('CourseFileUploadTicketAPIView'), 'post')
+def build_course_file_ticket(fixture):
+    return '/api/courses/admin/course-section-file-ticket/', json_body({
+        'section': fixture.section.pk, 'filename': 'notes.pdf',
+    })
+
+
+@builds(course_admin_view('CourseFileFinalizeUploadAPIView'), 'post')
+def build_course_file_finalize(fixture):
+    ticket = fixture.ticket(
+        '/api/courses/admin/course-section-file-ticket/',
+        section=fixture.section.pk)
+    return '/api/courses/admin/course-section-file-finalize/', json_body({
+        'ticket': ticket, 'name': 'file', 'description': 'notes',
+        'index': 0,
+    })
+
+
+@builds('utils.storage.LocalUploadView', 'put')
+def build_local_upload(fixture):
+    response = fixture.client.post(
+        '/api/courses/admin/course-section-file-ticket/', **json_body({
+            'section': fixture.section.pk, 'filename': 'notes.pdf',
+        }))
+    url = json.loads(response.content.decode('utf-8'))['data']['upload'][
+        'url']
+    return url, {'data': UPLOAD_CONTENT, 'content_type': 'application/pdf'}
+
+
+@builds(course_admin_view('CourseFileUploadSessionCreateAPIView'), 'post')
+def build_upload_session_create(fixture):
+    return '/api/courses/admin/course-section-file-upload/', json_body({
+        'section': fixture.section.pk, 'filename': 'lecture.mp4',
+        'size': len(UPLOAD_CONTENT),
+    })
+
+
+@builds(course_admin_view('CourseFileUploadSessionAPIView'), 'put')
+def build_upload_chunk(fixture):
+    session = fixture.upload_session()
+    return (
+        '/api/courses/admin/course-section-file-upload/{}/'.format(
+            session.pk),
+        {
+            'data': UPLOAD_CONTENT,
+            'content_type': 'application/octet-stream',
+            'HTTP_UPLOAD_OFFSET': '0',
+            'HTTP_UPLOAD_CHECKSUM': hashlib.sha256(
+                UPLOAD_CONTENT).hexdigest(),
+        })
+
+
+@builds(course_admin_view('CourseFileUploadSessionFinalizeAPIView'), 'post')
+def build_upload_session_finalize(fixture):
+    session = fixture.upload_session(complete=True)
+    return (
+        '/api/courses/admin/course-section-file-upload/{}/finalize/'.format(
+            session.pk),
+        json_body({'name': 'lecture', 'description': 'notes', 'index': 0}))
+
+
+@builds(course_admin_view('CourseDetailTabCreateAPIView'), 'post')
+def build_tab_create(fixture):
+    return '/api/courses/admin/course-detail-tab-create/', json_body({
+        'course': fixture.course.pk, 'name': 'tab', 'content': 'content',
+        'index': 0,
+    })
+
+
+@builds(course_admin_view('CourseDetailTabListCreateApiView'), 'post')
+def build_tab_list_create(fixture):
+    return '/api/courses/admin/course-detail-tab-list-create/', json_body({
+        'course_detail_tab': fixture.tab.pk, 'content': 'item', 'index': 0,
+    })
+
+
+@builds(course_admin_view('CategoryCreateApiView'), 'post')
+def build_category_create(fixture):
+    return '/api/courses/admin/category/', json_body({
+        'name': 'new category {}'.format(fixture.number()),
+        'description': 'new',
+    })
+
+
+@builds(course_admin_view('CategoryCourseCreateListApiView'), 'post')
+def build_category_course_create(fixture):
+    return '/api/courses/admin/category-course/', json_body({
+        'category': fixture.category.pk, 'course': fixture.new_course().pk,
+    })
+
+
+@builds(course_admin_view('CourseImportAPIView'), 'post')
+def build_course_import(fixture):
+    row = {
+        'name': 'imported',
+        'description': 'imported',
+        'is_active': True,
+        'categories': [str(fixture.category.pk)],
+        'sections': [
+            {'name': 'section', 'index': index, 'files': [
+                {'name': 'file', 'description': 'file', 'index': file_index,
+                 'file': 'imported/file.pdf'}
+                for file_index in range(10)
+            ]}
+            for index in range(20)
+        ],
+        'tabs': [
+            {'name': 'tab', 'content': 'content', 'index': index,
+             'lists': [{'content': 'item', 'index': 0}]}
+            for index in range(2)
+        ],
+    }
+    return '/api/courses/admin/course-import/', {
+        'data': '\n'.join(json.dumps(row) for _ in range(10)),
+        'content_type': 'application/x-ndjson',
+    }
+
+
+@builds('courses.api.user.views.AddCourseInMyCoursesAPIView', 'post')
+def build_library_add(fixture):
+    return '/api/courses/user/add-course/', json_body({
+        'course': fixture.new_course().pk,
+    })
+
+
+builds('courses.api.user.views.DeleteCourseFromMyCoursesAPIView', 'delete')(
+    build_detail('/api/courses/user/remove-course/{}/', 'library_entry',
+                 None))
+
+
+@builds(assignment_admin_view('AssignmentCreateAPIView'), 'post')
+def build_assignment_create(fixture):
+    return '/api/assignments/admin/assignment-create/', json_body({
+        'course': fixture.course.pk, 'name': 'assignment',
+        'description': 'task', 'index': 0,
+    })
+
+
+def assignment_file_data(fixture):
+    return {
+        'assignment': fixture.assignment.pk, 'name': 'file',
+        'description': 'task', 'index': 0, 'file': upload(),
+    }
+
+
+@builds(assignment_admin_view('AssignmentFileCreateAPIView'), 'post')
+def build_assignment_file_create(fixture):
+    return '/api/assignments/admin/assignment-file-create/', {
+        'data': assignment_file_data(fixture)}
+
+
+@builds(assignment_admin_view('AssignmentFileUpdateApiView'), 'put')
+def build_assignment_file_update(fixture):
+    return (
+        '/api/assignments/admin/assignment-file/{}/'.format(
+            fixture.assignment_file.pk),
+        multipart_body(assignment_file_data(fixture)))
+
+
+@builds(assignment_admin_view('AssignmentFileUploadTicketAPIView'), 'post')
+def build_assignment_file_ticket(fixture):
+    return '/api/assignments/admin/assignment-file-ticket/', json_body({
+        'assignment': fixture.assignment.pk, 'filename': 'notes.pdf',
+    })
+
+
+@builds(assignment_admin_view('AssignmentFileFinalizeUploadAPIView'), 'post')
+def build_assignment_file_finalize(fixture):
+    ticket = fixture.ticket(
+        '/api/assignments/admin/assignment-file-ticket/',
+        assignment=fixture.assignment.pk)
+    return '/api/assignments/admin/assignment-file-finalize/', json_body({
+        'ticket': ticket, 'name': 'file', 'description': 'task',
+        'index': 0,
+    })
+
+
+@builds(assignment_user_view('AssignmentSolutionCreateAPIView'), 'post')
+def build_solution_create(fixture):
+    return '/api/assignments/user/assignment-solution/', json_body({
+        'assignment': fixture.assignment.pk, 'comment': 'solution',
+    })
+
+
+@builds(assignment_user_view('AssignmentSolutionFileUploadAPIView'), 'post')
+def build_solution_file_upload(fixture):
+    return '/api/assignments/user/assignment-solution-file/', {'data': {
+        'assignment_solution': fixture.solution.pk, 'name': 'solution',
+        'comment': 'mine', 'file': upload('solution.py'),
+    }}
+
+
+@builds(assignment_user_view('AssignmentSolutionFileUploadTicketAPIView'),
+        'post')
+def build_solution_file_ticket(fixture):
+    return '/api/assignments/user/assignment-solution-file-ticket/', (
+        json_body({
+            'assignment_solution': fixture.solution.pk,
+            'filename': 'solution.py',
+        }))
+
+
+@builds(assignment_user_view('AssignmentSolutionFileFinalizeUploadAPIView'),
+        'post')
+def build_solution_file_finalize(fixture):
+    ticket = fixture.ticket(
+        '/api/assignments/user/assignment-solution-file-ticket/',
+        assignment_solution=fixture.solution.pk)
+    return '/api/assignments/user/assignment-solution-file-finalize/', (
+        json_body({'ticket': ticket, 'name': 'solution', 'comment': 'mine'}))
+
+
+@builds('utils.metrics.metrics_view', 'get')
+def build_metrics(fixture):
+    return '/api/internal/metrics', {
+        'HTTP_AUTHORIZATION': 'Bearer {}'.format(metrics.METRICS_TOKEN),
+    }
+
+
+def candidate_urls(pattern):
+    """
+    ``(kind, url)`` pairs, the kind of seeded object in the URL is
+    reported instead of its random primary key.
+    """
+    if not GROUP.search(pattern):
+        yield None, '/' + pattern
+        return
+    for model in KINDS:
+        pk = model.objects.values_list('pk', flat=True).first()
+        if pk is not None:
+            yield model.__name__, '/' + GROUP.sub(str(pk), pattern)
+
+
+def resolve_url(client, pattern):
+    """
+    The ``(kind, url)`` candidate with the largest successful response, so
+    that views filtering on the parameter are measured with rows.
+    """
+    best, best_size = None, -1
+    for kind, url in candidate_urls(pattern):
+        try:
+            response = client.get(url)
+        except Exception:
+            size = -1
+        else:
+            size = len(response.content) if (
+                response.status_code < 400 and not response.streaming) else -1
+        if size > best_size or best is None:
+            best, best_size = (kind, url), size
+    return best
+
+
+def percentile(timings, fraction):
+    ordered = sorted(timings)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def send(client, method, prepare):
+    """
+    One request of ``method``, built by ``prepare()`` before the clock
+    starts. Requests that change data are rolled back, and the tokens
+    they revoke (a password change) restored.
+    """
+    if method == 'get':
+        url, kwargs = prepare()
+        started = time.perf_counter()
+        response = client.get(url, **kwargs)
+        return response, time.perf_counter() - started
+    with transaction.atomic():
+        url, kwargs = prepare()
+        started = time.perf_counter()
+        response = getattr(client, method)(url, **kwargs)
+        elapsed = time.perf_counter() - started
+        transaction.set_rollback(True)
+    token_denylist.clear()
+    return response, elapsed
+
+
+def measure(client, method, prepare, requests, warm):
+    timings = []
+    for _ in range(requests):
+        if not warm:
+            cache.clear()
+        response, elapsed = send(client, method, prepare)
+        timings.append(elapsed * 1000)
+
+    # queries and memory in a pass of their own, tracing slows it down
+    if not warm:
+        cache.clear()
+    tracemalloc.start()
+    with CaptureQueriesContext(connection) as queries:
+        response, _ = send(client, method, prepare)
+        content = b''.join(response) if response.streaming else (
+            response.content)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        'status': response.status_code,
+        'p50_ms': round(percentile(timings, .5), 3),
+        'p95_ms': round(percentile(timings, .95), 3),
+        'queries': len(queries),
+        'peak_memory_kb': round(peak / 1024, 1),
+        'response_bytes': len(content),
+    }
+
+
+def run(client, fixture, args):
+    results, skipped = [], []
+    for pattern, name, callback in endpoints(get_resolver().url_patterns):
+        if not pattern.startswith('api/'):
+            continue
+        view = view_name(callback)
+        for method in view_methods(callback):
+            entry = {
+                'pattern': pattern, 'name': name, 'view': view,
+                'method': method.upper(),
+            }
+            builder = BUILDERS.get((view, method))
+            if builder is None and method != 'get':
+                skipped.append(dict(entry, reason='no request builder'))
+                continue
+            try:
+                if builder is None:
+                    kind, url = resolve_url(client, pattern)
+                    entry['parameter'] = kind
+
+                    def prepare(url=url):
+                        return url, {}
+                else:
+                    def prepare(builder=builder):
+                        return builder(fixture)
+                entry.update(measure(
+                    client, method, prepare, args.requests, args.warm))
+            except Exception as error:
+                entry['error'] = '{}: {}'.format(type(error).__name__, error)
+            results.append(entry)
+    return results, skipped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--users', type=int, default=10000)
+    parser.add_argument('--courses', type=int, default=2000)
+    parser.add_argument('--sections', type=int, default=20)
+    parser.add_argument('--files', type=int, default=10)
+    parser.add_argument('--solutions', type=int, default=50000)
+    parser.add_argument('--requests', type=int, default=20)
+    parser.add_argument('--warm', action='store_true')
+    parser.add_argument('--output')
+    args = parser.parse_args()
+
+    media_root = tempfile.mkdtemp(prefix='benchmark-media-')
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        with override_settings(
+                MEDIA_ROOT=media_root,
+                UPLOAD_SESSION_ROOT=os.path.join(media_root, 'parts'),
+                DEFAULT_FILE_STORAGE=(
+                    'utils.storage.DirectUploadFileSystemStorage')):
+            started = time.perf_counter()
+            admin = seed(args)
+            seconds = time.perf_counter() - started
+            client = Client(HTTP_AUTHORIZATION='Bearer {}'.format(
+                AdminAuthSerializer.get_token(admin).access_token))
+            results, skipped = run(client, Fixture(admin, client), args)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        shutil.rmtree(media_root, ignore_errors=True)
+
+    report = {
+        'settings': os.environ['DJANGO_SETTINGS_MODULE'],
+        'volumes': {
+            key: getattr(args, key)
+            for key in ('users', 'courses', 'sections', 'files', 'solutions')
+        },
+        'requests': args.requests,
+        'warm': args.warm,
+        'seed_seconds': round(seconds, 1),
+        'endpoints': results,
+        'skipped': skipped,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as output:
+            output.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Rows per second of the public course list and the admin user list,
+rendered by their serializer and by their values projection.
+
+    python benchmarks/projection.py [--rows 5000] [--repeat 5]
+
+A test database is created for the configured ``default`` database
+(``DJANGO_SETTINGS_MODULE``, oddnary.settings.test by default), filled
+with ``--rows`` courses and users, and dropped afterwards. Timings
+include the query.
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'oddnary.settings.test')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connections  # noqa: E402
+
+from account.models import Profile  # noqa: E402
+from account.serializers import (  # noqa: E402
+    UserListProjection, UserListSerializer,
+)
+from courses.api.public.serializers import (  # noqa: E402
+    PublicCourseListProjection, PublicCourseListSerializer,
+)
+from courses.models import Course  # noqa: E402
+
+User = get_user_model()
+
+
+def fill(rows):
+    author = User.objects.create_user(
+        email='author@oddnary.test', password='password')
+    Course.objects.bulk_create(
+        Course(author=author, name='course {}'.format(index),
+               description='learn', is_active=True)
+        for index in range(rows))
+    users = User.objects.bulk_create(
+        User(email='user{}@oddnary.test'.format(index),
+             first_name='first', last_name='last')
+        for index in range(rows))
+    Profile.objects.bulk_create(Profile(user=user) for user in users)
+
+
+def rows_per_second(func, rows, repeat):
+    return rows / min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    connection = connections['default']
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        fill(args.rows)
+        courses = Course.objects.published()
+        users = User.objects.filter(is_staff=False)
+        cases = [
+            ('course list', (
+                lambda: PublicCourseListSerializer(
+                    courses.all(), many=True).data,
+                lambda: PublicCourseListProjection(
+                    PublicCourseListProjection.values(courses),
+                    many=True).data,
+            )),
+            ('user list', (
+                lambda: UserListSerializer(
+                    users.select_related('profile'), many=True).data,
+                lambda: UserListProjection(
+                    UserListProjection.values(users), many=True).data,
+            )),
+        ]
+        print('{:<14} {:>14} {:>14}'.format(
+            'rows/s', 'serializer', 'projection'))
+        for label, (serializer, projection) in cases:
+            print('{:<14} {:>14.0f} {:>14.0f}'.format(
+                label,
+                rows_per_second(serializer, args.rows, args.repeat),
+                rows_per_second(projection, args.rows, args.repeat),
+            ))
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+if __name__ == '__main__':
+    main()
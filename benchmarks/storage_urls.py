@@ -0,0 +1,108 @@
+"""
+Per-file cost of file URLs for a course tree of 500 files.
+
+    python benchmarks/storage_urls.py [--files 500] [--repeat 5]
+
+Compares ``storage.url()`` with the cached layer of ``utils.storage_urls``
+(cold and warm), and times ``CourseFileDetailSerializer`` on the tree.
+Storages: the local FileSystemStorage and, when boto3 is installed, S3
+with signed URLs, with public objects and with a custom domain. S3 URLs
+are built offline, no request is sent.
+"""
+import argparse
+import os
+import sys
+import timeit
+from uuid import uuid4
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'oddnary.settings.test')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.exceptions import ImproperlyConfigured  # noqa: E402
+from django.core.files.storage import FileSystemStorage  # noqa: E402
+
+from courses.api.admin.serializers import CourseFileDetailSerializer  # noqa
+from courses.models import Course, CourseSection, CourseFile  # noqa: E402
+from utils.storage_urls import StorageURLCache  # noqa: E402
+
+
+def course_tree(files, sections=10):
+    course = Course(name='course')
+    section_list = [
+        CourseSection(course=course, name='section {}'.format(index))
+        for index in range(sections)
+    ]
+    tree = []
+    for index in range(files):
+        section = section_list[index % sections]
+        course_file = CourseFile(section=section, name='file', index=index)
+        course_file.file.name = '{}/{}/{}/lecture-{}.pdf'.format(
+            course.id, section.id, uuid4(), index)
+        tree.append(course_file)
+    return tree
+
+
+def storages():
+    yield 'filesystem', FileSystemStorage(base_url='/media/')
+    try:
+        from storages.backends.s3boto3 import S3Boto3Storage
+    except (ImportError, ImproperlyConfigured):
+        print('boto3 / django-storages not installed, S3 skipped\n')
+        return
+    options = dict(
+        bucket_name='oddnary-media', access_key='AKIDEXAMPLE',
+        secret_key='secret', region_name='us-east-1', location='media')
+    yield 's3 signed', S3Boto3Storage(**options)
+    yield 's3 public', S3Boto3Storage(querystring_auth=False, **options)
+    yield 's3 custom domain', S3Boto3Storage(
+        custom_domain='oddnary-media.s3.amazonaws.com', **options)
+
+
+def per_file(func, files, repeat):
+    # best of ``repeat`` runs, in microseconds per file
+    return min(timeit.repeat(func, number=1, repeat=repeat)) / files * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--files', type=int, default=500)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    tree = course_tree(args.files)
+    names = [course_file.file.name for course_file in tree]
+    print('{:<18} {:>12} {:>12} {:>12}'.format(
+        'storage', 'url() us', 'cold us', 'warm us'))
+    for label, storage in storages():
+        cache = StorageURLCache(maxsize=len(names))
+
+        def cold():
+            cache.clear()
+            for name in names:
+                cache.url(storage, name)
+
+        def warm():
+            for name in names:
+                cache.url(storage, name)
+
+        print('{:<18} {:>12.2f} {:>12.2f} {:>12.2f}'.format(
+            label,
+            per_file(lambda: [storage.url(name) for name in names],
+                     args.files, args.repeat),
+            per_file(cold, args.files, args.repeat),
+            per_file(warm, args.files, args.repeat),
+        ))
+
+    serialize = per_file(
+        lambda: CourseFileDetailSerializer(tree, many=True).data,
+        args.files, args.repeat)
+    print('\nCourseFileDetailSerializer, default storage: '
+          '{:.2f} us per file'.format(serialize))
+
+
+if __name__ == '__main__':
+    main()
@@ -9,11 +9,19 @@ from courses.models import (
     Course,
     CourseSection,
     CourseFile,
+    CourseFileUploadSession,
     CourseDetailTab,
     CourseDetailTabList,
     Category,
     CategoryCourseRelation,
     )
+from courses.uploads import commit_upload, UPLOAD_CHUNK_MAX_SIZE
+from utils.storage_urls import CachedFileURLMixin
+from utils.upload_location import clean_filename
+from utils.direct_upload import (
+    UploadTicketSerializer,
+    FinalizeUploadSerializer,
+    )
 
 User = get_user_model()
 
@@ -116,6 +124,118 @@ class CourseFileCreateSerializer(serializers.ModelSerializer):
         ]
 
 
+class CourseFileUploadTicketSerializer(UploadTicketSerializer):
+    section = serializers.PrimaryKeyRelatedField(
+        queryset=CourseSection.objects.all(),
+        required=True
+        )
+
+    class Meta:
+        model = CourseFile
+        parent_field = 'section'
+
+
+class CourseFileFinalizeSerializer(FinalizeUploadSerializer):
+    name = serializers.CharField(required=True)
+    description = serializers.CharField(required=True)
+    index = serializers.IntegerField(required=True)
+    is_active = serializers.BooleanField(required=False)
+
+    class Meta:
+        model = CourseFile
+        parent_field = 'section'
+        fields = [
+            'id',
+            'ticket',
+            'section',
+            'name',
+            'description',
+            'file',
+            'index',
+            'is_active',
+        ]
+        read_only_fields = [
+            'id',
+            'section',
+            'file',
+        ]
+
+
+class CourseFileUploadSessionSerializer(serializers.ModelSerializer):
+    section = serializers.PrimaryKeyRelatedField(
+        queryset=CourseSection.objects.all(),
+        required=True
+        )
+    size = serializers.IntegerField(min_value=1)
+    checksum = serializers.RegexField(
+        r'^[0-9a-fA-F]{64}$',
+        required=False,
+        allow_blank=True,
+        )
+    chunk_max_size = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CourseFileUploadSession
+        fields = [
+            'id',
+            'section',
+            'filename',
+            'size',
+            'checksum',
+            'offset',
+            'chunk_max_size',
+            'course_file',
+        ]
+        read_only_fields = [
+            'id',
+            'offset',
+            'course_file',
+        ]
+
+    def get_chunk_max_size(self, obj):
+        return UPLOAD_CHUNK_MAX_SIZE
+
+    def validate_filename(self, value):
+        # the course file is stored under the base name only, as with
+        # multipart uploads
+        filename = clean_filename(value)
+        if filename is None:
+            raise serializers.ValidationError('Invalid file name.')
+        return filename
+
+
+class CourseFileUploadFinalizeSerializer(serializers.ModelSerializer):
+    """
+    Creates the course file of a complete upload session, given in the
+    ``session`` context.
+    """
+    name = serializers.CharField(required=True)
+    description = serializers.CharField(required=True)
+    index = serializers.IntegerField(required=True)
+    is_active = serializers.BooleanField(required=False)
+
+    class Meta:
+        model = CourseFile
+        fields = [
+            'id',
+            'section',
+            'name',
+            'description',
+            'file',
+            'index',
+            'is_active',
+        ]
+        read_only_fields = [
+            'id',
+            'section',
+            'file',
+        ]
+
+    def create(self, validated_data):
+        return commit_upload(
+            self.context['session'], CourseFile(**validated_data))
+
+
 class CourseFileSerializer(serializers.ModelSerializer):
     section = CourseSectionSerializer(read_only=True)
 
@@ -129,10 +249,19 @@ class CourseFileSerializer(serializers.ModelSerializer):
             'file',
             'index',
             'is_active',
+            'size',
+            'checksum',
+            'content_type',
+        ]
+        read_only_fields = [
+            'size',
+            'checksum',
+            'content_type',
         ]
 
 
-class CourseFileListSerializer(serializers.ModelSerializer):
+class CourseFileListSerializer(CachedFileURLMixin,
+                               serializers.ModelSerializer):
 
     class Meta:
         model = CourseFile
@@ -148,7 +277,7 @@ class CourseFileListSerializer(serializers.ModelSerializer):
 
 class CourseSectionListSerializer(serializers.ModelSerializer):
     
-    course_files = CourseFileListSerializer(many=True)
+    course_files = CourseFileListSerializer(many=True, source='files')
     class Meta:
         model = CourseSection
         fields = [
@@ -162,7 +291,8 @@ class CourseSectionListSerializer(serializers.ModelSerializer):
 
 class CoursesDetailSerializer(serializers.ModelSerializer):
 
-    course_sections = CourseSectionListSerializer(many=True)
+    course_sections = CourseSectionListSerializer(
+        many=True, source='sections')
     class Meta:
         model = Course
         fields = [
@@ -244,7 +374,8 @@ class CourseDetailTabListDetailSerializer(serializers.ModelSerializer):
         ]
 
 
-class CourseFileDetailSerializer(serializers.ModelSerializer):
+class CourseFileDetailSerializer(CachedFileURLMixin,
+                                 serializers.ModelSerializer):
 
     class Meta:
         model = CourseFile
@@ -10,6 +10,11 @@ from .views import (
     CourseSectionUpdateApiView,
     CourseFileCreateAPIView,
     CourseFileUpdateAPIView,
+    CourseFileUploadTicketAPIView,
+    CourseFileFinalizeUploadAPIView,
+    CourseFileUploadSessionCreateAPIView,
+    CourseFileUploadSessionAPIView,
+    CourseFileUploadSessionFinalizeAPIView,
     CoursesDetailAPIView,
     CourseDetailTabCreateAPIView,
     CourseDetailTabUpdateAPIView,
@@ -20,6 +25,8 @@ from .views import (
     CategoryUpdateApiView,
     CategoryCourseCreateListApiView,
     CategoryCourseUpdateApiView,
+    CourseImportAPIView,
+    CourseExportAPIView,
     )
 
 urlpatterns = [
@@ -58,6 +65,31 @@ urlpatterns = [
         CourseFileUpdateAPIView.as_view(),
         name='course_section_file',
     ),
+    url(
+        r'^course-section-file-ticket/$',
+        CourseFileUploadTicketAPIView.as_view(),
+        name='course_section_file_ticket',
+    ),
+    url(
+        r'^course-section-file-finalize/$',
+        CourseFileFinalizeUploadAPIView.as_view(),
+        name='course_section_file_finalize',
+    ),
+    url(
+        r'^course-section-file-upload/$',
+        CourseFileUploadSessionCreateAPIView.as_view(),
+        name='course_section_file_upload_create',
+    ),
+    url(
+        r'^course-section-file-upload/(?P<pk>[0-9a-z-]+)/$',
+        CourseFileUploadSessionAPIView.as_view(),
+        name='course_section_file_upload',
+    ),
+    url(
+        r'^course-section-file-upload/(?P<pk>[0-9a-z-]+)/finalize/$',
+        CourseFileUploadSessionFinalizeAPIView.as_view(),
+        name='course_section_file_upload_finalize',
+    ),
     url(
         r'^all-course-detail/$',
         CoursesDetailAPIView.as_view(),
@@ -108,4 +140,14 @@ urlpatterns = [
         CategoryCourseUpdateApiView.as_view(),
         name='category_course_detail',
     ),
-]
\ No newline at end of file
+    url(
+        r'^course-import/$',
+        CourseImportAPIView.as_view(),
+        name='course_import',
+    ),
+    url(
+        r'^course-export/$',
+        CourseExportAPIView.as_view(),
+        name='course_export',
+    ),
+]
@@ -1,11 +1,11 @@
 # restframework imports
-from rest_framework.response import Response
-from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 #djnago imports
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.http import StreamingHttpResponse
 from .serializers import (
 	CourseCreateSerializer,
 	CourseSerializer,
@@ -13,6 +13,10 @@ from .serializers import (
 	CourseSectionSerializer,
 	CourseFileCreateSerializer,
 	CourseFileSerializer,
+	CourseFileUploadTicketSerializer,
+	CourseFileFinalizeSerializer,
+	CourseFileUploadSessionSerializer,
+	CourseFileUploadFinalizeSerializer,
 	CoursesDetailSerializer,
 	CourseDetailTabCreateSerializer,
 	CourseDetailTabSerializer,
@@ -28,21 +32,29 @@ from courses.models import (
 	Course,
 	CourseSection,
 	CourseFile,
+	CourseFileUploadSession,
 	CourseDetailTab,
 	CourseDetailTabList,
 	Category,
 	CategoryCourseRelation,
 )
+from courses.prefetch import COURSE_DETAIL_PLAN, COURSE_FULL_DETAIL_PLAN
+from courses import bulk
+from courses.uploads import UploadError, write_chunk
 from utils.permissions import IsAdmin
+from utils.conditional import ConditionalGetMixin
+from utils.pagination import CourseIndexPagination, KeysetPagination
+from utils.streaming import StreamingListMixin
 
 from utils import res_codes
 
 User = get_user_model()
 
 
-class CourseCreateListAPIView(APIView):
+class CourseCreateListAPIView(ConditionalGetMixin, StreamingListMixin, APIView):
 	permission_classes = (IsAuthenticated, IsAdmin)
 	serializer_class = CourseCreateSerializer
+	pagination_class = KeysetPagination
 
 	def post(self, request, *args, **kwargs):
 		"""
@@ -137,24 +149,18 @@ class CourseCreateListAPIView(APIView):
 				category_error = {
 					'category': 'Such category does not exists.'
 				}
-				return Response(
-					res_codes.get_response_dict(
-						res_codes.INVALID_POST_DATA,
-						category_error,
-					),
-					status=status.HTTP_400_BAD_REQUEST
+				return res_codes.respond(
+					res_codes.INVALID_POST_DATA,
+					category_error,
 				)
 		
 		else:
 			category_error = {
 				'category': "This field can't be null."
 			}
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.INVALID_POST_DATA,
-					category_error,
-				),
-				status=status.HTTP_400_BAD_REQUEST
+			return res_codes.respond(
+				res_codes.INVALID_POST_DATA,
+				category_error,
 			)
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
@@ -167,22 +173,23 @@ class CourseCreateListAPIView(APIView):
 			except:
 				pass
 				
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.COURSE_CREATED,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
+			return res_codes.respond(
+				res_codes.COURSE_CREATED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
-			),
-			status=status.HTTP_400_BAD_REQUEST
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
 
 
+	def get_etag_querysets(self):
+		courses = self.get_etag_page(Course.objects.all())
+		return [
+			courses,
+			User.objects.filter(courses__in=courses),
+		]
+
 	def get(self, request, format=None):
 		"""
 		{
@@ -205,21 +212,24 @@ class CourseCreateListAPIView(APIView):
 			]
 		}
 		"""
-		courses = Course.objects.all()
+		courses = Course.objects.select_related('author')
+		if self.wants_stream(request):
+			return self.get_streaming_response(courses, CourseSerializer)
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(courses, request, view=self)
 		serializer = CourseSerializer(
-				courses,
+				page,
 				many=True
 			)
-		return Response(
+		return paginator.get_paginated_response(
 				res_codes.get_response_dict(
 					res_codes.SUCCESS,
 					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+				)
 			)
 
 
-class CourseUpdateApiView(APIView):
+class CourseUpdateApiView(ConditionalGetMixin, APIView):
 	"""
 	Retrieve, update or delete a course instance.
 	"""
@@ -232,6 +242,13 @@ class CourseUpdateApiView(APIView):
 		except Course.DoesNotExist:
 			return None
 
+	def get_etag_querysets(self):
+		pk = self.kwargs.get('pk')
+		return [
+			Course.objects.filter(pk=pk),
+			User.objects.filter(courses__pk=pk),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		#Response
@@ -264,19 +281,11 @@ class CourseUpdateApiView(APIView):
 		course = self.get_object()
 		if course:
 			serializer = self.serializer_class(course)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.SUCCESS,
-					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+			return res_codes.respond(
+				res_codes.SUCCESS,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def patch(self, request, *args, **kwargs):
 		"""
@@ -334,26 +343,15 @@ class CourseUpdateApiView(APIView):
 			)
 			if serializer.is_valid():
 				serializer.save()
-				return Response(
-						res_codes.get_response_dict(
-							res_codes.COURSE_UPDATED,
-							serializer.data,
-						),
-						status=status.HTTP_200_OK,
-					)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.INVALID_POST_DATA,
-					serializer.errors
-				),
-				status=status.HTTP_400_BAD_REQUEST
+				return res_codes.respond(
+					res_codes.COURSE_UPDATED,
+					serializer.data,
+				)
+			return res_codes.respond(
+				res_codes.INVALID_POST_DATA,
+				serializer.errors,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def delete(self, request, *args, **kwargs):
 		"""
@@ -389,18 +387,8 @@ class CourseUpdateApiView(APIView):
 			course.is_active = False
 			course.is_deleted = True
 			course.save()
-			return Response(
-						res_codes.get_response_dict(
-							res_codes.COURSE_DELETED
-						),
-						status=status.HTTP_204_NO_CONTENT
-					)
-		return Response(
-					res_codes.get_response_dict(
-						res_codes.PK_NOT_FOUND
-					),
-					status=status.HTTP_400_BAD_REQUEST
-				)
+			return res_codes.respond(res_codes.COURSE_DELETED)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 
 class CourseSectionCreateApiView(APIView):
@@ -479,28 +467,31 @@ class CourseSectionCreateApiView(APIView):
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
 			serializer.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.COURSE_SECTION_CREATED,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
+			return res_codes.respond(
+				res_codes.COURSE_SECTION_CREATED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
-			),
-			status=status.HTTP_400_BAD_REQUEST
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
 
 
-class CourseSectionListAPIView(APIView):
+class CourseSectionListAPIView(ConditionalGetMixin, APIView):
 	"""
 	List all the available course sections
 	"""
 	permission_classes = (IsAuthenticated, IsAdmin)
 	serializer_class = CourseSectionSerializer
+	pagination_class = CourseIndexPagination
+
+	def get_etag_querysets(self):
+		sections = self.get_etag_page(CourseSection.objects.all())
+		return [
+			sections,
+			Course.objects.filter(sections__in=sections),
+			User.objects.filter(courses__sections__in=sections),
+		]
 
 	def get(self, request, format=None):
 		"""
@@ -524,21 +515,22 @@ class CourseSectionListAPIView(APIView):
 		    "msg": "Request processed successfully"
 		}
 		"""
-		course_sections = CourseSection.objects.all()
+		course_sections = CourseSection.objects.select_related('course__author')
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(course_sections, request, view=self)
 		serializer = self.serializer_class(
-				course_sections,
+				page,
 				many=True
 			)
-		return Response(
+		return paginator.get_paginated_response(
 				res_codes.get_response_dict(
 					res_codes.SUCCESS,
 					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+				)
 			)
 
 
-class CourseSectionUpdateApiView(APIView):
+class CourseSectionUpdateApiView(ConditionalGetMixin, APIView):
 	"""
 	Retrieve, update or delete a course section instance.
 	"""
@@ -551,6 +543,14 @@ class CourseSectionUpdateApiView(APIView):
 		except CourseSection.DoesNotExist:
 			return None
 
+	def get_etag_querysets(self):
+		pk = self.kwargs.get('pk')
+		return [
+			CourseSection.objects.filter(pk=pk),
+			Course.objects.filter(sections__pk=pk),
+			User.objects.filter(courses__sections__pk=pk),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		# Response(Success)
@@ -605,19 +605,11 @@ class CourseSectionUpdateApiView(APIView):
 		course_section = self.get_object()
 		if course_section:
 			serializer = self.serializer_class(course_section)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.SUCCESS,
-					serializer.data,
-				),
-				status=status.HTTP_200_OK,
-			)
-		return Response(
-				res_codes.get_response_dict(
-					res_codes.PK_NOT_FOUND
-				),
-				status=status.HTTP_400_BAD_REQUEST
+			return res_codes.respond(
+				res_codes.SUCCESS,
+				serializer.data,
 			)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def patch(self, request, *args, **kwargs):
 		"""
@@ -699,26 +691,15 @@ class CourseSectionUpdateApiView(APIView):
 			)
 			if serializer.is_valid():
 				serializer.save()
-				return Response(
-					res_codes.get_response_dict(
-						res_codes.COURSE_SECTION_UPDATED,
-						serializer.data,
-					),
-					status=status.HTTP_200_OK,
+				return res_codes.respond(
+					res_codes.COURSE_SECTION_UPDATED,
+					serializer.data,
 				)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.INVALID_POST_DATA,
-					serializer.errors
-				),
-				status=status.HTTP_400_BAD_REQUEST
+			return res_codes.respond(
+				res_codes.INVALID_POST_DATA,
+				serializer.errors,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def delete(self, request, *args, **kwargs):
 		"""
@@ -754,18 +735,8 @@ class CourseSectionUpdateApiView(APIView):
 			course_section.is_active = False
 			course_section.is_deleted = True
 			course_section.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.COURSE_SECTION_DELETED
-				),
-				status=status.HTTP_204_NO_CONTENT,
-			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+			return res_codes.respond(res_codes.COURSE_SECTION_DELETED)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 
 class CourseFileCreateAPIView(APIView):
@@ -843,23 +814,17 @@ class CourseFileCreateAPIView(APIView):
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
 			serializer.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.COURSE_SECTION_FILE_CREATED,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
+			return res_codes.respond(
+				res_codes.COURSE_SECTION_FILE_CREATED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
-			),
-			status=status.HTTP_400_BAD_REQUEST
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
 
 
-class CourseFileUpdateAPIView(APIView):
+class CourseFileUpdateAPIView(ConditionalGetMixin, APIView):
 	"""
 	Retrieve, update or delete a course file instance.
 	"""
@@ -868,10 +833,21 @@ class CourseFileUpdateAPIView(APIView):
 
 	def get_object(self):
 		try:
-			return CourseFile.objects.get(pk=self.kwargs.get('pk'))
+			return CourseFile.objects.select_related(
+				'section__course__author',
+			).get(pk=self.kwargs.get('pk'))
 		except CourseFile.DoesNotExist:
 			return None
 
+	def get_etag_querysets(self):
+		pk = self.kwargs.get('pk')
+		return [
+			CourseFile.objects.filter(pk=pk),
+			CourseSection.objects.filter(files__pk=pk),
+			Course.objects.filter(sections__files__pk=pk),
+			User.objects.filter(courses__sections__files__pk=pk),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		# Response(Success)
@@ -934,19 +910,11 @@ class CourseFileUpdateAPIView(APIView):
 		course_file = self.get_object()
 		if course_file:
 			serializer = self.serializer_class(course_file)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.SUCCESS,
-					serializer.data,
-				),
-				status=status.HTTP_200_OK,
-			)
-		return Response(
-				res_codes.get_response_dict(
-					res_codes.PK_NOT_FOUND
-				),
-				status=status.HTTP_400_BAD_REQUEST
+			return res_codes.respond(
+				res_codes.SUCCESS,
+				serializer.data,
 			)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def patch(self, request, *args, **kwargs):
 		"""
@@ -1038,26 +1006,15 @@ class CourseFileUpdateAPIView(APIView):
 			)
 			if serializer.is_valid():
 				serializer.save()
-				return Response(
-					res_codes.get_response_dict(
-						res_codes.COURSE_SECTION_FILE_UPDATED,
-						serializer.data,
-					),
-					status=status.HTTP_200_OK,
+				return res_codes.respond(
+					res_codes.COURSE_SECTION_FILE_UPDATED,
+					serializer.data,
 				)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.INVALID_POST_DATA,
-					serializer.errors
-				),
-				status=status.HTTP_400_BAD_REQUEST
+			return res_codes.respond(
+				res_codes.INVALID_POST_DATA,
+				serializer.errors,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def delete(self, request, *args, **kwargs):
 		"""
@@ -1092,26 +1049,25 @@ class CourseFileUpdateAPIView(APIView):
 		if course_file:
 			course_file.is_active = False
 			course_file.is_deleted = True
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.COURSE_SECTION_FILE_DELETED
-				),
-				status=status.HTTP_204_NO_CONTENT,
-			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+			return res_codes.respond(res_codes.COURSE_SECTION_FILE_DELETED)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 
-class CoursesDetailAPIView(APIView):
+class CoursesDetailAPIView(ConditionalGetMixin, APIView):
 	"""
 	List all the available course,sections,files.
 	"""
 	permission_classes = (IsAuthenticated, IsAdmin)
 	serializer_class = CoursesDetailSerializer
+	pagination_class = KeysetPagination
+
+	def get_etag_querysets(self):
+		courses = self.get_etag_page(Course.objects.all())
+		return [
+			courses,
+			CourseSection.objects.filter(course__in=courses),
+			CourseFile.objects.filter(section__course__in=courses),
+		]
 
 	def get(self, request, format=None):
 		"""
@@ -1177,17 +1133,18 @@ class CoursesDetailAPIView(APIView):
 		    "msg": "Request processed successfully"
 		}
 		"""
-		courses = Course.objects.all()
+		courses = COURSE_DETAIL_PLAN.apply(Course.objects.all())
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(courses, request, view=self)
 		serializer = self.serializer_class(
-				courses,
+				page,
 				many=True
 			)
-		return Response(
+		return paginator.get_paginated_response(
 				res_codes.get_response_dict(
 					res_codes.SUCCESS,
 					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+				)
 			)
 
 
@@ -1273,23 +1230,17 @@ class CourseDetailTabCreateAPIView(APIView):
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
 			serializer.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.COURSE_DETAIL_TAB_CREATED,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
+			return res_codes.respond(
+				res_codes.COURSE_DETAIL_TAB_CREATED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
-			),
-			status=status.HTTP_400_BAD_REQUEST
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
 
 
-class CourseDetailTabUpdateAPIView(APIView):
+class CourseDetailTabUpdateAPIView(ConditionalGetMixin, APIView):
 	"""
 	Retrieve, update or delete a course file instance.
 	"""
@@ -1302,6 +1253,14 @@ class CourseDetailTabUpdateAPIView(APIView):
 		except CourseDetailTab.DoesNotExist:
 			return None
 
+	def get_etag_querysets(self):
+		pk = self.kwargs.get('pk')
+		return [
+			CourseDetailTab.objects.filter(pk=pk),
+			Course.objects.filter(detail_tabs__pk=pk),
+			User.objects.filter(courses__detail_tabs__pk=pk),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		# Response(Success)
@@ -1357,19 +1316,11 @@ class CourseDetailTabUpdateAPIView(APIView):
 		detail_tab = self.get_object()
 		if detail_tab:
 			serializer = self.serializer_class(detail_tab)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.SUCCESS,
-					serializer.data,
-				),
-				status=status.HTTP_200_OK,
-			)
-		return Response(
-				res_codes.get_response_dict(
-					res_codes.PK_NOT_FOUND
-				),
-				status=status.HTTP_400_BAD_REQUEST
+			return res_codes.respond(
+				res_codes.SUCCESS,
+				serializer.data,
 			)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def patch(self, request, *args, **kwargs):
 		"""
@@ -1454,26 +1405,15 @@ class CourseDetailTabUpdateAPIView(APIView):
 			)
 			if serializer.is_valid():
 				serializer.save()
-				return Response(
-					res_codes.get_response_dict(
-						res_codes.COURSE_DETAIL_TAB_UPDATED,
-						serializer.data,
-					),
-					status=status.HTTP_200_OK,
+				return res_codes.respond(
+					res_codes.COURSE_DETAIL_TAB_UPDATED,
+					serializer.data,
 				)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.INVALID_POST_DATA,
-					serializer.errors
-				),
-				status=status.HTTP_400_BAD_REQUEST
+			return res_codes.respond(
+				res_codes.INVALID_POST_DATA,
+				serializer.errors,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def delete(self, request, *args, **kwargs):
 		"""
@@ -1509,18 +1449,8 @@ class CourseDetailTabUpdateAPIView(APIView):
 			detail_tab.is_active = False
 			detail_tab.is_deleted = True
 			detail_tab.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.COURSE_DETAIL_TAB_DELETED
-				),
-				status=status.HTTP_204_NO_CONTENT,
-			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+			return res_codes.respond(res_codes.COURSE_DETAIL_TAB_DELETED)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 
 class CourseDetailTabListCreateApiView(APIView):
@@ -1600,23 +1530,17 @@ class CourseDetailTabListCreateApiView(APIView):
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
 			serializer.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.COURSE_DETAIL_TAB_LIST_CREATED,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
+			return res_codes.respond(
+				res_codes.COURSE_DETAIL_TAB_LIST_CREATED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
-			),
-			status=status.HTTP_400_BAD_REQUEST
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
 
 
-class CourseDetailTabListUpdateApiView(APIView):
+class CourseDetailTabListUpdateApiView(ConditionalGetMixin, APIView):
 	"""
 	Retrieve, update or delete a course tab list instance.
 	"""
@@ -1629,6 +1553,15 @@ class CourseDetailTabListUpdateApiView(APIView):
 		except CourseDetailTabList.DoesNotExist:
 			return None
 
+	def get_etag_querysets(self):
+		pk = self.kwargs.get('pk')
+		return [
+			CourseDetailTabList.objects.filter(pk=pk),
+			CourseDetailTab.objects.filter(lists__pk=pk),
+			Course.objects.filter(detail_tabs__lists__pk=pk),
+			User.objects.filter(courses__detail_tabs__lists__pk=pk),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		# Response(Success)
@@ -1690,19 +1623,11 @@ class CourseDetailTabListUpdateApiView(APIView):
 		tab_list_obj = self.get_object()
 		if tab_list_obj:
 			serializer = self.serializer_class(tab_list_obj)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.SUCCESS,
-					serializer.data,
-				),
-				status=status.HTTP_200_OK,
-			)
-		return Response(
-				res_codes.get_response_dict(
-					res_codes.PK_NOT_FOUND
-				),
-				status=status.HTTP_400_BAD_REQUEST
+			return res_codes.respond(
+				res_codes.SUCCESS,
+				serializer.data,
 			)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def patch(self, request, *args, **kwargs):
 		"""
@@ -1792,26 +1717,15 @@ class CourseDetailTabListUpdateApiView(APIView):
 			)
 			if serializer.is_valid():
 				serializer.save()
-				return Response(
-					res_codes.get_response_dict(
-						res_codes.COURSE_DETAIL_TAB_LIST_UPDATED,
-						serializer.data,
-					),
-					status=status.HTTP_200_OK,
+				return res_codes.respond(
+					res_codes.COURSE_DETAIL_TAB_LIST_UPDATED,
+					serializer.data,
 				)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.INVALID_POST_DATA,
-					serializer.errors
-				),
-				status=status.HTTP_400_BAD_REQUEST
+			return res_codes.respond(
+				res_codes.INVALID_POST_DATA,
+				serializer.errors,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def delete(self, request, *args, **kwargs):
 		"""
@@ -1847,27 +1761,30 @@ class CourseDetailTabListUpdateApiView(APIView):
 			tab_list_obj.is_active = False
 			tab_list_obj.is_deleted = True
 			tab_list_obj.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.COURSE_DETAIL_TAB_LIST_DELETED,
-				),
-				status=status.HTTP_204_NO_CONTENT,
-			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+			return res_codes.respond(res_codes.COURSE_DETAIL_TAB_LIST_DELETED)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 
-class CoursesFullDetailAPIView(APIView):
+class CoursesFullDetailAPIView(ConditionalGetMixin, APIView):
 	"""
 	To list all the available courses with sections, files, detail tabs
 	and detail tab lists.
 	"""
 	permission_classes = (IsAuthenticated, IsAdmin)
 	serializer_class = CoursesFullDetailSerializer
+	pagination_class = KeysetPagination
+
+	def get_etag_querysets(self):
+		courses = self.get_etag_page(Course.objects.all())
+		return [
+			courses,
+			User.objects.filter(courses__in=courses),
+			CourseSection.objects.filter(course__in=courses),
+			CourseFile.objects.filter(section__course__in=courses),
+			CourseDetailTab.objects.filter(course__in=courses),
+			CourseDetailTabList.objects.filter(
+				course_detail_tab__course__in=courses),
+		]
 
 	def get(self, request, *args, **kwargs):
 		"""
@@ -1952,23 +1869,25 @@ class CoursesFullDetailAPIView(APIView):
 		}
 		```
 		"""
-		courses = Course.objects.all()
+		courses = COURSE_FULL_DETAIL_PLAN.apply(Course.objects.all())
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(courses, request, view=self)
 		serializer = self.serializer_class(
-			courses,
+			page,
 			many=True
 		)
-		return Response(
+		return paginator.get_paginated_response(
 			res_codes.get_response_dict(
 				res_codes.SUCCESS,
 				serializer.data,
-			),
-			status=status.HTTP_200_OK,
+			)
 		)
 
 
-class CategoryCreateApiView(APIView):
+class CategoryCreateApiView(ConditionalGetMixin, APIView):
 	permission_classes = (IsAuthenticated, IsAdmin)
 	serializer_class = CategoryCreateSerializer
+	pagination_class = KeysetPagination
 
 	def post(self, request, *args, **kwargs):
 		"""
@@ -2022,21 +1941,20 @@ class CategoryCreateApiView(APIView):
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
 			serializer.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.CATEGORY_CREATED,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
+			return res_codes.respond(
+				res_codes.CATEGORY_CREATED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
-			),
-			status=status.HTTP_400_BAD_REQUEST
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
 
+	def get_etag_querysets(self):
+		return [
+			self.get_etag_page(Category.objects.all()),
+		]
+
 	def get(self, request, format=None):
 		"""
 		{
@@ -2057,20 +1975,21 @@ class CategoryCreateApiView(APIView):
 		}
 		"""
 		categories = Category.objects.all()
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(categories, request, view=self)
 		serializer = CourseSerializer(
-				categories,
+				page,
 				many=True
 			)
-		return Response(
+		return paginator.get_paginated_response(
 				res_codes.get_response_dict(
 					res_codes.SUCCESS,
 					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+				)
 			)
 
 
-class CategoryUpdateApiView(APIView):
+class CategoryUpdateApiView(ConditionalGetMixin, APIView):
 	"""
 	Retrieve, update or delete a category instance.
 	"""
@@ -2083,6 +2002,11 @@ class CategoryUpdateApiView(APIView):
 		except Category.DoesNotExist:
 			return None
 
+	def get_etag_querysets(self):
+		return [
+			Category.objects.filter(pk=self.kwargs.get('pk')),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		#Response
@@ -2107,19 +2031,11 @@ class CategoryUpdateApiView(APIView):
 		category = self.get_object()
 		if category:
 			serializer = self.serializer_class(category)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.SUCCESS,
-					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+			return res_codes.respond(
+				res_codes.SUCCESS,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def patch(self, request, *args, **kwargs):
 		"""
@@ -2159,26 +2075,15 @@ class CategoryUpdateApiView(APIView):
 			)
 			if serializer.is_valid():
 				serializer.save()
-				return Response(
-						res_codes.get_response_dict(
-							res_codes.CATEGORY_UPDATED,
-							serializer.data,
-						),
-						status=status.HTTP_200_OK,
-					)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.INVALID_POST_DATA,
-					serializer.errors
-				),
-				status=status.HTTP_400_BAD_REQUEST
+				return res_codes.respond(
+					res_codes.CATEGORY_UPDATED,
+					serializer.data,
+				)
+			return res_codes.respond(
+				res_codes.INVALID_POST_DATA,
+				serializer.errors,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def delete(self, request, *args, **kwargs):
 		"""
@@ -2212,23 +2117,14 @@ class CategoryUpdateApiView(APIView):
 		category = self.get_object()
 		if category:
 			category.delete()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.CATEGORY_DELETED
-				),
-				status=status.HTTP_204_NO_CONTENT
-			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+			return res_codes.respond(res_codes.CATEGORY_DELETED)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 
-class CategoryCourseCreateListApiView(APIView):
+class CategoryCourseCreateListApiView(ConditionalGetMixin, APIView):
 	permission_classes = (IsAuthenticated, IsAdmin)
 	serializer_class = CategoryCourseCreateSerializer
+	pagination_class = KeysetPagination
 
 	def post(self, request, *args, **kwargs):
 		"""
@@ -2285,21 +2181,23 @@ class CategoryCourseCreateListApiView(APIView):
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
 			serializer.save()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.CATEGORY_COURSE_CREATED,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
+			return res_codes.respond(
+				res_codes.CATEGORY_COURSE_CREATED,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
-			),
-			status=status.HTTP_400_BAD_REQUEST
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
 		)
 
+	def get_etag_querysets(self):
+		relations = self.get_etag_page(CategoryCourseRelation.objects.all())
+		return [
+			relations,
+			Course.objects.filter(course_category__in=relations),
+			User.objects.filter(courses__course_category__in=relations),
+		]
+
 	def get(self, request, format=None):
 		"""
 		{
@@ -2319,21 +2217,24 @@ class CategoryCourseCreateListApiView(APIView):
 		    "msg": "Request processed successfully"
 		}
 		"""
-		categorie_course = CategoryCourseRelation.objects.all()
+		categorie_course = CategoryCourseRelation.objects.select_related(
+			'course__author',
+		)
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(categorie_course, request, view=self)
 		serializer = CategoryCourseRelationSerializer(
-				categorie_course,
+				page,
 				many=True
 			)
-		return Response(
+		return paginator.get_paginated_response(
 				res_codes.get_response_dict(
 					res_codes.SUCCESS,
 					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+				)
 			)
 
 
-class CategoryCourseUpdateApiView(APIView):
+class CategoryCourseUpdateApiView(ConditionalGetMixin, APIView):
 	"""
 	Retrieve, update or delete a category course instance.
 	"""
@@ -2346,6 +2247,15 @@ class CategoryCourseUpdateApiView(APIView):
 		except CategoryCourseRelation.DoesNotExist:
 			return None
 
+	def get_etag_querysets(self):
+		pk = self.kwargs.get('pk')
+		return [
+			CategoryCourseRelation.objects.filter(pk=pk),
+			Category.objects.filter(category_courses__pk=pk),
+			Course.objects.filter(course_category__pk=pk),
+			User.objects.filter(courses__course_category__pk=pk),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		#Response
@@ -2386,19 +2296,11 @@ class CategoryCourseUpdateApiView(APIView):
 		category_course = self.get_object()
 		if category_course:
 			serializer = self.serializer_class(category_course)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.SUCCESS,
-					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+			return res_codes.respond(
+				res_codes.SUCCESS,
+				serializer.data,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def patch(self, request, *args, **kwargs):
 		"""
@@ -2454,26 +2356,15 @@ class CategoryCourseUpdateApiView(APIView):
 			)
 			if serializer.is_valid():
 				serializer.save()
-				return Response(
-						res_codes.get_response_dict(
-							res_codes.CATEGORY_COURSE_UPDATED,
-							serializer.data,
-						),
-						status=status.HTTP_200_OK,
-					)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.INVALID_POST_DATA,
-					serializer.errors
-				),
-				status=status.HTTP_400_BAD_REQUEST
+				return res_codes.respond(
+					res_codes.CATEGORY_COURSE_UPDATED,
+					serializer.data,
+				)
+			return res_codes.respond(
+				res_codes.INVALID_POST_DATA,
+				serializer.errors,
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
 
 	def delete(self, request, *args, **kwargs):
 		"""
@@ -2507,15 +2398,419 @@ class CategoryCourseUpdateApiView(APIView):
 		category = self.get_object()
 		if category:
 			category.delete()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.CATEGORY_COURSE_DELETED
-				),
-				status=status.HTTP_204_NO_CONTENT
+			return res_codes.respond(res_codes.CATEGORY_COURSE_DELETED)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
+
+
+class CourseImportAPIView(APIView):
+	permission_classes = (IsAuthenticated, IsAdmin)
+
+	def post(self, request, *args, **kwargs):
+		"""
+		Import whole course trees in one transaction. The body is either
+		NDJSON (`Content-Type: application/x-ndjson`, one course per line,
+		read as a stream) or a JSON course / list of courses.
+		### Body (one line):
+		```
+		{
+		    "id": "8b30e0cc-e70e-48f8-a0ec-245c6134fb45",
+		    "name": "AI",
+		    "description": "AI course",
+		    "is_active": true,
+		    "categories": ["63ce453a-2327-40ab-9a50-b5db46e88234"],
+		    "sections": [
+		        {
+		            "name": "Intro",
+		            "index": 0,
+		            "files": [
+		                {
+		                    "name": "slides",
+		                    "description": "slides",
+		                    "file": "8b30e0cc-e70e-48f8-a0ec-245c6134fb45/slides.pdf",
+		                    "index": 0
+		                }
+		            ]
+		        }
+		    ],
+		    "tabs": [
+		        {
+		            "name": "certification",
+		            "content": "certification",
+		            "index": 0,
+		            "lists": [{"content": "certificate", "index": 0}]
+		        }
+		    ]
+		}
+		```
+		#### Response (success):
+		```
+		{
+		    "code": 3019,
+		    "msg": "Courses imported successfully",
+		    "data": {
+		        "rows": 1,
+		        "created": {
+		            "courses": 1,
+		            "sections": 1,
+		            "files": 1,
+		            "tabs": 1,
+		            "lists": 1,
+		            "categories": 1
+		        },
+		        "error_count": 0,
+		        "errors": []
+		    }
+		}
+		```
+		#### Response (error, nothing is imported):
+		```
+		{
+		    "code": 1000,
+		    "msg": "Invalid post data provided",
+		    "data": {
+		        "rows": 1,
+		        "created": {...},
+		        "error_count": 1,
+		        "errors": [
+		            {
+		                "row": 1,
+		                "errors": {
+		                    "sections[0]": {
+		                        "name": ["This field cannot be blank."]
+		                    }
+		                }
+		            }
+		        ]
+		    }
+		}
+		```
+		"""
+		if request.content_type.startswith(bulk.NDJSON_CONTENT_TYPE):
+			rows = bulk.iter_ndjson(request.stream or [])
+		else:
+			rows = bulk.iter_json(request.data)
+		course_import = bulk.CourseTreeImport(author=request.user)
+		if course_import.run(rows):
+			return res_codes.respond(
+				res_codes.COURSE_IMPORTED,
+				course_import.report(),
 			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.PK_NOT_FOUND
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
\ No newline at end of file
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			course_import.report(),
+		)
+
+
+class CourseExportAPIView(APIView):
+	permission_classes = (IsAuthenticated, IsAdmin)
+
+	def get(self, request, *args, **kwargs):
+		"""
+		Stream every course tree as NDJSON, in the format accepted by the
+		import endpoint.
+		"""
+		response = StreamingHttpResponse(
+			bulk.iter_ndjson_export(Course.objects.all()),
+			content_type=bulk.NDJSON_CONTENT_TYPE,
+		)
+		response['Content-Disposition'] = 'attachment; filename="courses.ndjson"'
+		return response
+
+
+class CourseFileUploadTicketAPIView(APIView):
+	permission_classes = (IsAuthenticated, IsAdmin)
+	serializer_class = CourseFileUploadTicketSerializer
+
+	def post(self, request, *args, **kwargs):
+		"""
+		Phase one of a direct upload: returns a ticket and the URL the
+		file is PUT to, straight to the storage instead of through here.
+		### Body:
+		```
+		{
+		    "section": "8b30e0cc-e70e-48f8-a0ec-245c6134fb45",
+		    "filename": "notes.pdf",
+		    "content_type": "application/pdf"
+		}
+		```
+		#### Response (success):
+		```
+		{
+		    "code": 2002,
+		    "msg": "Upload ticket issued",
+		    "data": {
+		        "ticket": "eyJtb2RlbCI6ImNvdXJzZXMuY291cnNlZmlsZSJ9:1hFe2x:...",
+		        "upload": {
+		            "url": "https://bucket.s3.amazonaws.com/media/...",
+		            "method": "PUT",
+		            "headers": {
+		                "Content-Type": "application/pdf"
+		            }
+		        },
+		        "expires_in": 900
+		    }
+		}
+		```
+		"""
+		serializer = self.serializer_class(
+			data=request.data,
+			context={'request': request},
+		)
+		if serializer.is_valid():
+			serializer.save()
+			return res_codes.respond(
+				res_codes.UPLOAD_TICKET_ISSUED,
+				serializer.data,
+			)
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
+		)
+
+
+class CourseFileFinalizeUploadAPIView(APIView):
+	permission_classes = (IsAuthenticated, IsAdmin)
+	serializer_class = CourseFileFinalizeSerializer
+
+	def post(self, request, *args, **kwargs):
+		"""
+		Phase two of a direct upload: creates the course file once the file
+		of the ticket is found in the storage.
+		### Body:
+		```
+		{
+		    "ticket": "eyJtb2RlbCI6ImNvdXJzZXMuY291cnNlZmlsZSJ9:1hFe2x:...",
+		    "name": "notes",
+		    "description": "lecture notes",
+		    "index": 0,
+		    "is_active": true
+		}
+		```
+		#### Response (error):
+		```
+		{
+		    "code": 1000,
+		    "msg": "Invalid post data provided",
+		    "data": {
+		        "ticket": [
+		            "Uploaded file not found."
+		        ]
+		    }
+		}
+		```
+		"""
+		serializer = self.serializer_class(
+			data=request.data,
+			context={'request': request},
+		)
+		if serializer.is_valid():
+			try:
+				serializer.save()
+			except ValidationError as e:
+				return res_codes.respond(
+					res_codes.INVALID_POST_DATA,
+					e.detail,
+				)
+			return res_codes.respond(
+				res_codes.COURSE_SECTION_FILE_CREATED,
+				serializer.data,
+			)
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
+		)
+
+
+class CourseFileUploadSessionCreateAPIView(APIView):
+	permission_classes = (IsAuthenticated, IsAdmin)
+	serializer_class = CourseFileUploadSessionSerializer
+
+	def post(self, request, *args, **kwargs):
+		"""
+		Starts a resumable upload of a course file. The file is then sent
+		in chunks to `course-section-file-upload/<id>/` and turned into a
+		course file by `course-section-file-upload/<id>/finalize/`.
+		`checksum` (optional) is the sha256 of the whole file.
+		### Body:
+		```
+		{
+		    "section": "c4cd2d9d-277e-439f-8958-1a1a6f1be62e",
+		    "filename": "lecture-01.mp4",
+		    "size": 2147483648,
+		    "checksum": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08"
+		}
+		```
+		#### Response (success):
+		```
+		{
+		    "code": 3020,
+		    "msg": "Upload session created successfully",
+		    "data": {
+		        "id": "2f1bd2a4-7a6e-4f61-9f55-8f0a3c6f1f0e",
+		        "section": "c4cd2d9d-277e-439f-8958-1a1a6f1be62e",
+		        "filename": "lecture-01.mp4",
+		        "size": 2147483648,
+		        "checksum": "9f86d081884c7d659a2feaa0c55ad015a3bf4f1b2b0b822cd15d6c15b0f00a08",
+		        "offset": 0,
+		        "chunk_max_size": 67108864,
+		        "course_file": null
+		    }
+		}
+		```
+		"""
+		serializer = self.serializer_class(data=request.data)
+		if serializer.is_valid():
+			serializer.save(created_by=request.user)
+			return res_codes.respond(
+				res_codes.UPLOAD_SESSION_CREATED,
+				serializer.data,
+			)
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
+		)
+
+
+class CourseFileUploadSessionAPIView(APIView):
+	"""
+	Status of an upload session, and the chunks of its file.
+	"""
+	permission_classes = (IsAuthenticated, IsAdmin)
+	serializer_class = CourseFileUploadSessionSerializer
+
+	def get_object(self):
+		try:
+			return CourseFileUploadSession.objects.get(pk=self.kwargs.get('pk'))
+		except CourseFileUploadSession.DoesNotExist:
+			return None
+
+	def get(self, request, *args, **kwargs):
+		"""
+		Returns the session, `offset` is where an interrupted upload
+		resumes from.
+		"""
+		session = self.get_object()
+		if session:
+			serializer = self.serializer_class(session)
+			return res_codes.respond(
+				res_codes.SUCCESS,
+				serializer.data,
+			)
+		return res_codes.respond(res_codes.PK_NOT_FOUND)
+
+	def put(self, request, *args, **kwargs):
+		"""
+		Appends one chunk. The body is the raw bytes of the chunk, the
+		`Upload-Offset` header its position in the file (the current
+		`offset` of the session) and `Upload-Checksum` its sha256.
+		A chunk that is refused leaves the session as it was; the response
+		holds the offset to resume from.
+		### Headers:
+		```
+		Content-Type: application/octet-stream
+		Upload-Offset: 67108864
+		Upload-Checksum: 5891b5b522d5df086d0ff0b110fbd9d21bb4fc7163af34d08286a2e846f6be03
+		```
+		#### Response (success):
+		```
+		{
+		    "code": 3021,
+		    "msg": "Chunk received",
+		    "data": {
+		        "id": "2f1bd2a4-7a6e-4f61-9f55-8f0a3c6f1f0e",
+		        ...
+		        "offset": 134217728
+		    }
+		}
+		```
+		#### Response (error):
+		```
+		{
+		    "code": 3022,
+		    "msg": "Chunk offset does not match the upload",
+		    "data": {
+		        "detail": "Chunk does not start at the upload offset.",
+		        "offset": 67108864
+		    }
+		}
+		```
+		"""
+		session = self.get_object()
+		if not session:
+			return res_codes.respond(res_codes.PK_NOT_FOUND)
+		try:
+			offset = int(request.META.get('HTTP_UPLOAD_OFFSET', ''))
+			length = int(request.META.get('CONTENT_LENGTH') or 0)
+		except ValueError:
+			return res_codes.respond(
+				res_codes.INVALID_UPLOAD_CHUNK,
+				{'detail': 'Upload-Offset header is required.'},
+			)
+		try:
+			session = write_chunk(
+				session,
+				offset,
+				length,
+				request.META.get('HTTP_UPLOAD_CHECKSUM', ''),
+				request.stream,
+			)
+		except UploadError as e:
+			return res_codes.respond(e.lookup, e.get_data())
+		serializer = self.serializer_class(session)
+		return res_codes.respond(
+			res_codes.UPLOAD_CHUNK_RECEIVED,
+			serializer.data,
+		)
+
+
+class CourseFileUploadSessionFinalizeAPIView(APIView):
+	permission_classes = (IsAuthenticated, IsAdmin)
+	serializer_class = CourseFileUploadFinalizeSerializer
+
+	def post(self, request, *args, **kwargs):
+		"""
+		Creates the course file of a complete upload, in the section the
+		session was started for.
+		### Body:
+		```
+		{
+		    "name": "Lecture 1",
+		    "description": "Introduction",
+		    "index": 0,
+		    "is_active": true
+		}
+		```
+		#### Response (error):
+		```
+		{
+		    "code": 3025,
+		    "msg": "Upload is incomplete",
+		    "data": {
+		        "detail": "Upload is missing 1073741824 bytes.",
+		        "offset": 1073741824
+		    }
+		}
+		```
+		"""
+		try:
+			session = CourseFileUploadSession.objects.get(
+				pk=self.kwargs.get('pk'))
+		except CourseFileUploadSession.DoesNotExist:
+			return res_codes.respond(res_codes.PK_NOT_FOUND)
+		serializer = self.serializer_class(
+			data=request.data,
+			context={'request': request, 'session': session},
+		)
+		if not serializer.is_valid():
+			return res_codes.respond(
+				res_codes.INVALID_POST_DATA,
+				serializer.errors,
+			)
+		try:
+			serializer.save(created_by=request.user)
+		except UploadError as e:
+			return res_codes.respond(e.lookup, e.get_data())
+		return res_codes.respond(
+			res_codes.COURSE_SECTION_FILE_CREATED,
+			serializer.data,
+		)
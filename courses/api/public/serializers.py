@@ -11,6 +11,8 @@ from courses.models import (
     CategoryCourseRelation,
     Category,
     )
+from courses.managers import PUBLISHED_TABS, PUBLISHED_LISTS
+from utils.projection import ValuesProjection
 
 User = get_user_model()
 
@@ -25,6 +27,15 @@ class PublicCourseListSerializer(serializers.ModelSerializer):
         ]
 
 
+class PublicCourseListProjection(ValuesProjection):
+    """
+    ``PublicCourseListSerializer`` rendered from ``values()`` rows.
+    """
+    serializer_class = PublicCourseListSerializer
+    # keyset pagination cursor
+    extra_columns = ('created_at',)
+
+
 class CourseDetailTabListSerializer(serializers.ModelSerializer):
     class Meta:
         model = CourseDetailTabList
@@ -47,7 +58,9 @@ class PublicCourseDetailTabSerializer(serializers.ModelSerializer):
         ]
 
     def get_lists(self, obj):
-        lists = obj.lists.filter(is_active=True, is_deleted=False)
+        lists = getattr(obj, PUBLISHED_LISTS, None)
+        if lists is None:
+            lists = obj.lists.published()
         serializer = CourseDetailTabListSerializer(lists, many=True)
         return serializer.data
 
@@ -65,7 +78,9 @@ class PublicCourseDetailSerializer(serializers.ModelSerializer):
         ]
 
     def get_tabs(self, obj):
-        tabs = obj.detail_tabs.filter(is_active=True, is_deleted=False)
+        tabs = getattr(obj, PUBLISHED_TABS, None)
+        if tabs is None:
+            tabs = obj.detail_tabs.published()
         serializer = PublicCourseDetailTabSerializer(tabs, many=True)
         return serializer.data
 
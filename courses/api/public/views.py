@@ -1,3 +1,5 @@
+from uuid import UUID
+
 # restframework imports
 from rest_framework.response import Response
 from rest_framework import status
@@ -9,7 +11,7 @@ from rest_framework.exceptions import (
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from .serializers import (
-	PublicCourseListSerializer,
+	PublicCourseListProjection,
 	PublicCourseDetailSerializer,
 	PublicCategoryCourseDetailSerializer,
 )
@@ -17,12 +19,25 @@ from courses.models import (
 	Course,
 	CourseDetailTab,
 	Category,
+	CategoryCourseRelation,
 )
+from courses.cache import catalog_cache, CATALOG_SCOPE, course_scope
+from courses.prefetch import CATEGORY_COURSES_PLAN
+from utils.conditional import ConditionalGetMixin
+from utils.db import ReplicaReadMixin
+from utils.pagination import KeysetPagination
+from utils.streaming import StreamingListMixin
 from utils import res_codes
 
 
-class PublicCourseListAPIView(APIView):
-	serializer_class = PublicCourseListSerializer
+class PublicCourseListAPIView(ConditionalGetMixin, APIView):
+	serializer_class = PublicCourseListProjection
+	pagination_class = KeysetPagination
+
+	def get_validator_parts(self):
+		# the catalog version is bumped on every course write, so it
+		# validates the cached payload without touching the database
+		return catalog_cache.get_versions((CATALOG_SCOPE,)), None
 
 	def get(self, request, format=None):
 		"""
@@ -47,29 +62,56 @@ class PublicCourseListAPIView(APIView):
 		```
 		"""
 
-		courses = Course.objects.filter(is_active=True, is_deleted=False)
-		serializer = self.serializer_class(
-				courses,
-				many=True
-			)
-		return Response(
+		paginator = self.pagination_class()
+		cache_key = catalog_cache.make_key(
+			'course_list',
+			(CATALOG_SCOPE,),
+			request.query_params.get(paginator.cursor_query_param),
+			paginator.get_page_size(request),
+		)
+		payload = catalog_cache.get(cache_key)
+		if payload is None:
+			courses = self.serializer_class.values(Course.objects.published())
+			page = paginator.paginate_queryset(courses, request, view=self)
+			serializer = self.serializer_class(
+					page,
+					many=True
+				)
+			payload = paginator.get_paginated_data(
 				res_codes.get_response_dict(
 					res_codes.SUCCESS,
 					serializer.data,
-				),
+				)
+			)
+			catalog_cache.set(cache_key, payload)
+		return Response(
+				payload,
 				status=status.HTTP_200_OK,
 			)
 
 
-class PublicCourseDetailAPIView(APIView):
+class PublicCourseDetailAPIView(ConditionalGetMixin, APIView):
 	serializer_class = PublicCourseDetailSerializer
 
+	def get_pk(self):
+		"""
+		The course id of the URL in the form ``course_scope()`` is bumped
+		with, the URL also matches ids without hyphens whose versions and
+		cache entries would never be invalidated.
+		"""
+		try:
+			return str(UUID(self.kwargs.get('pk')))
+		except ValueError:
+			raise NotFound(
+				res_codes.get_response_dict(
+					res_codes.NOT_FOUND
+				)
+			)
+
 	def get_object(self):
 		try:
-			course = Course.objects.get(
-				id=self.kwargs.get('pk'),
-				is_active=True,
-				is_deleted=False,
+			course = Course.objects.published().with_tree().get(
+				id=self.get_pk(),
 			)
 		except Course.DoesNotExist:
 			raise NotFound(
@@ -79,6 +121,9 @@ class PublicCourseDetailAPIView(APIView):
 			)
 		return course
 
+	def get_validator_parts(self):
+		return catalog_cache.get_versions((course_scope(self.get_pk()),)), None
+
 	def get(self, request, *args, **kwargs):
 		"""
 		### Response
@@ -107,22 +152,37 @@ class PublicCourseDetailAPIView(APIView):
 		}
 		```
 		"""
-		course = self.get_object()
-		serializer = self.serializer_class(course)
+		pk = self.get_pk()
+		cache_key = catalog_cache.make_key('course_detail', (course_scope(pk),), pk)
+		payload = catalog_cache.get(cache_key)
+		if payload is None:
+			course = self.get_object()
+			serializer = self.serializer_class(course)
+			payload = res_codes.get_response_dict(
+				res_codes.SUCCESS,
+				serializer.data,
+			)
+			catalog_cache.set(cache_key, payload)
 		return Response(
-				res_codes.get_response_dict(
-					res_codes.SUCCESS,
-					serializer.data,
-				),
+				payload,
 				status=status.HTTP_200_OK,
 			)
 
 
-class PublicCategoryCourseFullDetailApiView(APIView):
+class PublicCategoryCourseFullDetailApiView(ReplicaReadMixin, ConditionalGetMixin, StreamingListMixin, APIView):
 	"""
 	To list all the available categories with courses
 	"""
 	serializer_class = PublicCategoryCourseDetailSerializer
+	pagination_class = KeysetPagination
+
+	def get_etag_querysets(self):
+		categories = self.get_etag_page(Category.objects.all())
+		return [
+			categories,
+			CategoryCourseRelation.objects.filter(category__in=categories),
+			Course.objects.filter(course_category__category__in=categories),
+		]
 
 	def get(self, request, *args, **kwargs):
 		"""
@@ -174,21 +234,24 @@ class PublicCategoryCourseFullDetailApiView(APIView):
 		}
 		```
 		"""
-		categories = Category.objects.all()
+		categories = CATEGORY_COURSES_PLAN.apply(Category.objects.all())
+		if self.wants_stream(request):
+			return self.get_streaming_response(categories, self.serializer_class)
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(categories, request, view=self)
 		serializer = self.serializer_class(
-			categories,
+			page,
 			many=True
 		)
-		return Response(
+		return paginator.get_paginated_response(
 			res_codes.get_response_dict(
 				res_codes.SUCCESS,
 				serializer.data,
-			),
-			status=status.HTTP_200_OK,
+			)
 		)
 
 
-class PublicCategoryCourseDetailApiView(APIView):
+class PublicCategoryCourseDetailApiView(ReplicaReadMixin, ConditionalGetMixin, APIView):
 	"""
 	To get detail of particular category with courses
 	"""
@@ -196,7 +259,7 @@ class PublicCategoryCourseDetailApiView(APIView):
 
 	def get_object(self):
 		try:
-			category = Category.objects.get(
+			category = CATEGORY_COURSES_PLAN.apply(Category.objects.all()).get(
 				id=self.kwargs.get('pk'),
 			)
 		except Category.DoesNotExist:
@@ -207,6 +270,14 @@ class PublicCategoryCourseDetailApiView(APIView):
 			)
 		return category
 
+	def get_etag_querysets(self):
+		pk = self.kwargs.get('pk')
+		return [
+			Category.objects.filter(pk=pk),
+			CategoryCourseRelation.objects.filter(category__pk=pk),
+			Course.objects.filter(course_category__category__pk=pk),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		# Response(Success)
@@ -242,10 +313,7 @@ class PublicCategoryCourseDetailApiView(APIView):
 		"""
 		category = self.get_object()
 		serializer = self.serializer_class(category)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.SUCCESS,
-				serializer.data,
-			),
-			status=status.HTTP_200_OK,
+		return res_codes.respond(
+			res_codes.SUCCESS,
+			serializer.data,
 		)
\ No newline at end of file
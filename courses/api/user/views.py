@@ -1,6 +1,6 @@
 # restframework imports
-from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.views import APIView
 #djnago imports
@@ -15,15 +15,28 @@ from courses.models import (
 	Course,
 	UserMyCourseLibrary,
 	Category,
+	CategoryCourseRelation,
 )
+from courses.prefetch import CATEGORY_COURSES_PLAN
 from utils import res_codes
+from utils.conditional import ConditionalGetMixin
+from utils.db import ReplicaReadMixin
+from utils.pagination import KeysetPagination
+from utils.authentication import StatelessJWTAuthentication
 
 User = get_user_model()
 
 
-class UserCourseListAPIView(APIView):
+class UserCourseListAPIView(ReplicaReadMixin, ConditionalGetMixin, APIView):
+	authentication_classes = (StatelessJWTAuthentication,)
 	permission_classes = (IsAuthenticated,)
 	serializer_class = UserCourseListSerializer
+	pagination_class = KeysetPagination
+
+	def get_etag_querysets(self):
+		return [
+			self.get_etag_page(Course.objects.filter(author=self.request.user)),
+		]
 
 	def get(self, request, format=None):
 		"""
@@ -62,23 +75,25 @@ class UserCourseListAPIView(APIView):
 		user_courses = Course.objects.filter(
 			author=request.user
 			)
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(user_courses, request, view=self)
 		serializer = self.serializer_class(
-				user_courses,
+				page,
 				many=True
 			)
-		return Response(
+		return paginator.get_paginated_response(
 				res_codes.get_response_dict(
 					res_codes.SUCCESS,
 					serializer.data,
-				),
-				status=status.HTTP_200_OK,
+				)
 			)
 
 
-class UserCourseDetailAPIView(APIView):
+class UserCourseDetailAPIView(ReplicaReadMixin, ConditionalGetMixin, APIView):
 	"""
 	Retrieve, update or delete a course instance.
 	"""
+	authentication_classes = (StatelessJWTAuthentication,)
 	permission_classes = (IsAuthenticated,)
 	serializer_class = UserCourseListSerializer
 
@@ -91,6 +106,14 @@ class UserCourseDetailAPIView(APIView):
 		except Course.DoesNotExist:
 			return None
 
+	def get_etag_querysets(self):
+		return [
+			Course.objects.filter(
+				pk=self.kwargs.get('pk'),
+				author=self.request.user
+			),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		#Response
@@ -115,19 +138,11 @@ class UserCourseDetailAPIView(APIView):
 		course = self.get_object()
 		if course:
 			serializer = self.serializer_class(course)
-			return Response(
-					res_codes.get_response_dict(
-						res_codes.SUCCESS,
-						serializer.data,
-					),
-					status=status.HTTP_200_OK,
-				)			
-		return Response(
-					res_codes.get_response_dict(
-						res_codes.COURSE_NOT_FOUND_FOR_USER
-					),
-					status=status.HTTP_400_BAD_REQUEST
-				)
+			return res_codes.respond(
+				res_codes.SUCCESS,
+				serializer.data,
+			)			
+		return res_codes.respond(res_codes.COURSE_NOT_FOUND_FOR_USER)
 
 
 class AddCourseInMyCoursesAPIView(APIView):
@@ -177,18 +192,14 @@ class AddCourseInMyCoursesAPIView(APIView):
 		serializer = self.serializer_class(data=data)
 		if serializer.is_valid():
 			course = serializer.save(user=request.user)
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.USER_ADDED_COURSE,
-					serializer.data,
-				),
-				status=status.HTTP_201_CREATED,
-			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.INVALID_POST_DATA,
-				serializer.errors,
+			return res_codes.respond(
+				res_codes.USER_ADDED_COURSE,
+				serializer.data,
 			)
+		return res_codes.respond(
+			res_codes.INVALID_POST_DATA,
+			serializer.errors,
+			status=status.HTTP_200_OK,
 		)
 
 
@@ -235,29 +246,29 @@ class DeleteCourseFromMyCoursesAPIView(APIView):
 		}
 		```
 		"""
-		my_course = self.get_object(pk, request.user)
+		my_course = self.get_object()
 		if my_course:
 			my_course.delete()
-			return Response(
-				res_codes.get_response_dict(
-					res_codes.USER_DELETED_COURSE
-				),
-				status=status.HTTP_204_NO_CONTENT
-			)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.COURSE_NOT_FOUND_FOR_USER
-			),
-			status=status.HTTP_400_BAD_REQUEST
-		)
+			return res_codes.respond(res_codes.USER_DELETED_COURSE)
+		return res_codes.respond(res_codes.COURSE_NOT_FOUND_FOR_USER)
 
 
-class UserCategoryCourseFullDetailApiView(APIView):
+class UserCategoryCourseFullDetailApiView(ReplicaReadMixin, ConditionalGetMixin, APIView):
 	"""
 	To list all the available categories with courses
 	"""
+	authentication_classes = (StatelessJWTAuthentication,)
 	permission_classes = (IsAuthenticated,)
 	serializer_class = UserCategoryCourseDetailSerializer
+	pagination_class = KeysetPagination
+
+	def get_etag_querysets(self):
+		categories = self.get_etag_page(Category.objects.all())
+		return [
+			categories,
+			CategoryCourseRelation.objects.filter(category__in=categories),
+			Course.objects.filter(course_category__category__in=categories),
+		]
 
 	def get(self, request, *args, **kwargs):
 		"""
@@ -309,30 +320,32 @@ class UserCategoryCourseFullDetailApiView(APIView):
 		}
 		```
 		"""
-		categories = Category.objects.all()
+		categories = CATEGORY_COURSES_PLAN.apply(Category.objects.all())
+		paginator = self.pagination_class()
+		page = paginator.paginate_queryset(categories, request, view=self)
 		serializer = self.serializer_class(
-			categories,
+			page,
 			many=True
 		)
-		return Response(
+		return paginator.get_paginated_response(
 			res_codes.get_response_dict(
 				res_codes.SUCCESS,
 				serializer.data,
-			),
-			status=status.HTTP_200_OK,
+			)
 		)
 
 
-class UserCategoryCourseDetailApiView(APIView):
+class UserCategoryCourseDetailApiView(ReplicaReadMixin, ConditionalGetMixin, APIView):
 	"""
 	To get detail of particular category with courses
 	"""
+	authentication_classes = (StatelessJWTAuthentication,)
 	permission_classes = (IsAuthenticated,)
 	serializer_class = UserCategoryCourseDetailSerializer
 
 	def get_object(self):
 		try:
-			category = Category.objects.get(
+			category = CATEGORY_COURSES_PLAN.apply(Category.objects.all()).get(
 				id=self.kwargs.get('pk'),
 			)
 		except Category.DoesNotExist:
@@ -343,6 +356,14 @@ class UserCategoryCourseDetailApiView(APIView):
 			)
 		return category
 
+	def get_etag_querysets(self):
+		pk = self.kwargs.get('pk')
+		return [
+			Category.objects.filter(pk=pk),
+			CategoryCourseRelation.objects.filter(category__pk=pk),
+			Course.objects.filter(course_category__category__pk=pk),
+		]
+
 	def get(self, request, *args, **kwargs):
 		"""
 		# Response(Success)
@@ -378,10 +399,7 @@ class UserCategoryCourseDetailApiView(APIView):
 		"""
 		category = self.get_object()
 		serializer = self.serializer_class(category)
-		return Response(
-			res_codes.get_response_dict(
-				res_codes.SUCCESS,
-				serializer.data,
-			),
-			status=status.HTTP_200_OK,
+		return res_codes.respond(
+			res_codes.SUCCESS,
+			serializer.data,
 		)
\ No newline at end of file
@@ -0,0 +1,366 @@
+import json
+from collections import OrderedDict
+from uuid import UUID
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+
+from jobs.queue import enqueue_many
+from utils.pagination import KEYSET_ORDERING, keyset_after
+from .cache import catalog_cache, CATALOG_SCOPE
+from .models import (
+    Course,
+    CourseSection,
+    CourseFile,
+    CourseDetailTab,
+    CourseDetailTabList,
+    Category,
+    CategoryCourseRelation,
+)
+from .prefetch import COURSE_EXPORT_PLAN
+
+
+IMPORT_BATCH_SIZE = 500
+EXPORT_BATCH_SIZE = 100
+# errors past this many are counted but not reported
+MAX_REPORTED_ERRORS = 100
+
+NDJSON_CONTENT_TYPE = 'application/x-ndjson'
+
+# document keys of every level of a course tree
+COURSE_FIELDS = ('name', 'description', 'is_active', 'is_deleted')
+SECTION_FIELDS = ('name', 'index', 'is_active', 'is_deleted')
+FILE_FIELDS = ('name', 'description', 'file', 'index', 'is_active',
+               'is_deleted')
+TAB_FIELDS = ('name', 'content', 'index', 'is_active', 'is_deleted')
+TAB_LIST_FIELDS = ('content', 'index', 'is_active', 'is_deleted')
+
+# never read from the document nor validated against the database
+NON_DOCUMENT_FIELDS = ['author', 'created_by', 'last_modified_by']
+
+
+def iter_ndjson(lines):
+    """
+    Yield ``(line number, row)`` for every non blank line of an NDJSON
+    stream; ``row`` is None when the line is not valid JSON.
+    """
+    for number, line in enumerate(lines, 1):
+        try:
+            if isinstance(line, bytes):
+                line = line.decode('utf-8')
+            line = line.strip()
+            if not line:
+                continue
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row
+
+
+def iter_json(document):
+    """
+    Yield ``(position, row)`` for a JSON document holding one course tree
+    or a list of them.
+    """
+    if isinstance(document, dict):
+        document = [document]
+    if not isinstance(document, list):
+        document = [None]
+    for number, row in enumerate(document, 1):
+        yield number, row
+
+
+def _pick(row, fields):
+    return {field: row[field] for field in fields if field in row}
+
+
+class _CourseTree(object):
+
+    def __init__(self, number):
+        self.number = number
+        self.course = None
+        self.category_ids = []
+        self.sections = []
+        self.files = []
+        self.tabs = []
+        self.lists = []
+        self.errors = OrderedDict()
+
+
+class CourseTreeImport(object):
+    """
+    Imports whole course trees (course, sections and their files, detail
+    tabs and their lists, category links) in bulk.
+
+    Rows are handled in batches of ``batch_size``. A batch costs one query
+    to check the course ids it brings and one for the categories it links
+    to, then one ``bulk_create`` per model, and one for the metadata jobs
+    of the files, however large the trees are.
+    Primary keys are generated client side, so children point at their
+    parents before anything is inserted.
+
+    The whole import is one transaction. Once a row is invalid nothing
+    more is inserted, the remaining rows are only validated so that every
+    error is reported, and the transaction is rolled back.
+    """
+
+    def __init__(self, author=None, batch_size=IMPORT_BATCH_SIZE):
+        self.author = author
+        self.batch_size = batch_size
+        self.rows = 0
+        self.created = OrderedDict(
+            (name, 0) for name in
+            ('courses', 'sections', 'files', 'tabs', 'lists', 'categories')
+        )
+        self.errors = []
+        self.error_count = 0
+        self._course_ids = set()
+
+    @property
+    def is_valid(self):
+        return not self.error_count
+
+    def run(self, rows):
+        with transaction.atomic():
+            batch = []
+            for number, row in rows:
+                batch.append((number, row))
+                if len(batch) >= self.batch_size:
+                    self._import_batch(batch)
+                    batch = []
+            if batch:
+                self._import_batch(batch)
+
+            if self.is_valid:
+                # bulk_create sends no post_save, invalidate the public
+                # catalog by hand once the rows are visible
+                transaction.on_commit(
+                    lambda: catalog_cache.bump(CATALOG_SCOPE))
+            else:
+                transaction.set_rollback(True)
+                for name in self.created:
+                    self.created[name] = 0
+        return self.is_valid
+
+    def report(self):
+        return OrderedDict([
+            ('rows', self.rows),
+            ('created', self.created),
+            ('error_count', self.error_count),
+            ('errors', self.errors),
+        ])
+
+    def _import_batch(self, batch):
+        trees = []
+        for number, row in batch:
+            self.rows += 1
+            trees.append(self._build(number, row))
+        self._check_references(trees)
+
+        valid = []
+        for tree in trees:
+            if tree.errors:
+                self._add_error(tree.number, tree.errors)
+            else:
+                valid.append(tree)
+        if self.is_valid and valid:
+            self._insert(valid)
+
+    def _add_error(self, number, errors):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(OrderedDict([
+                ('row', number),
+                ('errors', errors),
+            ]))
+
+    def _clean(self, tree, path, instance, exclude=()):
+        try:
+            instance.clean_fields(
+                exclude=NON_DOCUMENT_FIELDS + list(exclude))
+        except ValidationError as e:
+            tree.errors[path] = e.message_dict
+
+    def _children(self, tree, path, row, key):
+        children = row.get(key, [])
+        if not isinstance(children, list) or not all(
+                isinstance(child, dict) for child in children):
+            tree.errors[path + key] = ['Expected a list of objects.']
+            return []
+        return children
+
+    def _build(self, number, row):
+        tree = _CourseTree(number)
+        if not isinstance(row, dict):
+            tree.errors['non_field_errors'] = ['Expected a JSON object.']
+            return tree
+
+        tree.course = Course(author=self.author, **_pick(row, COURSE_FIELDS))
+        if row.get('id'):
+            tree.course.id = row['id']
+        self._clean(tree, 'course', tree.course)
+
+        category_ids = row.get('categories', [])
+        if not isinstance(category_ids, list):
+            tree.errors['categories'] = ['Expected a list of ids.']
+            category_ids = []
+        for category_id in category_ids:
+            try:
+                tree.category_ids.append(UUID(str(category_id)))
+            except ValueError:
+                tree.errors['categories'] = [
+                    '"{}" is not a valid UUID.'.format(category_id)]
+
+        for i, section_row in enumerate(
+                self._children(tree, '', row, 'sections')):
+            path = 'sections[{}]'.format(i)
+            section = CourseSection(
+                course=tree.course, **_pick(section_row, SECTION_FIELDS))
+            self._clean(tree, path, section, exclude=['course'])
+            tree.sections.append(section)
+            for j, file_row in enumerate(
+                    self._children(tree, path + '.', section_row, 'files')):
+                course_file = CourseFile(
+                    section=section, **_pick(file_row, FILE_FIELDS))
+                self._clean(
+                    tree, '{}.files[{}]'.format(path, j), course_file,
+                    exclude=['section'])
+                tree.files.append(course_file)
+
+        for i, tab_row in enumerate(self._children(tree, '', row, 'tabs')):
+            path = 'tabs[{}]'.format(i)
+            tab = CourseDetailTab(
+                course=tree.course, **_pick(tab_row, TAB_FIELDS))
+            self._clean(tree, path, tab, exclude=['course'])
+            tree.tabs.append(tab)
+            for j, list_row in enumerate(
+                    self._children(tree, path + '.', tab_row, 'lists')):
+                tab_list = CourseDetailTabList(
+                    course_detail_tab=tab, **_pick(list_row, TAB_LIST_FIELDS))
+                self._clean(
+                    tree, '{}.lists[{}]'.format(path, j), tab_list,
+                    exclude=['course_detail_tab'])
+                tree.lists.append(tab_list)
+        return tree
+
+    def _check_references(self, trees):
+        trees = [tree for tree in trees if tree.course is not None]
+        course_ids = [
+            tree.course.pk for tree in trees if 'course' not in tree.errors
+        ]
+        existing = set(Course.objects.filter(
+            pk__in=course_ids,
+        ).values_list('pk', flat=True))
+        category_ids = {
+            category_id for tree in trees for category_id in tree.category_ids
+        }
+        categories = set(Category.objects.filter(
+            pk__in=category_ids,
+        ).values_list('pk', flat=True)) if category_ids else set()
+
+        for tree in trees:
+            if 'course' not in tree.errors:
+                if tree.course.pk in existing or (
+                        tree.course.pk in self._course_ids):
+                    tree.errors['course'] = {
+                        'id': ['Course with this id already exists.'],
+                    }
+                self._course_ids.add(tree.course.pk)
+            missing = [
+                str(category_id) for category_id in tree.category_ids
+                if category_id not in categories
+            ]
+            if missing:
+                tree.errors['categories'] = [
+                    'Such category does not exists: {}.'.format(
+                        ', '.join(missing))
+                ]
+
+    def _insert(self, trees):
+        relations = [
+            CategoryCourseRelation(course=tree.course, category_id=category_id)
+            for tree in trees for category_id in tree.category_ids
+        ]
+        for name, model, objects in [
+                ('courses', Course, [tree.course for tree in trees]),
+                ('sections', CourseSection,
+                 [obj for tree in trees for obj in tree.sections]),
+                ('files', CourseFile,
+                 [obj for tree in trees for obj in tree.files]),
+                ('tabs', CourseDetailTab,
+                 [obj for tree in trees for obj in tree.tabs]),
+                ('lists', CourseDetailTabList,
+                 [obj for tree in trees for obj in tree.lists]),
+                ('categories', CategoryCourseRelation, relations),
+                ]:
+            if objects:
+                model.objects.bulk_create(objects, batch_size=self.batch_size)
+                self.created[name] += len(objects)
+        # bulk_create sends no post_save either, queue the metadata of the
+        # imported files by hand
+        files = [obj for tree in trees for obj in tree.files if obj.file]
+        if files:
+            enqueue_many(
+                'courses.file_metadata',
+                [{'course_file_id': course_file.pk} for course_file in files],
+                batch_size=self.batch_size,
+            )
+
+
+def course_tree(course):
+    """
+    Return ``course`` as an import document row. Expects the relations of
+    ``COURSE_EXPORT_PLAN`` to be prefetched.
+    """
+    row = OrderedDict(id=course.pk)
+    row.update(_pick(course.__dict__, COURSE_FIELDS))
+    row['categories'] = [
+        relation.category_id for relation in course.course_category.all()
+    ]
+    row['sections'] = []
+    for section in course.sections.all():
+        section_row = OrderedDict(_pick(section.__dict__, SECTION_FIELDS))
+        section_row['files'] = [
+            OrderedDict(
+                _pick(course_file.__dict__, FILE_FIELDS),
+                file=course_file.file.name,
+            )
+            for course_file in section.files.all()
+        ]
+        row['sections'].append(section_row)
+    row['tabs'] = []
+    for tab in course.detail_tabs.all():
+        tab_row = OrderedDict(_pick(tab.__dict__, TAB_FIELDS))
+        tab_row['lists'] = [
+            OrderedDict(_pick(tab_list.__dict__, TAB_LIST_FIELDS))
+            for tab_list in tab.lists.all()
+        ]
+        row['tabs'].append(tab_row)
+    return row
+
+
+def iter_course_trees(queryset, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yield every course of ``queryset`` as an import document row.
+
+    Courses are read in keyset batches of ``batch_size``, each batch with
+    its relations prefetched, so memory does not grow with the catalog.
+    """
+    queryset = COURSE_EXPORT_PLAN.apply(queryset).order_by(*KEYSET_ORDERING)
+    position = None
+    while True:
+        page = queryset
+        if position is not None:
+            page = keyset_after(page, *position)
+        courses = list(page[:batch_size])
+        for course in courses:
+            yield course_tree(course)
+        if len(courses) < batch_size:
+            return
+        position = courses[-1].created_at, courses[-1].pk
+
+
+def iter_ndjson_export(queryset, batch_size=EXPORT_BATCH_SIZE):
+    for row in iter_course_trees(queryset, batch_size):
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
@@ -0,0 +1,12 @@
+from utils.cache import VersionedResponseCache
+
+
+# public (anonymous) catalog responses, see courses.api.public.views
+catalog_cache = VersionedResponseCache('public_catalog')
+
+# bumped on any course write, the course list depends on every course
+CATALOG_SCOPE = 'courses'
+
+
+def course_scope(course_id):
+    return 'course:{}'.format(course_id)
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+
+from courses import bulk
+from courses.models import Course
+
+
+class Command(BaseCommand):
+    help = 'Export every course tree as NDJSON, one course per line.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output', help='file to write, stdout by default')
+        parser.add_argument(
+            '--batch-size', type=int, default=bulk.EXPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        lines = bulk.iter_ndjson_export(
+            Course.objects.all(), options['batch_size'])
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output:
+                output.writelines(lines)
+        else:
+            for line in lines:
+                self.stdout.write(line, ending='')
@@ -0,0 +1,63 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+
+from courses import bulk
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        'Import course trees from an NDJSON file (one course per line) or '
+        'a JSON file holding a course or a list of courses.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path', help='file to read, "-" for stdin (NDJSON only)')
+        parser.add_argument(
+            '--author', help='email of the user the courses belong to')
+        parser.add_argument(
+            '--format', choices=('ndjson', 'json'),
+            help='document format, guessed from the extension by default')
+        parser.add_argument(
+            '--batch-size', type=int, default=bulk.IMPORT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        author = None
+        if options['author']:
+            try:
+                author = User.objects.get(email=options['author'])
+            except User.DoesNotExist:
+                raise CommandError(
+                    'No user with email "{}".'.format(options['author']))
+
+        path = options['path']
+        document_format = options['format'] or (
+            'json' if path.endswith('.json') else 'ndjson')
+        course_import = bulk.CourseTreeImport(
+            author=author, batch_size=options['batch_size'])
+
+        if path == '-':
+            course_import.run(bulk.iter_ndjson(sys.stdin))
+        else:
+            with open(path, encoding='utf-8') as document:
+                if document_format == 'json':
+                    try:
+                        rows = bulk.iter_json(json.load(document))
+                    except ValueError as e:
+                        raise CommandError('Invalid JSON: {}'.format(e))
+                else:
+                    rows = bulk.iter_ndjson(document)
+                course_import.run(rows)
+
+        self.stdout.write(json.dumps(
+            course_import.report(), cls=DjangoJSONEncoder, indent=2))
+        if not course_import.is_valid:
+            raise CommandError(
+                '{} invalid row(s), nothing was imported.'.format(
+                    course_import.error_count))
@@ -0,0 +1,39 @@
+from django.db import models
+from django.db.models import Prefetch
+
+
+# attributes the prefetched, published children are stored under
+PUBLISHED_TABS = 'published_tabs'
+PUBLISHED_LISTS = 'published_lists'
+
+
+class PublishedQuerySet(models.QuerySet):
+
+    def published(self):
+        return self.filter(is_active=True, is_deleted=False)
+
+
+class CourseQuerySet(PublishedQuerySet):
+
+    def with_tree(self):
+        """
+        Prefetch the published detail tabs of every course, and the
+        published lists of every tab, in one query per level.
+
+        The children are stored as lists on ``published_tabs`` and
+        ``published_lists`` rather than in the related managers' cache,
+        so ``course.detail_tabs.all()`` keeps returning every row.
+        """
+        tab_model = self.model._meta.get_field('detail_tabs').related_model
+        list_model = tab_model._meta.get_field('lists').related_model
+        lists = Prefetch(
+            'lists',
+            queryset=list_model.objects.published(),
+            to_attr=PUBLISHED_LISTS,
+        )
+        tabs = Prefetch(
+            'detail_tabs',
+            queryset=tab_model.objects.published().prefetch_related(lists),
+            to_attr=PUBLISHED_TABS,
+        )
+        return self.prefetch_related(tabs)
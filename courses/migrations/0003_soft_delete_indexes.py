@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.20 on 2026-10-18 07:21
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0002_category_categorycourserelation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='course',
+            index=models.Index(fields=['is_active', 'is_deleted', 'created_at', 'id'], name='course_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursedetailtab',
+            index=models.Index(fields=['course', 'is_active', 'is_deleted', 'index'], name='coursetab_active_index_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='coursedetailtablist',
+            index=models.Index(fields=['course_detail_tab', 'is_active', 'is_deleted', 'index'], name='coursetablist_active_idx'),
+        ),
+    ]
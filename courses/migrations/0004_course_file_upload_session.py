@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.20 on 2026-10-18 07:34
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('courses', '0003_soft_delete_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseFileUploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('last_modified_at', models.DateTimeField(auto_now=True)),
+                ('filename', models.CharField(max_length=256, verbose_name='filename')),
+                ('size', models.BigIntegerField(verbose_name='size')),
+                ('offset', models.BigIntegerField(default=0, verbose_name='offset')),
+                ('checksum', models.CharField(blank=True, default='', max_length=64, verbose_name='checksum')),
+                ('course_file', models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='upload_session', to='courses.CourseFile')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='courses_coursefileuploadsession_created_by', to=settings.AUTH_USER_MODEL)),
+                ('last_modified_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='courses_coursefileuploadsession_last_modified_by', to=settings.AUTH_USER_MODEL)),
+                ('section', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='courses.CourseSection')),
+            ],
+            options={
+                'ordering': ('-created_at',),
+            },
+        ),
+    ]
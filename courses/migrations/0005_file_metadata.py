@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.20 on 2026-10-18 07:38
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0004_course_file_upload_session'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursefile',
+            name='checksum',
+            field=models.CharField(blank=True, default='', max_length=64, verbose_name='checksum'),
+        ),
+        migrations.AddField(
+            model_name='coursefile',
+            name='content_type',
+            field=models.CharField(blank=True, default='', max_length=128, verbose_name='content type'),
+        ),
+        migrations.AddField(
+            model_name='coursefile',
+            name='size',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='size'),
+        ),
+    ]
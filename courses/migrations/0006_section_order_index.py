@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.11.20 on 2026-10-18 08:23
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0005_file_metadata'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='coursesection',
+            index=models.Index(fields=['course', 'index', 'id'], name='coursesection_order_idx'),
+        ),
+    ]
@@ -1,9 +1,15 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils.translation import ugettext_lazy as _
+from django.db.models.signals import post_init, post_save, post_delete
+from django.dispatch import receiver
 
-from utils.base_model import BaseModel
+from jobs.queue import enqueue
+from utils.base_model import BaseModel, FileMetadataModel
+from utils.media import remember_file, file_changed
 from utils.upload_location import course_file_location
+from .cache import catalog_cache, CATALOG_SCOPE, course_scope
+from .managers import CourseQuerySet, PublishedQuerySet
 # Create your models here.
 
 User = get_user_model()
@@ -17,6 +23,8 @@ class Course(BaseModel):
     is_active = models.BooleanField(_('is_active'), default=False)
     is_deleted = models.BooleanField(_('is_deleted'), default=False)
 
+    objects = CourseQuerySet.as_manager()
+
     def __str__(self):
         return "{}".format(self.name)
 
@@ -26,6 +34,12 @@ class Course(BaseModel):
 
     class Meta:
         ordering = ('-created_at',)
+        indexes = [
+            # public catalog: active, not deleted, newest first
+            models.Index(
+                fields=['is_active', 'is_deleted', 'created_at', 'id'],
+                name='course_active_created_idx'),
+        ]
 
 
 class CourseSection(BaseModel):
@@ -44,9 +58,15 @@ class CourseSection(BaseModel):
 
     class Meta:
         ordering = ('course', 'index',)
+        indexes = [
+            # admin section list: keyset on (course, index, id)
+            models.Index(
+                fields=['course', 'index', 'id'],
+                name='coursesection_order_idx'),
+        ]
 
 
-class CourseFile(BaseModel):
+class CourseFile(BaseModel, FileMetadataModel):
     section = models.ForeignKey(CourseSection, related_name='files')
     name = models.CharField(_('name'), max_length=256)
     description = models.TextField(_('description'), null=True, blank=True)
@@ -62,6 +82,35 @@ class CourseFile(BaseModel):
         ordering = ('section', 'index',)
 
 
+class CourseFileUploadSession(BaseModel):
+    """
+    A resumable, chunked upload of a course file. Chunks are appended to a
+    part file on local disk (see ``courses.uploads``) and ``offset`` is the
+    number of bytes received so far; finalizing moves the part file into
+    the storage and links the created ``course_file``.
+    """
+    section = models.ForeignKey(CourseSection, related_name='upload_sessions')
+    filename = models.CharField(_('filename'), max_length=256)
+    size = models.BigIntegerField(_('size'))
+    offset = models.BigIntegerField(_('offset'), default=0)
+    # optional sha256 (hex) of the whole file, checked on finalize
+    checksum = models.CharField(_('checksum'), max_length=64, blank=True,
+                                default='')
+    course_file = models.OneToOneField(
+        CourseFile, related_name='upload_session', null=True, blank=True,
+        on_delete=models.SET_NULL)
+
+    def __str__(self):
+        return "{} ({}/{})".format(self.filename, self.offset, self.size)
+
+    @property
+    def is_complete(self):
+        return self.offset == self.size
+
+    class Meta:
+        ordering = ('-created_at',)
+
+
 class CourseDetailTab(BaseModel):
     course = models.ForeignKey(Course, related_name='detail_tabs')
     name = models.CharField(_('name'), max_length=64)
@@ -70,11 +119,18 @@ class CourseDetailTab(BaseModel):
     is_active = models.BooleanField(_('is_active'), default=False)
     is_deleted = models.BooleanField(_('is_deleted'), default=False)
 
+    objects = PublishedQuerySet.as_manager()
+
     def __str__(self):
         return "{} - {}".format(self.course, self.name)
 
     class Meta:
         ordering = ('course', 'index',)
+        indexes = [
+            models.Index(
+                fields=['course', 'is_active', 'is_deleted', 'index'],
+                name='coursetab_active_index_idx'),
+        ]
 
 
 class CourseDetailTabList(BaseModel):
@@ -84,11 +140,19 @@ class CourseDetailTabList(BaseModel):
     is_active = models.BooleanField(_('is_active'), default=False)
     is_deleted = models.BooleanField(_('is_deleted'), default=False)
 
+    objects = PublishedQuerySet.as_manager()
+
     def __str__(self):
         return "{}".format(self.course_detail_tab)
 
     class Meta:
         ordering = ('course_detail_tab', 'index',)
+        indexes = [
+            models.Index(
+                fields=['course_detail_tab', 'is_active', 'is_deleted',
+                        'index'],
+                name='coursetablist_active_idx'),
+        ]
 
 
 class UserMyCourseLibrary(BaseModel):
@@ -121,4 +185,40 @@ class CategoryCourseRelation(BaseModel):
         return "{} - {}".format(self.category, self.course)
 
     class Meta:
-        ordering = ('-created_at',)
\ No newline at end of file
+        ordering = ('-created_at',)
+
+
+@receiver([post_save, post_delete], sender=Course)
+def invalidate_catalog_course(sender, instance, **kwargs):
+    catalog_cache.bump(CATALOG_SCOPE, course_scope(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=CourseDetailTab)
+def invalidate_catalog_course_tab(sender, instance, **kwargs):
+    catalog_cache.bump(course_scope(instance.course_id))
+
+
+@receiver([post_save, post_delete], sender=CourseDetailTabList)
+def invalidate_catalog_course_tab_list(sender, instance, **kwargs):
+    course_id = CourseDetailTab.objects.filter(
+        pk=instance.course_detail_tab_id,
+    ).values_list('course_id', flat=True).first()
+    if course_id:
+        catalog_cache.bump(course_scope(course_id))
+
+
+@receiver(post_delete, sender=CourseFileUploadSession)
+def remove_upload_part_file(sender, instance, **kwargs):
+    from .uploads import remove_part_file
+    remove_part_file(instance)
+
+
+@receiver(post_init, sender=CourseFile)
+def remember_course_file(sender, instance, **kwargs):
+    remember_file(instance)
+
+
+@receiver(post_save, sender=CourseFile)
+def queue_course_file_metadata(sender, instance, created, **kwargs):
+    if file_changed(instance, created=created):
+        enqueue('courses.file_metadata', course_file_id=instance.pk)
@@ -0,0 +1,42 @@
+from utils.prefetch import PrefetchPlan
+
+
+# author -> sections -> files, detail_tabs -> lists as read by
+# courses.api.admin.serializers.CoursesFullDetailSerializer
+COURSE_FULL_DETAIL_PLAN = PrefetchPlan(
+    select_related=(
+        'author',
+    ),
+    prefetch_related=(
+        'sections__files',
+        'detail_tabs__lists',
+    ),
+)
+
+
+# sections -> files as read by
+# courses.api.admin.serializers.CoursesDetailSerializer
+COURSE_DETAIL_PLAN = PrefetchPlan(
+    prefetch_related=(
+        'sections__files',
+    ),
+)
+
+
+# the whole tree plus category links, as read by courses.bulk.course_tree
+COURSE_EXPORT_PLAN = PrefetchPlan(
+    prefetch_related=(
+        'course_category',
+        'sections__files',
+        'detail_tabs__lists',
+    ),
+)
+
+
+# category -> links -> course, as read by the CategoryCourseDetail
+# serializers of courses.api.public and courses.api.user
+CATEGORY_COURSES_PLAN = PrefetchPlan(
+    prefetch_related=(
+        'category_courses__course',
+    ),
+)
@@ -0,0 +1,8 @@
+from jobs.registry import task
+from utils.media import record_file_metadata
+from .models import CourseFile
+
+
+@task('courses.file_metadata')
+def course_file_metadata(course_file_id):
+    record_file_metadata(CourseFile, course_file_id)
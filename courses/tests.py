@@ -1,3 +1,1244 @@
-from django.test import TestCase
+import hashlib
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest import mock, skipUnless
+from uuid import uuid4
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection, connections
+from django.core.files.storage import default_storage
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from account.serializers import AdminAuthSerializer
+from courses.models import (
+    Course,
+    CourseSection,
+    CourseFile,
+    CourseFileUploadSession,
+    CourseDetailTab,
+    CourseDetailTabList,
+    Category,
+    CategoryCourseRelation,
+    UserMyCourseLibrary,
+)
+from courses.api.admin.serializers import (
+    CourseFileFinalizeSerializer, CourseFileListSerializer,
+)
+from courses.api.public.serializers import (
+    PublicCategoryCourseDetailSerializer, PublicCourseListSerializer,
+    PublicCourseListProjection,
+)
+from courses.bulk import iter_course_trees
+from courses.cache import catalog_cache
+from courses.uploads import open_part_file, part_path
+from jobs.models import Job
+from courses.prefetch import COURSE_FULL_DETAIL_PLAN, COURSE_EXPORT_PLAN
+from utils import metrics, nplusone, res_codes
+from utils.renderers import EnvelopeJSONRenderer
+from utils.storage_urls import StorageURLCache, storage_url_cache
+
+User = get_user_model()
+
+# main query + prefetches, plus the JWT user lookup, the page keys and the
+# ETag validator query (the admin role check is answered by the token's
+# role claim)
+FULL_DETAIL_QUERY_BUDGET = COURSE_FULL_DETAIL_PLAN.query_count + 3
+
+
+def create_course_tree(author, sections=2, files=3, tabs=2, lists=2):
+    course = Course.objects.create(author=author, name='course', is_active=True)
+    for section_index in range(sections):
+        section = CourseSection.objects.create(
+            course=course, name='section', index=section_index)
+        for file_index in range(files):
+            CourseFile.objects.create(
+                section=section, name='file', index=file_index,
+                file='{}/{}/file.pdf'.format(course.id, section.id))
+    for tab_index in range(tabs):
+        tab = CourseDetailTab.objects.create(
+            course=course, name='tab', index=tab_index, is_active=True)
+        for list_index in range(lists):
+            CourseDetailTabList.objects.create(
+                course_detail_tab=tab, content='item', index=list_index,
+                is_active=True)
+    return course
+
+
+class APITestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User.objects.create_user(
+            email='admin@oddnary.test', password='password', is_superuser=True)
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION='Bearer {}'.format(
+                AdminAuthSerializer.get_token(self.admin).access_token))
+
+    def count_queries(self, path, **params):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path, params)
+        return response, len(context.captured_queries)
+
+
+class CoursesFullDetailQueryBudgetTest(APITestCase):
+    path = '/api/courses/admin/course-detail/'
+
+    def test_plan_query_count(self):
+        self.assertEqual(COURSE_FULL_DETAIL_PLAN.query_count, 5)
+
+    def test_query_count_does_not_grow_with_courses(self):
+        create_course_tree(self.admin)
+        response, small = self.count_queries(self.path)
+        self.assertEqual(response.status_code, 200)
+
+        for _ in range(4):
+            create_course_tree(self.admin)
+        response, large = self.count_queries(self.path)
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, FULL_DETAIL_QUERY_BUDGET)
+
+    def test_tree_is_serialized_from_prefetch(self):
+        create_course_tree(self.admin, sections=2, files=3, tabs=2, lists=4)
+        response = self.client.get(self.path)
+        course = response.data['data'][0]
+        self.assertEqual(course['author']['email'], self.admin.email)
+        self.assertEqual(len(course['sections']), 2)
+        self.assertEqual(len(course['sections'][0]['files']), 3)
+        self.assertEqual(len(course['detail_tabs']), 2)
+        self.assertEqual(len(course['detail_tabs'][0]['lists']), 4)
+
+
+class PublicCatalogCacheTest(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.course = create_course_tree(self.admin)
+        catalog_cache.reset_stats()
+        self.client = APIClient()
+
+    def test_list_is_served_from_cache_until_a_course_changes(self):
+        path = '/api/courses/public/courses/'
+        response, queries = self.count_queries(path)
+        self.assertEqual(len(response.data['data']), 1)
+        self.assertGreater(queries, 0)
+
+        response, queries = self.count_queries(path)
+        self.assertEqual(queries, 0)
+        self.assertEqual(catalog_cache.stats(), {'hits': 1, 'misses': 1})
+
+        Course.objects.create(author=self.admin, name='new', is_active=True)
+        response, queries = self.count_queries(path)
+        self.assertEqual(len(response.data['data']), 2)
+
+    def test_detail_is_invalidated_by_tab_list_writes(self):
+        path = '/api/courses/public/courses/{}/'.format(self.course.id)
+        self.client.get(path)
+        response, queries = self.count_queries(path)
+        self.assertEqual(queries, 0)
+
+        tab_list = CourseDetailTabList.objects.filter(
+            course_detail_tab__course=self.course).first()
+        tab_list.content = 'changed'
+        tab_list.save()
+        response, queries = self.count_queries(path)
+        self.assertGreater(queries, 0)
+        contents = [
+            item['content']
+            for tab in response.data['data']['tabs'] for item in tab['lists']
+        ]
+        self.assertIn('changed', contents)
+
+    def test_detail_without_hyphens_shares_the_versions(self):
+        path = '/api/courses/public/courses/{}/'.format(self.course.id.hex)
+        etag = self.client.get(path)['ETag']
+        self.course.description = 'changed'
+        self.course.save()
+        response = self.client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['description'], 'changed')
+
+        response = self.client.get('/api/courses/public/courses/not-a-uuid/')
+        self.assertEqual(response.status_code, 404)
+
+
+class ConditionalGetTest(APITestCase):
+    path = '/api/courses/admin/course-detail/'
+
+    def setUp(self):
+        super().setUp()
+        self.course = create_course_tree(self.admin)
+
+    def test_matching_etag_short_circuits_before_serialization(self):
+        response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        etag = response['ETag']
+
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+        # user lookup, the page keys and the single validator query
+        self.assertEqual(len(context.captured_queries), 3)
+
+    def test_etag_changes_on_nested_writes(self):
+        etag = self.client.get(self.path)['ETag']
+        CourseDetailTabList.objects.filter(
+            course_detail_tab__course=self.course).first().delete()
+        response = self.client.get(self.path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_etag_covers_the_page_only(self):
+        newest = create_course_tree(self.admin)
+        etag = self.client.get(self.path, {'page_size': 1})['ETag']
+
+        # a course on another page
+        CourseSection.objects.filter(course=self.course).first().save()
+        response = self.client.get(
+            self.path, {'page_size': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        CourseSection.objects.filter(course=newest).first().save()
+        response = self.client.get(
+            self.path, {'page_size': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+        # a new course pushes the page along
+        etag = response['ETag']
+        Course.objects.create(author=self.admin, name='newer')
+        response = self.client.get(
+            self.path, {'page_size': 1}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_public_detail_etag_uses_catalog_versions(self):
+        client = APIClient()
+        path = '/api/courses/public/courses/{}/'.format(self.course.id)
+        etag = client.get(path)['ETag']
+        with CaptureQueriesContext(connection) as context:
+            response = client.get(path, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(len(context.captured_queries), 0)
+
+
+class KeysetPaginationTest(APITestCase):
+    path = '/api/courses/admin/course/'
+
+    def test_walks_every_row_once_with_constant_queries(self):
+        for _ in range(5):
+            Course.objects.create(author=self.admin, name='course')
+
+        seen = []
+        query_counts = []
+        path, params = self.path, {'page_size': 2}
+        while path:
+            response, queries = self.count_queries(path, **params)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(course['id'] for course in response.data['data'])
+            query_counts.append(queries)
+            path, params = response.data['next'], {}
+
+        expected = [str(pk) for pk in Course.objects.order_by(
+            '-created_at', '-id').values_list('id', flat=True)]
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(set(query_counts)), 1)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.path, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_sections_keep_index_order(self):
+        for name in ('first', 'second'):
+            course = Course.objects.create(author=self.admin, name=name)
+            # created in reverse, newest first would turn them around
+            for index in (2, 1, 0):
+                CourseSection.objects.create(
+                    course=course, name='section', index=index)
+
+        seen = []
+        path, params = '/api/courses/admin/course-section-detail/', {
+            'page_size': 2}
+        while path:
+            response = self.client.get(path, params)
+            self.assertEqual(response.status_code, 200)
+            seen.extend(
+                (section['course']['id'], section['index'])
+                for section in response.data['data'])
+            path, params = response.data['next'], {}
+
+        self.assertEqual(seen, sorted(seen))
+        self.assertEqual(len(seen), 6)
+
+
+def explain(queryset):
+    """
+    Return the SQLite query plan of ``queryset`` as one string.
+    """
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN QUERY PLAN ' + sql, params)
+        return '\n'.join(row[-1] for row in cursor.fetchall())
+
+
+@skipUnless(connection.vendor == 'sqlite', 'EXPLAIN QUERY PLAN is SQLite')
+class SoftDeleteIndexTest(TestCase):
+
+    def assertUsesIndex(self, queryset, index):
+        plan = explain(queryset)
+        self.assertIn(index, plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_public_course_list(self):
+        courses = Course.objects.filter(
+            is_active=True, is_deleted=False).order_by('-created_at', '-id')
+        self.assertUsesIndex(courses[:11], 'course_active_created_idx')
+
+    def test_public_course_tabs(self):
+        course = Course.objects.create(name='course')
+        self.assertUsesIndex(
+            course.detail_tabs.filter(is_active=True, is_deleted=False),
+            'coursetab_active_index_idx')
+
+    def test_public_course_tab_lists(self):
+        tab = CourseDetailTab.objects.create(
+            course=Course.objects.create(name='course'), name='tab')
+        self.assertUsesIndex(
+            tab.lists.filter(is_active=True, is_deleted=False),
+            'coursetablist_active_idx')
+
+
+class CourseTreeQuerySetTest(APITestCase):
+
+    def test_with_tree_keeps_only_published_children(self):
+        course = create_course_tree(self.admin, tabs=2, lists=3)
+        tab = course.detail_tabs.first()
+        tab.is_deleted = True
+        tab.save()
+        CourseDetailTabList.objects.filter(
+            course_detail_tab=course.detail_tabs.last()).update(
+            is_active=False)
+
+        with self.assertNumQueries(3):
+            course = Course.objects.published().with_tree().get(pk=course.pk)
+            tabs = course.published_tabs
+            lists = [tab.published_lists for tab in tabs]
+        self.assertEqual(len(tabs), 1)
+        self.assertEqual(lists, [[]])
+
+    def test_public_detail_queries_do_not_grow_with_tabs(self):
+        client = APIClient()
+        small = create_course_tree(self.admin, tabs=1, lists=1)
+        large = create_course_tree(self.admin, tabs=4, lists=5)
+        path = '/api/courses/public/courses/{}/'
+        with CaptureQueriesContext(connection) as small_context:
+            client.get(path.format(small.pk))
+        with CaptureQueriesContext(connection) as large_context:
+            response = client.get(path.format(large.pk))
+        self.assertEqual(len(response.data['data']['tabs']), 4)
+        self.assertEqual(len(response.data['data']['tabs'][0]['lists']), 5)
+        self.assertEqual(
+            len(small_context.captured_queries),
+            len(large_context.captured_queries))
+
+
+def course_document(name='course', sections=2, files=2, tabs=2, lists=2,
+                    **extra):
+    row = {
+        'name': name,
+        'description': 'description',
+        'is_active': True,
+        'sections': [
+            {
+                'name': 'section',
+                'index': i,
+                'files': [
+                    {'name': 'file', 'description': 'file', 'index': j,
+                     'file': 'imported/file.pdf'}
+                    for j in range(files)
+                ],
+            }
+            for i in range(sections)
+        ],
+        'tabs': [
+            {
+                'name': 'tab',
+                'content': 'content',
+                'index': i,
+                'lists': [
+                    {'content': 'item', 'index': j} for j in range(lists)
+                ],
+            }
+            for i in range(tabs)
+        ],
+    }
+    row.update(extra)
+    return row
+
+
+class CourseBulkImportTest(APITestCase):
+    path = '/api/courses/admin/course-import/'
+
+    def post_ndjson(self, rows):
+        body = '\n'.join(json.dumps(row) for row in rows)
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                self.path, body, content_type='application/x-ndjson')
+        return response, len(context.captured_queries)
+
+    def test_import_queries_do_not_grow_with_rows(self):
+        category = Category.objects.create(name='category')
+        rows = [
+            course_document(categories=[str(category.pk)]) for _ in range(2)
+        ]
+        response, small = self.post_ndjson(rows)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['created'], {
+            'courses': 2, 'sections': 4, 'files': 8, 'tabs': 4, 'lists': 8,
+            'categories': 2,
+        })
+
+        response, large = self.post_ndjson(
+            [course_document(categories=[str(category.pk)])
+             for _ in range(10)])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(small, large)
+        self.assertEqual(Course.objects.count(), 12)
+        self.assertEqual(
+            Course.objects.filter(author=self.admin).count(), 12)
+
+    def test_invalid_rows_are_reported_and_nothing_is_written(self):
+        invalid = course_document()
+        invalid['sections'][1]['name'] = ''
+        rows = [
+            course_document(),
+            invalid,
+            course_document(categories=[str(uuid4())]),
+        ]
+        body = '\n'.join(json.dumps(row) for row in rows) + '\nnot json\n'
+        response = self.client.post(
+            self.path, body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 400)
+        errors = response.data['data']['errors']
+        self.assertEqual([error['row'] for error in errors], [2, 3, 4])
+        self.assertIn('name', errors[0]['errors']['sections[1]'])
+        self.assertIn('categories', errors[1]['errors'])
+        self.assertFalse(Course.objects.exists())
+        self.assertFalse(CourseSection.objects.exists())
+
+    def test_json_document(self):
+        response = self.client.post(
+            self.path, [course_document(), course_document()], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['data']['created']['courses'], 2)
+
+    def test_imported_files_get_metadata_jobs(self):
+        response, _ = self.post_ndjson([course_document(files=3)])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            sorted(json.loads(payload)['course_file_id'] for payload in (
+                Job.objects.filter(task='courses.file_metadata')
+                .values_list('payload', flat=True))),
+            sorted(str(pk) for pk in CourseFile.objects.values_list(
+                'pk', flat=True)))
+
+    def test_export_round_trips_through_import(self):
+        create_course_tree(self.admin, sections=2, files=2, tabs=1, lists=3)
+        create_course_tree(self.admin, sections=1, files=1, tabs=2, lists=1)
+        response = self.client.get('/api/courses/admin/course-export/')
+        self.assertEqual(response.status_code, 200)
+        body = b''.join(response.streaming_content).decode('utf-8')
+        exported = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual(len(exported), 2)
+
+        Course.objects.all().delete()
+        response, queries = self.post_ndjson(exported)
+        self.assertEqual(response.status_code, 201)
+        again = [
+            json.loads(line) for line in b''.join(self.client.get(
+                '/api/courses/admin/course-export/').streaming_content
+            ).decode('utf-8').splitlines()
+        ]
+        key = lambda row: row['id']
+        self.assertEqual(sorted(again, key=key), sorted(exported, key=key))
+
+    def test_export_reads_in_batches(self):
+        for _ in range(5):
+            create_course_tree(self.admin, sections=1, files=1, tabs=1)
+        with CaptureQueriesContext(connection) as context:
+            rows = list(iter_course_trees(Course.objects.all(), batch_size=2))
+        self.assertEqual(len(rows), 5)
+        # three batches of the course query plus its prefetches
+        self.assertEqual(
+            len(context.captured_queries),
+            3 * COURSE_EXPORT_PLAN.query_count)
+
+    def test_management_commands(self):
+        create_course_tree(self.admin)
+        output = StringIO()
+        call_command('export_courses', stdout=output)
+        Course.objects.all().delete()
+
+        with tempfile.NamedTemporaryFile('w', suffix='.ndjson') as document:
+            document.write(output.getvalue())
+            document.flush()
+            call_command(
+                'import_courses', document.name, author=self.admin.email,
+                stdout=StringIO())
+        self.assertEqual(Course.objects.count(), 1)
+        self.assertEqual(CourseFile.objects.count(), 6)
+
+
+class StreamingListTest(APITestCase):
+    path = '/api/courses/admin/course/'
+
+    def stream(self, path):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(path, {'stream': 1})
+            content = b''.join(response.streaming_content)
+        return json.loads(content.decode('utf-8')), len(context.captured_queries)
+
+    def test_stream_matches_envelope_of_every_row(self):
+        for _ in range(5):
+            Course.objects.create(author=self.admin, name='course')
+        payload, _ = self.stream(self.path)
+        response = self.client.get(self.path, {'page_size': 100})
+        self.assertEqual(list(payload), ['code', 'msg', 'data'])
+        self.assertEqual(payload['code'], response.data['code'])
+        self.assertEqual(
+            payload['data'], json.loads(json.dumps(response.data['data'])))
+
+    def test_prefetched_stream_queries_do_not_grow(self):
+        category = Category.objects.create(name='category')
+        for _ in range(3):
+            course = Course.objects.create(author=self.admin, name='course')
+            category.category_courses.create(course=course)
+        path = '/api/courses/public/category/'
+        payload, small = self.stream(path)
+        self.assertEqual(len(payload['data'][0]['courses']), 3)
+
+        for index in range(4):
+            Category.objects.create(name='category {}'.format(index))
+        payload, large = self.stream(path)
+        self.assertEqual(len(payload['data']), 5)
+        self.assertEqual(small, large)
+
+
+class DirectUploadTest(APITestCase):
+    ticket_path = '/api/courses/admin/course-section-file-ticket/'
+    finalize_path = '/api/courses/admin/course-section-file-finalize/'
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings = override_settings(
+            MEDIA_ROOT=media_root.name,
+            DEFAULT_FILE_STORAGE='utils.storage.DirectUploadFileSystemStorage',
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        course = Course.objects.create(author=self.admin, name='course')
+        self.section = CourseSection.objects.create(
+            course=course, name='section')
+
+    def issue_ticket(self, filename='notes.pdf'):
+        response = self.client.post(self.ticket_path, {
+            'section': str(self.section.pk),
+            'filename': filename,
+            'content_type': 'application/pdf',
+        })
+        self.assertEqual(response.status_code, 201)
+        return response.data['data']
+
+    def upload(self, ticket, content=b'%PDF-1.4'):
+        upload = ticket['upload']
+        self.assertEqual(upload['method'], 'PUT')
+        response = self.client.put(
+            upload['url'], content,
+            content_type=upload['headers']['Content-Type'])
+        self.assertEqual(response.status_code, 200)
+
+    def finalize(self, ticket):
+        return self.client.post(self.finalize_path, {
+            'ticket': ticket,
+            'name': 'notes',
+            'description': 'lecture notes',
+            'index': 0,
+        })
+
+    def test_ticket_upload_finalize_creates_file(self):
+        ticket = self.issue_ticket()
+        self.upload(ticket)
+        response = self.finalize(ticket['ticket'])
+        self.assertEqual(response.status_code, 201)
+
+        course_file = CourseFile.objects.get(pk=response.data['data']['id'])
+        self.assertEqual(
+            Job.objects.filter(task='courses.file_metadata').count(), 1)
+        self.assertEqual(course_file.section_id, self.section.pk)
+        self.assertEqual(course_file.file.name, '{}/{}/{}/notes.pdf'.format(
+            self.section.course_id, self.section.pk, course_file.pk))
+        with default_storage.open(course_file.file.name) as uploaded:
+            self.assertEqual(uploaded.read(), b'%PDF-1.4')
+
+    def test_finalize_requires_uploaded_file(self):
+        response = self.finalize(self.issue_ticket()['ticket'])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ticket', response.data['data'])
+        self.assertFalse(CourseFile.objects.exists())
+
+    def test_ticket_finalizes_once(self):
+        ticket = self.issue_ticket()
+        self.upload(ticket)
+        self.assertEqual(self.finalize(ticket['ticket']).status_code, 201)
+        self.assertEqual(self.finalize(ticket['ticket']).status_code, 400)
+        self.assertEqual(CourseFile.objects.count(), 1)
+
+    def test_concurrent_finalize_is_refused(self):
+        ticket = self.issue_ticket()
+        self.upload(ticket)
+        validate_ticket = CourseFileFinalizeSerializer.validate_ticket
+
+        def finalized_meanwhile(serializer, value):
+            data = validate_ticket(serializer, value)
+            # another finalize of the ticket wins the race
+            CourseFile.objects.create(
+                id=data['pk'], section=self.section, name='notes',
+                file=data['name'])
+            return data
+
+        with mock.patch.object(
+                CourseFileFinalizeSerializer, 'validate_ticket',
+                finalized_meanwhile):
+            response = self.finalize(ticket['ticket'])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['code'], int(res_codes.INVALID_POST_DATA))
+        self.assertEqual(
+            response.data['data']['ticket'],
+            ['Upload has already been finalized.'])
+        self.assertEqual(CourseFile.objects.count(), 1)
+
+    def test_finalize_after_section_deleted(self):
+        ticket = self.issue_ticket()
+        self.upload(ticket)
+        self.section.delete()
+        response = self.finalize(ticket['ticket'])
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ticket', response.data['data'])
+        self.assertFalse(CourseFile.objects.exists())
+
+    def test_filename_stays_in_the_row_folder(self):
+        default_storage.save('victim/secret.pdf', ContentFile(b'secret'))
+        ticket = self.issue_ticket('../../../victim/secret.pdf')
+        self.upload(ticket, b'PWNED')
+        with default_storage.open('victim/secret.pdf') as victim:
+            self.assertEqual(victim.read(), b'secret')
+
+        response = self.finalize(ticket['ticket'])
+        self.assertEqual(response.status_code, 201)
+        course_file = CourseFile.objects.get(pk=response.data['data']['id'])
+        self.assertEqual(course_file.file.name, '{}/{}/{}/secret.pdf'.format(
+            self.section.course_id, self.section.pk, course_file.pk))
+
+        for filename in ('..', '../', '/'):
+            response = self.client.post(self.ticket_path, {
+                'section': str(self.section.pk),
+                'filename': filename,
+            })
+            self.assertEqual(response.status_code, 400)
+            self.assertIn('filename', response.data['data'])
+
+    def test_upload_url_does_not_overwrite(self):
+        ticket = self.issue_ticket()
+        self.upload(ticket)
+        upload = ticket['upload']
+        response = self.client.put(
+            upload['url'], b'replaced',
+            content_type=upload['headers']['Content-Type'])
+        self.assertEqual(response.status_code, 409)
+        self.finalize(ticket['ticket'])
+        name = CourseFile.objects.get().file.name
+        with default_storage.open(name) as uploaded:
+            self.assertEqual(uploaded.read(), b'%PDF-1.4')
+
+    def test_tampered_ticket_and_upload_url_are_refused(self):
+        ticket = self.issue_ticket()
+        self.assertEqual(
+            self.finalize(ticket['ticket'] + 'x').status_code, 400)
+        response = self.client.put(
+            ticket['upload']['url'].rstrip('/') + 'x/', b'data',
+            content_type='application/pdf')
+        self.assertEqual(response.status_code, 404)
+
+
+class ChunkedUploadTest(APITestCase):
+    path = '/api/courses/admin/course-section-file-upload/'
+    content = bytes(range(256)) * 40
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings = override_settings(
+            MEDIA_ROOT=media_root.name,
+            UPLOAD_SESSION_ROOT=os.path.join(media_root.name, 'parts'),
+        )
+        settings.enable()
+        self.addCleanup(settings.disable)
+        course = Course.objects.create(author=self.admin, name='course')
+        self.section = CourseSection.objects.create(
+            course=course, name='section')
+
+    def start(self, **data):
+        data.setdefault('size', len(self.content))
+        data.setdefault('filename', 'lecture.mp4')
+        response = self.client.post(self.path, dict(
+            section=str(self.section.pk), **data))
+        self.assertEqual(response.status_code, 201)
+        return response.data['data']['id']
+
+    def put_chunk(self, session_id, offset, chunk, checksum=None):
+        return self.client.put(
+            '{}{}/'.format(self.path, session_id), chunk,
+            content_type='application/octet-stream',
+            HTTP_UPLOAD_OFFSET=str(offset),
+            HTTP_UPLOAD_CHECKSUM=checksum or hashlib.sha256(chunk).hexdigest(),
+        )
+
+    def finalize(self, session_id):
+        path = '{}{}/finalize/'.format(self.path, session_id)
+        return self.client.post(path, {
+            'name': 'lecture',
+            'description': 'first lecture',
+            'index': 0,
+        })
+
+    def test_chunks_are_assembled_into_course_file(self):
+        session_id = self.start(
+            checksum=hashlib.sha256(self.content).hexdigest())
+        for offset in range(0, len(self.content), 4096):
+            response = self.put_chunk(
+                session_id, offset, self.content[offset:offset + 4096])
+            self.assertEqual(response.status_code, 200)
+        response = self.finalize(session_id)
+        self.assertEqual(response.status_code, 201)
+
+        course_file = CourseFile.objects.get(pk=response.data['data']['id'])
+        self.assertEqual(course_file.file.name, '{}/{}/{}/lecture.mp4'.format(
+            self.section.course_id, self.section.pk, course_file.pk))
+        with default_storage.open(course_file.file.name) as stored:
+            self.assertEqual(stored.read(), self.content)
+        session = CourseFileUploadSession.objects.get(pk=session_id)
+        self.assertEqual(session.course_file, course_file)
+        self.assertFalse(os.path.exists(part_path(session)))
+        self.assertEqual(self.finalize(session_id).status_code, 400)
+
+    def test_upload_resumes_from_offset(self):
+        session_id = self.start()
+        self.assertEqual(
+            self.put_chunk(session_id, 0, self.content[:4096]).status_code,
+            200)
+        # a bad checksum leaves the upload where it was
+        response = self.put_chunk(
+            session_id, 4096, self.content[4096:8192], checksum='0' * 64)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['data']['offset'], 4096)
+        # so does a chunk sent twice
+        response = self.put_chunk(session_id, 0, self.content[:4096])
+        self.assertEqual(response.status_code, 409)
+
+        response = self.client.get('{}{}/'.format(self.path, session_id))
+        offset = response.data['data']['offset']
+        self.assertEqual(offset, 4096)
+        self.assertEqual(self.finalize(session_id).status_code, 400)
+        self.put_chunk(session_id, offset, self.content[offset:])
+        self.assertEqual(self.finalize(session_id).status_code, 201)
+        course_file = CourseFile.objects.get()
+        with default_storage.open(course_file.file.name) as stored:
+            self.assertEqual(stored.read(), self.content)
+
+    def test_filename_stays_in_the_file_folder(self):
+        session_id = self.start(filename='../../../victim/lecture.mp4')
+        self.put_chunk(session_id, 0, self.content)
+        response = self.finalize(session_id)
+        self.assertEqual(response.status_code, 201)
+        course_file = CourseFile.objects.get(pk=response.data['data']['id'])
+        self.assertEqual(course_file.file.name, '{}/{}/{}/lecture.mp4'.format(
+            self.section.course_id, self.section.pk, course_file.pk))
+
+        response = self.client.post(self.path, {
+            'section': str(self.section.pk),
+            'filename': '../',
+            'size': 10,
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('filename', response.data['data'])
+
+    def test_chunk_past_the_end_is_refused(self):
+        session_id = self.start(size=10)
+        response = self.put_chunk(session_id, 0, self.content[:11])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['data']['offset'], 0)
+
+    def test_chunk_without_the_received_data_is_refused(self):
+        session_id = self.start()
+        self.put_chunk(session_id, 0, self.content[:4096])
+        session = CourseFileUploadSession.objects.get(pk=session_id)
+        # as on a host that did not receive the first chunk
+        os.remove(part_path(session))
+        response = self.put_chunk(
+            session_id, 4096, self.content[4096:8192])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['data']['offset'], 4096)
+        self.assertEqual(os.path.getsize(part_path(session)), 0)
+
+    def test_bytes_of_an_interrupted_write_are_cut_off(self):
+        session_id = self.start()
+        self.put_chunk(session_id, 0, self.content[:4096])
+        session = CourseFileUploadSession.objects.get(pk=session_id)
+        with open(part_path(session), 'ab') as part:
+            part.write(b'\0' * 100)
+        self.put_chunk(session_id, 4096, self.content[4096:])
+        self.assertEqual(self.finalize(session_id).status_code, 201)
+        with default_storage.open(CourseFile.objects.get().file.name) as stored:
+            self.assertEqual(stored.read(), self.content)
+
+    def test_concurrent_chunk_is_refused(self):
+        session_id = self.start()
+        session = CourseFileUploadSession.objects.get(pk=session_id)
+        with open_part_file(session, create=True):
+            response = self.put_chunk(session_id, 0, self.content[:4096])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.put_chunk(
+            session_id, 0, self.content[:4096]).status_code, 200)
+
+
+class UploadLocationQueryTest(APITestCase):
+    path = '/api/courses/admin/course-section-file-create/'
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings = override_settings(MEDIA_ROOT=media_root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        course = Course.objects.create(author=self.admin, name='course')
+        self.section = CourseSection.objects.create(
+            course=course, name='section')
+
+    def test_file_name_costs_no_query(self):
+        section = CourseSection.objects.get(pk=self.section.pk)
+        course_file = CourseFile(section=section, name='notes')
+        with self.assertNumQueries(0):
+            course_file.file.save(
+                'notes.pdf', ContentFile(b'notes'), save=False)
+        self.assertEqual(course_file.file.name, '{}/{}/{}/notes.pdf'.format(
+            self.section.course_id, self.section.pk, course_file.pk))
+
+    def test_create_does_not_read_course(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(self.path, {
+                'section': str(self.section.pk),
+                'name': 'notes',
+                'description': 'lecture notes',
+                'index': 0,
+                'file': SimpleUploadedFile('notes.pdf', b'notes'),
+            }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        self.assertFalse([
+            query for query in context.captured_queries
+            if 'FROM "{}"'.format(Course._meta.db_table) in query['sql']
+        ])
+
+
+class CourseFileMetadataTest(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        settings = override_settings(MEDIA_ROOT=media_root.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        course = Course.objects.create(author=self.admin, name='course')
+        self.section = CourseSection.objects.create(
+            course=course, name='section')
+
+    def test_metadata_is_recorded_by_the_worker(self):
+        content = b'%PDF-1.4 lecture notes'
+        course_file = CourseFile(section=self.section, name='notes')
+        course_file.file.save('notes.pdf', ContentFile(content))
+        course_file.refresh_from_db()
+        self.assertIsNone(course_file.size)
+        self.assertEqual(
+            Job.objects.filter(task='courses.file_metadata').count(), 1)
+
+        call_command('run_jobs', once=True, verbosity=0)
+        course_file.refresh_from_db()
+        self.assertEqual(course_file.size, len(content))
+        self.assertEqual(
+            course_file.checksum, hashlib.sha256(content).hexdigest())
+        self.assertEqual(course_file.content_type, 'application/pdf')
+
+    def test_only_a_new_file_is_queued(self):
+        course_file = CourseFile(section=self.section, name='notes')
+        course_file.file.save('notes.pdf', ContentFile(b'notes'))
+        course_file = CourseFile.objects.get(pk=course_file.pk)
+        course_file.name = 'renamed'
+        course_file.save()
+        self.assertEqual(Job.objects.count(), 1)
+
+        course_file.file.save('slides.pdf', ContentFile(b'slides'))
+        self.assertEqual(Job.objects.count(), 2)
+
+
+class FakeS3Storage(object):
+    """
+    Has the attributes of an S3 storage the URL cache looks at, counts
+    ``url()`` calls.
+    """
+    bucket_name = 'oddnary-media'
+    url_protocol = 'https:'
+    location = ''
+
+    def __init__(self, querystring_auth=True, custom_domain=None):
+        self.querystring_auth = querystring_auth
+        self.querystring_expire = 3600
+        self.custom_domain = custom_domain
+        self.calls = 0
+
+    def _clean_name(self, name):
+        return name
+
+    def _normalize_name(self, name):
+        return name
+
+    def url(self, name):
+        self.calls += 1
+        return 'https://signed/{}?signature={}'.format(name, self.calls)
+
+
+class StorageURLCacheTest(TestCase):
+
+    def test_url_is_built_once(self):
+        storage = FakeS3Storage()
+        urls = StorageURLCache()
+        first = urls.url(storage, 'a.pdf')
+        self.assertEqual(urls.url(storage, 'a.pdf'), first)
+        self.assertEqual(storage.calls, 1)
+
+    def test_least_recently_used_is_evicted(self):
+        storage = FakeS3Storage()
+        urls = StorageURLCache(maxsize=2)
+        urls.url(storage, 'a.pdf')
+        urls.url(storage, 'b.pdf')
+        urls.url(storage, 'a.pdf')
+        urls.url(storage, 'c.pdf')
+        self.assertEqual(len(urls), 2)
+        urls.url(storage, 'a.pdf')
+        self.assertEqual(storage.calls, 3)
+        urls.url(storage, 'b.pdf')
+        self.assertEqual(storage.calls, 4)
+
+    def test_signed_url_is_renewed_after_half_its_lifetime(self):
+        storage = FakeS3Storage()
+        urls = StorageURLCache()
+        with mock.patch('time.time', return_value=7200):
+            first = urls.url(storage, 'a.pdf')
+        with mock.patch('time.time', return_value=7200 + 1799):
+            self.assertEqual(urls.url(storage, 'a.pdf'), first)
+        with mock.patch('time.time', return_value=7200 + 1800):
+            self.assertNotEqual(urls.url(storage, 'a.pdf'), first)
+        self.assertEqual(storage.calls, 2)
+
+    def test_public_urls_are_built_without_the_storage(self):
+        urls = StorageURLCache()
+        storage = FakeS3Storage(custom_domain='cdn.oddnary.test')
+        self.assertEqual(
+            urls.url(storage, 'course/notes 1.pdf'),
+            'https://cdn.oddnary.test/course/notes%201.pdf')
+        storage = FakeS3Storage(querystring_auth=False)
+        self.assertEqual(
+            urls.url(storage, 'course/notes.pdf'),
+            'https://oddnary-media.s3.amazonaws.com/course/notes.pdf')
+        self.assertEqual(storage.calls, 0)
+
+
+class CachedFileURLSerializerTest(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        storage_url_cache.clear()
+        self.addCleanup(storage_url_cache.clear)
+        self.course = create_course_tree(self.admin, sections=2, files=2)
+
+    def test_list_urls_match_storage(self):
+        course_files = CourseFile.objects.filter(section__course=self.course)
+        data = CourseFileListSerializer(course_files, many=True).data
+        self.assertEqual(
+            [item['file'] for item in data],
+            [default_storage.url(item.file.name) for item in course_files])
+
+    def test_storage_is_asked_once_per_file(self):
+        course_files = list(
+            CourseFile.objects.filter(section__course=self.course))
+        storage_class = type(course_files[0].file.storage._wrapped)
+        with mock.patch.object(
+                storage_class, 'url', autospec=True,
+                side_effect=lambda storage, name: '/media/' + name) as url:
+            for _ in range(3):
+                CourseFileListSerializer(course_files, many=True).data
+        # the files of a section share a name in create_course_tree
+        self.assertEqual(url.call_count, len(
+            {course_file.file.name for course_file in course_files}))
+
+
+class ReplicaRoutingTest(APITestCase):
+    """
+    ``replica`` is a separate, empty SQLite database in the test settings,
+    rows created by the tests only exist on ``default``.
+    """
+    multi_db = True
+    path = '/api/courses/user/courses/'
+
+    def setUp(self):
+        super().setUp()
+        settings = override_settings(REPLICA_DATABASES=['replica'])
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.course = Course.objects.create(author=self.admin, name='course')
+
+    def test_get_reads_from_replica(self):
+        with CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.get(self.path)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data'], [])
+        self.assertTrue(replica.captured_queries)
+
+    def test_writer_reads_own_writes(self):
+        response = self.client.post(
+            '/api/courses/user/add-course/', {'course': str(self.course.pk)})
+        self.assertEqual(response.status_code, 201)
+        self.assertIn('read_primary', response.cookies)
+
+        response = self.client.get(self.path)
+        self.assertEqual(
+            [course['name'] for course in response.data['data']], ['course'])
+
+    def test_streamed_body_reads_from_replica(self):
+        Category.objects.create(name='category')
+        # anonymous, the token user only exists on default
+        response = APIClient().get(
+            '/api/courses/public/category/', {'stream': 1})
+        with CaptureQueriesContext(connections['replica']) as replica:
+            payload = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(payload['data'], [])
+        self.assertTrue(replica.captured_queries)
+
+
+class ValuesProjectionTest(APITestCase):
+    path = '/api/courses/public/courses/'
+
+    def setUp(self):
+        super().setUp()
+        for index in range(5):
+            Course.objects.create(
+                author=self.admin, name='course {}'.format(index),
+                description='learn', is_active=True)
+
+    def test_matches_serializer(self):
+        courses = Course.objects.published().order_by('-created_at')
+        with self.assertNumQueries(1):
+            data = PublicCourseListProjection(
+                PublicCourseListProjection.values(courses), many=True).data
+        self.assertEqual(
+            json.loads(json.dumps(data)),
+            json.loads(json.dumps(
+                PublicCourseListSerializer(courses, many=True).data)))
+
+    def test_list_pages_through_values_rows(self):
+        seen = []
+        path, params = self.path, {'page_size': 2}
+        while path:
+            response = self.client.get(path, params)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(
+                [list(course) for course in response.data['data']],
+                [['id', 'name', 'description']] * len(response.data['data']))
+            seen.extend(course['id'] for course in response.data['data'])
+            path, params = response.data['next'], {}
+        self.assertEqual(seen, [
+            str(pk) for pk in Course.objects.order_by(
+                '-created_at', '-id').values_list('id', flat=True)])
+
+
+class ResponseEnvelopeTest(TestCase):
+
+    def test_renders_like_json_renderer(self):
+        data = res_codes.get_response_dict(
+            res_codes.SUCCESS, [{'name': 'caf\u00e9', 'id': uuid4()}])
+        data['next'] = None
+        self.assertEqual(
+            EnvelopeJSONRenderer().render(data), JSONRenderer().render(data))
+        self.assertTrue(EnvelopeJSONRenderer().render(data).startswith(
+            res_codes.get_envelope(res_codes.SUCCESS).prefix))
+
+    def test_changed_head_is_rendered_in_full(self):
+        data = res_codes.get_response_dict(res_codes.SUCCESS)
+        data['msg'] = 'changed'
+        self.assertEqual(
+            json.loads(EnvelopeJSONRenderer().render(data).decode('utf-8')),
+            {'code': 2000, 'msg': 'changed'})
+
+    def test_respond_pairs_status(self):
+        self.assertEqual(
+            res_codes.respond(res_codes.COURSE_CREATED, {}).status_code, 201)
+        self.assertEqual(
+            res_codes.respond(res_codes.UPLOAD_OFFSET_MISMATCH).status_code,
+            409)
+        response = res_codes.respond(res_codes.INVALID_POST_DATA, status=200)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {
+            'code': 1000, 'msg': 'Invalid post data provided'})
+
+
+class MyCourseLibraryTest(APITestCase):
+
+    def test_remove_course(self):
+        course = Course.objects.create(author=self.admin, name='course')
+        entry = UserMyCourseLibrary.objects.create(
+            user=self.admin, course=course)
+        other = UserMyCourseLibrary.objects.create(
+            user=User.objects.create_user(email='user@oddnary.test'),
+            course=course)
+        path = '/api/courses/user/remove-course/{}/'
+
+        # another user's entry is not found for this one
+        response = self.client.delete(path.format(other.pk))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['code'], int(res_codes.COURSE_NOT_FOUND_FOR_USER))
+
+        response = self.client.delete(path.format(entry.pk))
+        self.assertEqual(response.status_code, 204)
+        self.assertEqual(
+            list(UserMyCourseLibrary.objects.all()), [other])
+
+
+class RequestMetricsTest(APITestCase):
+    view = 'courses.api.public.views.PublicCategoryCourseFullDetailApiView'
+
+    def setUp(self):
+        super().setUp()
+        for histogram in metrics.HISTOGRAMS:
+            histogram.clear()
+        Category.objects.create(name='category')
+
+    def test_records_view_histograms(self):
+        response = self.client.get('/api/courses/public/category/')
+        self.assertEqual(response.status_code, 200)
+        labels = (('method', 'GET'), ('view', self.view))
+        (counts, _), = metrics.QUERY_COUNT._series.values()
+        self.assertEqual(list(metrics.QUERY_COUNT._series), [labels])
+        self.assertEqual(sum(counts), 1)
+        counts, size = metrics.RESPONSE_BYTES._series[labels]
+        self.assertEqual(size, len(response.content))
+        self.assertIn(labels, metrics.SERIALIZE_SECONDS._series)
+
+    def test_logs_slow_queries_with_view(self):
+        with mock.patch('utils.metrics.METRICS_SLOW_QUERY_SECONDS', 0):
+            with self.assertLogs('utils.metrics', 'WARNING') as logs:
+                self.client.get('/api/courses/public/category/')
+        self.assertIn(self.view, logs.output[0])
+
+    def test_exposes_prometheus_text(self):
+        self.client.get('/api/courses/public/category/')
+        self.client.credentials()
+        with mock.patch('utils.metrics.METRICS_TOKEN', 'scraper'):
+            response = self.client.get(
+                '/api/internal/metrics', HTTP_AUTHORIZATION='Bearer scraper')
+            self.assertEqual(response.status_code, 200)
+            self.assertIn(
+                'oddnary_request_queries_count{{method="GET",view="{}"}} 1'
+                .format(self.view), response.content.decode('utf-8'))
+
+            response = self.client.get(
+                '/api/internal/metrics', HTTP_AUTHORIZATION='Bearer other')
+            self.assertEqual(response.status_code, 404)
+
+    def test_internal_ips_need_debug(self):
+        # e.g. every request through a reverse proxy on the same host
+        response = self.client.get(
+            '/api/internal/metrics', REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, 404)
+        with override_settings(DEBUG=True):
+            response = self.client.get(
+                '/api/internal/metrics', REMOTE_ADDR='127.0.0.1')
+        self.assertEqual(response.status_code, 200)
+
+    def test_queries_are_counted_without_debug_cursor(self):
+        self.client.get('/api/courses/public/category/')
+        self.assertFalse(connection.force_debug_cursor)
+        self.assertFalse(connection.queries_log)
+
+
+class NPlusOneDetectionTest(APITestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.category = Category.objects.create(name='category')
+        for index in range(5):
+            category = Category.objects.create(name='category {}'.format(index))
+            course = Course.objects.create(
+                author=self.admin, name='course {}'.format(index),
+                is_active=True)
+            for linked in (self.category, category):
+                CategoryCourseRelation.objects.create(
+                    category=linked, course=course)
+
+    def test_category_views_do_not_fan_out(self):
+        for path in (
+                '/api/courses/public/category/',
+                '/api/courses/public/category/{}/'.format(self.category.pk),
+                '/api/courses/user/category/',
+                '/api/courses/user/category/{}/'.format(self.category.pk),
+                '/api/courses/admin/all-course-detail/'):
+            response = self.client.get(path)
+            self.assertEqual(response.status_code, 200, path)
+
+    def test_missing_category_is_not_found(self):
+        response = self.client.get(
+            '/api/courses/user/category/{}/'.format(uuid4()))
+        self.assertEqual(response.status_code, 404)
+
+    def test_repeated_query_names_serializer_field(self):
+        categories = Category.objects.all()
+        with self.assertRaisesRegex(
+                nplusone.NPlusOneError,
+                r'PublicCategoryCourseDetailSerializer\.courses'):
+            with nplusone.detect('categories'):
+                PublicCategoryCourseDetailSerializer(categories, many=True).data
+
+    def test_logs_when_not_raising(self):
+        categories = Category.objects.all()
+        with mock.patch('utils.nplusone.NPLUSONE_RAISE', False):
+            with self.assertLogs('utils.nplusone', 'WARNING') as logs:
+                with nplusone.detect('categories'):
+                    PublicCategoryCourseDetailSerializer(
+                        categories, many=True).data
+        self.assertEqual(logs.records[0].view, 'categories')
+        self.assertEqual(logs.records[0].count, 6)
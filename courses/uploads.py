@@ -0,0 +1,254 @@
+import fcntl
+import hashlib
+import os
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files import File
+from django.db import IntegrityError, transaction
+
+from utils import res_codes
+from .models import CourseSection
+
+
+UPLOAD_CHUNK_MAX_SIZE = getattr(
+    settings, 'UPLOAD_CHUNK_MAX_SIZE', 64 * 1024 * 1024)
+# bytes read from the request / part file at a time
+COPY_BUFFER_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    """
+    A chunk or a finalize was refused. ``lookup`` is the ``res_codes``
+    code to answer with, ``offset`` the bytes the session holds, which is
+    where the client resumes from.
+    """
+
+    def __init__(self, lookup, message, offset=None):
+        super().__init__(message)
+        self.lookup = lookup
+        self.message = message
+        self.offset = offset
+
+    def get_data(self):
+        return {'detail': self.message, 'offset': self.offset}
+
+
+def get_upload_root():
+    """
+    Directory of the part files of unfinished upload sessions, must be on
+    local disk.
+    """
+    return getattr(
+        settings, 'UPLOAD_SESSION_ROOT',
+        os.path.join(tempfile.gettempdir(), 'oddnary-uploads'))
+
+
+def part_path(session):
+    return os.path.join(get_upload_root(), '{}.part'.format(session.pk))
+
+
+def remove_part_file(session):
+    try:
+        os.remove(part_path(session))
+    except FileNotFoundError:
+        pass
+
+
+def file_checksum(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as part:
+        for block in iter(lambda: part.read(COPY_BUFFER_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+@contextmanager
+def open_part_file(session, create=False):
+    """
+    Open the part file of ``session`` under an exclusive lock, so that one
+    request at a time writes or finalizes it; a second one is refused
+    instead of waiting on a chunk that can take minutes to arrive.
+    """
+    os.makedirs(get_upload_root(), exist_ok=True)
+    flags = os.O_RDWR | (os.O_CREAT if create else 0)
+    try:
+        descriptor = os.open(part_path(session), flags, 0o600)
+    except FileNotFoundError:
+        raise part_unavailable(session)
+    with os.fdopen(descriptor, 'r+b') as part:
+        try:
+            fcntl.flock(part, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise UploadError(
+                res_codes.UPLOAD_OFFSET_MISMATCH,
+                'Another request is writing this upload.', session.offset)
+        yield part
+
+
+def lock_session(session):
+    """
+    Reload ``session`` under a row lock, held for a short transaction only
+    unless the caller is in one, and refuse it once finalized or deleted.
+    """
+    model = type(session)
+    try:
+        with transaction.atomic():
+            session = model.objects.select_for_update().get(pk=session.pk)
+    except model.DoesNotExist:
+        raise UploadError(
+            res_codes.PK_NOT_FOUND, 'Upload no longer exists.', session.offset)
+    return check_not_finalized(session)
+
+
+def check_not_finalized(session):
+    if session.course_file_id is not None:
+        raise UploadError(
+            res_codes.UPLOAD_SESSION_FINALIZED,
+            'Upload has already been finalized.', session.offset)
+    return session
+
+
+def part_unavailable(session):
+    return UploadError(
+        res_codes.UPLOAD_PART_UNAVAILABLE,
+        'Upload data received so far is not on this server.', session.offset)
+
+
+def section_gone(session):
+    return UploadError(
+        res_codes.PK_NOT_FOUND,
+        'Section of the upload no longer exists.', session.offset)
+
+
+def check_part_file(session, part):
+    """
+    The part file must hold exactly the ``offset`` bytes of the session.
+    A shorter one was lost or is on another host (part files are on local
+    disk), writing at the offset would leave a hole of zeros in the file.
+    Bytes past the offset were left by a write that never completed and
+    are cut off.
+    """
+    length = os.fstat(part.fileno()).st_size
+    if length < session.offset:
+        raise part_unavailable(session)
+    if length > session.offset:
+        part.truncate(session.offset)
+
+
+def write_chunk(session, offset, length, checksum, stream):
+    """
+    Append ``length`` bytes read from ``stream`` at ``offset`` to the part
+    file of ``session`` and return the session with its new offset.
+
+    The chunk is copied ``COPY_BUFFER_SIZE`` bytes at a time, so memory
+    does not depend on the chunk size. ``offset`` must be where the
+    session stands; a chunk that is cut short or does not match its
+    sha256 ``checksum`` is cut off the part file again, so the client
+    simply resends it. The session row is only locked to validate the
+    chunk and to move the offset, not while the chunk is read.
+    """
+    # finalized uploads do not get a part file again
+    check_not_finalized(session)
+    with open_part_file(session, create=True) as part:
+        # where the upload stands now that no other request writes it
+        session = lock_session(session)
+        if offset != session.offset:
+            raise UploadError(
+                res_codes.UPLOAD_OFFSET_MISMATCH,
+                'Chunk does not start at the upload offset.', session.offset)
+        if not 0 < length <= UPLOAD_CHUNK_MAX_SIZE or (
+                offset + length > session.size):
+            raise UploadError(
+                res_codes.INVALID_UPLOAD_CHUNK,
+                'Chunk length must be between 1 and {} bytes and end '
+                'within the file.'.format(UPLOAD_CHUNK_MAX_SIZE),
+                session.offset)
+        check_part_file(session, part)
+
+        digest = hashlib.sha256()
+        received = 0
+        part.seek(offset)
+        while received < length:
+            block = stream.read(min(COPY_BUFFER_SIZE, length - received))
+            if not block:
+                break
+            part.write(block)
+            digest.update(block)
+            received += len(block)
+        if received != length or digest.hexdigest() != checksum.lower():
+            part.truncate(offset)
+            raise UploadError(
+                res_codes.UPLOAD_CHECKSUM_MISMATCH,
+                'Chunk was incomplete or does not match its checksum.',
+                session.offset)
+        part.flush()
+
+        with transaction.atomic():
+            try:
+                session = lock_session(session)
+            except UploadError:
+                part.truncate(offset)
+                raise
+            # a chunk written on another host got there first
+            if session.offset != offset:
+                part.truncate(offset)
+                raise UploadError(
+                    res_codes.UPLOAD_OFFSET_MISMATCH,
+                    'Chunk does not start at the upload offset.',
+                    session.offset)
+            session.offset = offset + length
+            session.save(update_fields=['offset', 'last_modified_at'])
+    return session
+
+
+def commit_upload(session, course_file):
+    """
+    Move the complete part file of ``session`` into the storage as the
+    file of the unsaved ``course_file``, save both and drop the part file.
+
+    The file name comes from ``course_file_location`` through the field's
+    ``upload_to``, and the storage reads the part file in chunks, so large
+    files never sit in memory. The copy runs outside of any transaction;
+    should the session have been finalized or deleted meanwhile, the
+    stored file is deleted again.
+    """
+    check_not_finalized(session)
+    with open_part_file(session) as part:
+        session = lock_session(session)
+        if not session.is_complete:
+            raise UploadError(
+                res_codes.UPLOAD_INCOMPLETE,
+                'Upload is missing {} bytes.'.format(
+                    session.size - session.offset),
+                session.offset)
+        check_part_file(session, part)
+        if session.checksum and (
+                file_checksum(part_path(session)) != session.checksum.lower()):
+            raise UploadError(
+                res_codes.UPLOAD_CHECKSUM_MISMATCH,
+                'Uploaded file does not match its checksum.', session.offset)
+
+        try:
+            # the file name needs the section
+            course_file.section = CourseSection.objects.get(
+                pk=session.section_id)
+        except CourseSection.DoesNotExist:
+            raise section_gone(session)
+        part.seek(0)
+        course_file.file.save(session.filename, File(part), save=False)
+        try:
+            with transaction.atomic():
+                session = lock_session(session)
+                course_file.save()
+                session.course_file = course_file
+                session.save(update_fields=['course_file', 'last_modified_at'])
+        except UploadError:
+            course_file.file.delete(save=False)
+            raise
+        except IntegrityError:
+            course_file.file.delete(save=False)
+            raise section_gone(session)
+        remove_part_file(session)
+    return course_file
@@ -7,3 +7,33 @@ class StaticStorage(S3Boto3Storage):
 
 class MediaStorage(S3Boto3Storage):
     location = settings.MEDIAFILES_LOCATION
+
+    def presigned_upload(self, name, content_type=None, expires_in=None):
+        """
+        Return how a client can PUT ``name`` straight to the bucket: the
+        presigned URL, its method and the headers it was signed with
+        (which the client has to send as is).
+        """
+        params = {
+            'Bucket': self.bucket_name,
+            'Key': self._normalize_name(self._clean_name(name)),
+        }
+        headers = {}
+        if content_type:
+            params['ContentType'] = headers['Content-Type'] = content_type
+        cache_control = self.object_parameters.get('CacheControl')
+        if cache_control:
+            params['CacheControl'] = headers['Cache-Control'] = cache_control
+        if self.default_acl:
+            params['ACL'] = headers['x-amz-acl'] = self.default_acl
+        url = self.bucket.meta.client.generate_presigned_url(
+            'put_object',
+            Params=params,
+            ExpiresIn=expires_in,
+            HttpMethod='PUT',
+        )
+        return {
+            'url': url,
+            'method': 'PUT',
+            'headers': headers,
+        }
@@ -0,0 +1,11 @@
+from django.contrib import admin
+
+from .models import Job
+from utils.admin import CustomAdminFormMixin
+# Register your models here.
+
+
+@admin.register(Job)
+class JobAdmin(CustomAdminFormMixin, admin.ModelAdmin):
+    list_display = ('task', 'status', 'attempts', 'run_after')
+    list_filter = ('status', 'task')
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs import queue
+from utils.db import ping_connections
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs (media processing and the like).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='run the jobs that are due and exit instead of polling')
+        parser.add_argument(
+            '--sleep', type=float, default=2,
+            help='seconds to wait between polls when the queue is empty')
+        parser.add_argument(
+            '--max-jobs', type=int,
+            help='exit after running this many jobs')
+
+    def handle(self, *args, **options):
+        max_jobs = options['max_jobs']
+        total = 0
+        while max_jobs is None or total < max_jobs:
+            # a worker lives longer than CONN_MAX_AGE, recycle its
+            # connections between polls like requests do
+            close_old_connections()
+            ping_connections()
+            count = queue.work(
+                None if max_jobs is None else max_jobs - total)
+            total += count
+            if options['once']:
+                break
+            if not count:
+                time.sleep(options['sleep'])
+        if options['verbosity'] > 0:
+            self.stdout.write('Ran {} job(s).'.format(total))
@@ -0,0 +1,45 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import ugettext_lazy as _
+
+from utils.base_model import BaseModel
+# Create your models here.
+
+
+class Job(BaseModel):
+    """
+    A queued call of a registered task (see ``jobs.registry``), run by the
+    ``run_jobs`` worker outside of the request/response cycle.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, _('pending')),
+        (RUNNING, _('running')),
+        (DONE, _('done')),
+        (FAILED, _('failed')),
+    )
+
+    task = models.CharField(_('task'), max_length=128)
+    # JSON object, the keyword arguments of the task
+    payload = models.TextField(_('payload'), default='{}')
+    status = models.CharField(_('status'), max_length=16, choices=STATUSES,
+                              default=PENDING)
+    attempts = models.PositiveIntegerField(_('attempts'), default=0)
+    run_after = models.DateTimeField(_('run after'), default=timezone.now)
+    locked_at = models.DateTimeField(_('locked at'), null=True, blank=True)
+    last_error = models.TextField(_('last error'), blank=True, default='')
+
+    def __str__(self):
+        return "{} ({})".format(self.task, self.status)
+
+    class Meta:
+        ordering = ('run_after',)
+        indexes = [
+            # the worker polls for due jobs of a status
+            models.Index(
+                fields=['status', 'run_after'],
+                name='job_status_run_after_idx'),
+        ]
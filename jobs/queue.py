@@ -0,0 +1,125 @@
+import json
+import logging
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+from .registry import get_task
+
+logger = logging.getLogger(__name__)
+
+JOB_MAX_ATTEMPTS = getattr(settings, 'JOB_MAX_ATTEMPTS', 3)
+# first retry delay in seconds, doubled on every further attempt
+JOB_RETRY_DELAY = getattr(settings, 'JOB_RETRY_DELAY', 30)
+# a running job not done after this many seconds is taken to have lost
+# its worker and is run again
+JOB_LOCK_TIMEOUT = getattr(settings, 'JOB_LOCK_TIMEOUT', 30 * 60)
+
+
+def enqueue(task_name, **kwargs):
+    """
+    Queue a run of the task ``task_name`` with ``kwargs``.
+
+    The job is a row written in the caller's transaction, so it is only
+    seen by workers once the data it is about is committed, and it is
+    dropped with it on rollback.
+    """
+    get_task(task_name)
+    return Job.objects.create(
+        task=task_name,
+        payload=json.dumps(kwargs, cls=DjangoJSONEncoder),
+    )
+
+
+def enqueue_many(task_name, kwargs_list, batch_size=None):
+    """
+    Queue a run of the task ``task_name`` for every kwargs of
+    ``kwargs_list`` in a single ``bulk_create``, see ``enqueue``.
+    """
+    get_task(task_name)
+    return Job.objects.bulk_create([
+        Job(task=task_name, payload=json.dumps(kwargs, cls=DjangoJSONEncoder))
+        for kwargs in kwargs_list
+    ], batch_size=batch_size)
+
+
+def due_jobs(now):
+    stale = now - timedelta(seconds=JOB_LOCK_TIMEOUT)
+    return Job.objects.filter(
+        Q(status=Job.PENDING, run_after__lte=now) |
+        Q(status=Job.RUNNING, locked_at__lt=stale)
+    ).order_by('run_after', 'created_at')
+
+
+def claim_job(batch=10):
+    """
+    Claim the next due job for this worker and return it, None when no
+    job is due.
+
+    A job is claimed by an update conditioned on the state it was read
+    in; when another worker got there first no row is updated and the
+    next candidate is tried. This needs no row locks, so it works the
+    same on every database backend.
+    """
+    now = timezone.now()
+    for job in due_jobs(now)[:batch]:
+        claimed = Job.objects.filter(
+            pk=job.pk, status=job.status, attempts=job.attempts,
+        ).update(
+            status=Job.RUNNING,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            job.status = Job.RUNNING
+            job.locked_at = now
+            job.attempts += 1
+            return job
+    return None
+
+
+def run_job(job):
+    """
+    Run a claimed job and record the outcome. A failed job is retried
+    with an exponential delay until ``JOB_MAX_ATTEMPTS``, then left
+    ``failed`` with its traceback.
+    """
+    try:
+        get_task(job.task)(**json.loads(job.payload))
+    except Exception:
+        logger.exception('Job %s (%s) failed', job.pk, job.task)
+        job.last_error = traceback.format_exc()
+        if job.attempts < JOB_MAX_ATTEMPTS:
+            job.status = Job.PENDING
+            job.run_after = timezone.now() + timedelta(
+                seconds=JOB_RETRY_DELAY * 2 ** (job.attempts - 1))
+        else:
+            job.status = Job.FAILED
+    else:
+        job.status = Job.DONE
+        job.last_error = ''
+    job.locked_at = None
+    job.save(update_fields=[
+        'status', 'run_after', 'locked_at', 'last_error', 'last_modified_at',
+    ])
+    return job
+
+
+def work(max_jobs=None):
+    """
+    Run due jobs until none is left, or ``max_jobs`` have run, and return
+    how many ran.
+    """
+    count = 0
+    while max_jobs is None or count < max_jobs:
+        job = claim_job()
+        if job is None:
+            break
+        run_job(job)
+        count += 1
+    return count
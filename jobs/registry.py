@@ -0,0 +1,23 @@
+TASKS = {}
+
+
+def task(name):
+    """
+    Register the decorated function as the task ``name``. Tasks live in
+    the ``tasks`` module of an app, which is imported when Django starts.
+    Their keyword arguments go through JSON, so they take ids, not model
+    instances.
+    """
+    def decorator(func):
+        if name in TASKS and TASKS[name] is not func:
+            raise ValueError('Task "{}" is already registered.'.format(name))
+        TASKS[name] = func
+        return func
+    return decorator
+
+
+def get_task(name):
+    try:
+        return TASKS[name]
+    except KeyError:
+        raise LookupError('No task named "{}".'.format(name))
@@ -0,0 +1,100 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+
+from jobs import queue
+from jobs.models import Job
+from jobs.registry import task
+from utils.db import ping_connections
+
+calls = []
+
+
+@task('jobs.tests.record')
+def record(value):
+    calls.append(value)
+
+
+@task('jobs.tests.fail')
+def fail():
+    raise RuntimeError('boom')
+
+
+class JobQueueTest(TestCase):
+
+    def setUp(self):
+        del calls[:]
+
+    def test_worker_runs_queued_jobs(self):
+        queue.enqueue('jobs.tests.record', value=1)
+        queue.enqueue('jobs.tests.record', value=2)
+        self.assertEqual(calls, [])
+        self.assertEqual(queue.work(), 2)
+        self.assertEqual(calls, [1, 2])
+        self.assertEqual(
+            set(Job.objects.values_list('status', flat=True)), {Job.DONE})
+        self.assertEqual(queue.work(), 0)
+
+    def test_unknown_task_is_refused(self):
+        with self.assertRaises(LookupError):
+            queue.enqueue('jobs.tests.missing')
+
+    def test_job_is_claimed_once(self):
+        queue.enqueue('jobs.tests.record', value=1)
+        self.assertIsNotNone(queue.claim_job())
+        self.assertIsNone(queue.claim_job())
+
+    def test_failed_job_is_retried_then_given_up(self):
+        job = queue.enqueue('jobs.tests.fail')
+        for attempt in range(1, queue.JOB_MAX_ATTEMPTS + 1):
+            Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+            with self.assertLogs('jobs.queue', 'ERROR'):
+                self.assertEqual(queue.work(), 1)
+            job.refresh_from_db()
+            self.assertEqual(job.attempts, attempt)
+            self.assertIn('boom', job.last_error)
+        self.assertEqual(job.status, Job.FAILED)
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        self.assertEqual(queue.work(), 0)
+
+    def test_stale_running_job_is_run_again(self):
+        queue.enqueue('jobs.tests.record', value=1)
+        job = queue.claim_job()
+        self.assertIsNone(queue.claim_job())
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(
+                seconds=queue.JOB_LOCK_TIMEOUT + 1))
+        self.assertEqual(queue.work(), 1)
+        self.assertEqual(calls, [1])
+
+
+class ConnectionHealthCheckTest(TestCase):
+
+    def setUp(self):
+        connection.ensure_connection()
+        for patcher in (
+                mock.patch.dict(connection.settings_dict,
+                                {'CONN_HEALTH_CHECKS': True}),
+                # the test runs in a transaction, which is never pinged
+                mock.patch.object(connection, 'in_atomic_block', False),
+                mock.patch.object(connection, 'close')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def test_broken_connection_is_closed(self):
+        with mock.patch.object(connection, 'is_usable', return_value=False):
+            ping_connections()
+        connection.close.assert_called_once_with()
+
+    def test_usable_connection_is_kept(self):
+        ping_connections()
+        connection.close.assert_not_called()
+
+    def test_only_configured_databases_are_pinged(self):
+        connection.settings_dict['CONN_HEALTH_CHECKS'] = False
+        with mock.patch.object(connection, 'is_usable') as is_usable:
+            ping_connections()
+        is_usable.assert_not_called()
@@ -53,6 +53,7 @@ IN_HOUSE_APPS = [
     'account',
     'courses',
     'assignments',
+    'jobs',
 ]
 
 THIRD_PARTY_APPS = [
@@ -64,6 +65,10 @@ THIRD_PARTY_APPS = [
 INSTALLED_APPS = DEFAULT_APPS + IN_HOUSE_APPS + THIRD_PARTY_APPS
 
 MIDDLEWARE = [
+    'utils.metrics.MetricsMiddleware',
+    'utils.nplusone.NPlusOneMiddleware',
+    'utils.db.ConnectionHealthCheckMiddleware',
+    'utils.db.ReplicaStickinessMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -113,9 +118,83 @@ DATABASES = {
         'PASSWORD': os.getenv("SQL_PASSWORD"),
         'HOST': os.getenv("SQL_HOST"),
         'PORT': os.getenv("SQL_PORT"),
+        # keep connections open across requests, pinged before each
+        # request reuses them (utils.db)
+        'CONN_MAX_AGE': int(os.getenv("SQL_CONN_MAX_AGE", 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
+# read replica for the GET requests of ReplicaReadMixin views (utils.db)
+if os.getenv("SQL_REPLICA_HOST"):
+    DATABASES['replica'] = dict(
+        DATABASES['default'],
+        HOST=os.getenv("SQL_REPLICA_HOST"),
+        PORT=os.getenv("SQL_REPLICA_PORT", os.getenv("SQL_PORT")),
+        TEST={'MIRROR': 'default'},
+    )
+
+DATABASE_ROUTERS = ['utils.db.ReplicaRouter']
+REPLICA_DATABASES = [alias for alias in DATABASES if alias != 'default']
+# seconds a client that wrote reads from default, to see its own writes
+REPLICA_STICKY_SECONDS = 5
+REPLICA_STICKY_COOKIE = 'read_primary'
+
+
+# Cache
+# https://docs.djangoproject.com/en/1.11/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# versioned response cache (utils.cache), payloads are invalidated by
+# version bumps so the timeout only bounds how long unused entries linger
+RESPONSE_CACHE_ALIAS = 'default'
+RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# lifetime in seconds of direct upload tickets and URLs (utils.direct_upload)
+DIRECT_UPLOAD_EXPIRES = 15 * 60
+
+# resumable chunked uploads (courses.uploads), part files are kept on the
+# local disk of the web servers until the upload is finalized
+UPLOAD_SESSION_ROOT = os.path.join(BASE_DIR, 'uploads')
+UPLOAD_CHUNK_MAX_SIZE = 64 * 1024 * 1024
+
+# background jobs (jobs.queue), run by `manage.py run_jobs`
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = 30
+JOB_LOCK_TIMEOUT = 30 * 60
+
+# avatar renditions (account.avatars): edges in pixels, WEBP or JPEG; their
+# URLs go through utils.storage_urls like every other file URL
+AVATAR_RENDITION_SIZES = (64, 128, 256)
+AVATAR_RENDITION_FORMAT = 'WEBP'
+
+# entries of the in-process LRU cache of file URLs (utils.storage_urls)
+STORAGE_URL_CACHE_SIZE = 4096
+
+# role lookups for tokens without a role claim (utils.roles)
+ROLE_CACHE_ALIAS = 'default'
+ROLE_CACHE_TIMEOUT = 60
+
+# per-view request histograms (utils.metrics), scraped from
+# /api/internal/metrics with the METRICS_TOKEN bearer (or by INTERNAL_IPS
+# with DEBUG)
+METRICS_ENABLED = True
+METRICS_SLOW_QUERY_SECONDS = 0.5
+METRICS_TOKEN = os.getenv("METRICS_TOKEN")
+INTERNAL_IPS = ['127.0.0.1']
+
+# N+1 query detection (utils.nplusone): a SELECT shape repeated more than
+# NPLUSONE_THRESHOLD times in a request is logged, or raised with
+# NPLUSONE_RAISE; turned on by the staging and test settings
+NPLUSONE_ENABLED = False
+NPLUSONE_RAISE = False
+NPLUSONE_THRESHOLD = 5
+
 
 # Password validation
 # https://docs.djangoproject.com/en/1.11/ref/settings/#auth-password-validators
@@ -171,10 +250,14 @@ CORS_ALLOW_METHODS = (
 )
 
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_RENDERER_CLASSES': [
+        'utils.renderers.EnvelopeJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PAGINATION_CLASS': 'utils.pagination.KeysetPagination',
     'PAGE_SIZE': 10,
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'utils.authentication.RoleJWTAuthentication',
     ],
 }
 
@@ -12,6 +12,8 @@ STATIC_ROOT = os.path.join(BASE_DIR, "static")
 
 MEDIA_ROOT = os.path.join(BASE_DIR, "media")
 MEDIA_URL = '/media/'
+# local stand-in for the S3 media storage that can also serve direct uploads
+DEFAULT_FILE_STORAGE = 'utils.storage.DirectUploadFileSystemStorage'
 
 
 DBBACKUP_STORAGE = 'django.core.files.storage.FileSystemStorage'
@@ -35,6 +35,38 @@ DATABASES = {
                 	HOST=os.getenv("SQL_HOST"),
                 	PORT=os.getenv("PG_SQL_PORT"),
                 	DB_NAME=os.getenv("SQL_DB_NAME")
-                	)
+                	),
+                conn_max_age=int(os.getenv("SQL_CONN_MAX_AGE", 60)),
             )
 }
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
+# in-process connection pool (utils.postgresql_pool) for when no pgbouncer
+# sits in front of the database, connections go back to the pool after
+# every request instead of staying open
+if os.getenv("SQL_POOL_MAX_SIZE"):
+    DATABASES['default'].update({
+        'ENGINE': 'utils.postgresql_pool',
+        'CONN_MAX_AGE': 0,
+    })
+    DATABASES['default'].setdefault('OPTIONS', {})['pool'] = {
+        'min_size': int(os.getenv("SQL_POOL_MIN_SIZE", 1)),
+        'max_size': int(os.getenv("SQL_POOL_MAX_SIZE")),
+    }
+
+# read replica (utils.db), set up like the primary
+if os.getenv("REPLICA_DATABASE_URL"):
+    DATABASES['replica'] = dj_database_url.parse(
+        os.getenv("REPLICA_DATABASE_URL"),
+        conn_max_age=DATABASES['default']['CONN_MAX_AGE'],
+    )
+    DATABASES['replica'].update({
+        'ENGINE': DATABASES['default']['ENGINE'],
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': DATABASES['default'].get('OPTIONS', {}),
+        'TEST': {'MIRROR': 'default'},
+    })
+REPLICA_DATABASES = [alias for alias in DATABASES if alias != 'default']
+
+# log requests whose serializers fan out queries (utils.nplusone)
+NPLUSONE_ENABLED = True
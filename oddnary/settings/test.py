@@ -0,0 +1,30 @@
+from .development import *
+
+SECRET_KEY = os.getenv("SECRET_KEY", "oddnary-test-secret-key")
+
+# database
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
+        'CONN_MAX_AGE': 0,
+    },
+    # a database of its own rather than a mirror, so tests can tell which
+    # one a request read from
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.path.join(BASE_DIR, 'db_replica.sqlite3'),
+        'CONN_MAX_AGE': 0,
+    },
+}
+# off by default, turned on by the replica routing tests
+REPLICA_DATABASES = []
+
+PASSWORD_HASHERS = [
+    'django.contrib.auth.hashers.MD5PasswordHasher',
+]
+
+# fail tests whose requests fan out queries (utils.nplusone)
+NPLUSONE_ENABLED = True
+NPLUSONE_RAISE = True
+NPLUSONE_THRESHOLD = 3
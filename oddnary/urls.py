@@ -20,6 +20,8 @@ from django.contrib import admin
 # jwt import
 from rest_framework_simplejwt import views as jwt_views
 from rest_framework.documentation import include_docs_urls
+from utils.metrics import metrics_view
+from utils.storage import LocalUploadView
 
 
 urlpatterns = [
@@ -53,6 +55,16 @@ urlpatterns = [
         r'^api/assignments/',
         include('assignments.urls'),
     ),
+    url(
+        r'^api/uploads/local/(?P<token>[^/]+)/$',
+        LocalUploadView.as_view(),
+        name='local_upload',
+    ),
+    url(
+        r'^api/internal/metrics$',
+        metrics_view,
+        name='metrics',
+    ),
 ]
 
 
@@ -0,0 +1,99 @@
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.base import DEFERRED
+from django.utils.translation import ugettext_lazy as _
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .constants import ROLE_CLAIM, EMAIL_CLAIM, IS_ACTIVE_CLAIM
+from .denylist import token_denylist
+
+User = get_user_model()
+
+
+class RoleJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that keeps the role claim of the access token on the
+    authenticated user as ``token_role``, so role checks such as
+    ``utils.permissions.IsAdmin`` do not need to load the profile.
+
+    Revoked tokens (see ``utils.denylist``) are refused.
+    """
+
+    def get_validated_token(self, raw_token):
+        validated_token = super().get_validated_token(raw_token)
+        if token_denylist.is_revoked(validated_token):
+            raise InvalidToken(_('Token has been revoked'))
+        return validated_token
+
+    def get_user(self, validated_token):
+        user = super().get_user(validated_token)
+        user.token_role = validated_token.get(ROLE_CLAIM)
+        return user
+
+
+class StatelessJWTAuthentication(RoleJWTAuthentication):
+    """
+    Opt-in authentication that builds ``request.user`` from the token
+    claims (id, email, is_active, role) instead of querying the user.
+
+    The user is a real ``account.User`` instance with every other field
+    deferred, so it can be used in ORM filters and related lookups as is.
+    The first access to a deferred field loads all of them in one query.
+    Tokens issued without the claims fall back to the regular lookup.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            values = {
+                api_settings.USER_ID_FIELD:
+                    validated_token[api_settings.USER_ID_CLAIM],
+                'email': validated_token[EMAIL_CLAIM],
+                'is_active': validated_token[IS_ACTIVE_CLAIM],
+            }
+        except KeyError:
+            return super().get_user(validated_token)
+
+        if not values['is_active']:
+            raise AuthenticationFailed(
+                _('User is inactive'), code='user_inactive')
+
+        user = claims_user(values)
+        user.token_role = validated_token.get(ROLE_CLAIM)
+        return user
+
+
+def claims_user(values):
+    """
+    Return a ``User`` as if loaded from the database with only the given
+    field values, every other field deferred.
+    """
+    fields = User._meta.concrete_fields
+    user = User.from_db(
+        DEFAULT_DB_ALIAS,
+        [field.attname for field in fields],
+        [
+            field.to_python(values[field.attname])
+            if field.attname in values else DEFERRED
+            for field in fields
+        ],
+    )
+    user.refresh_from_db = _load_deferred(user)
+    return user
+
+
+def _load_deferred(user):
+    refresh_from_db = user.refresh_from_db
+
+    def load(using=None, fields=None):
+        # widen the single field a deferred attribute asks for to every
+        # deferred field, so touching the user costs one query, not one
+        # per attribute
+        deferred = user.get_deferred_fields()
+        if fields is not None and deferred:
+            fields = set(fields) | deferred
+        refresh_from_db(using=using, fields=fields)
+
+    return load
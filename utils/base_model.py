@@ -3,6 +3,7 @@ from uuid import uuid4
 # Django imports
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.utils.translation import ugettext_lazy as _
 
 User = get_user_model()
 
@@ -26,4 +27,19 @@ class BaseModel(models.Model):
     last_modified_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+
+class FileMetadataModel(models.Model):
+    """
+    Metadata of the ``file`` of a model, recorded by a background job
+    (``utils.media.record_file_metadata``) once the file is stored.
+    """
+    size = models.BigIntegerField(_('size'), null=True, blank=True)
+    checksum = models.CharField(_('checksum'), max_length=64, blank=True,
+                                default='')
+    content_type = models.CharField(_('content type'), max_length=128,
+                                    blank=True, default='')
+
+    class Meta:
+        abstract = True
@@ -0,0 +1,89 @@
+import time
+from threading import Lock
+
+from django.conf import settings
+from django.core.cache import caches
+
+
+RESPONSE_CACHE_ALIAS = getattr(settings, 'RESPONSE_CACHE_ALIAS', 'default')
+RESPONSE_CACHE_TIMEOUT = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60 * 60)
+
+
+class VersionedResponseCache(object):
+    """
+    Response payload cache invalidated through version counters.
+
+    Every payload is stored under a key that embeds the current version of
+    each scope it depends on (e.g. the whole catalog, or a single course).
+    Writers bump the version of the scopes they touch, so stale payloads
+    are never deleted, they simply stop being addressed and age out of the
+    backend. Only the cache API is used (get_many / add / incr / set), so
+    this works with locmem as well as with a Redis or memcached backend.
+    """
+
+    def __init__(self, namespace, alias=None, timeout=None):
+        self.namespace = namespace
+        self.alias = alias or RESPONSE_CACHE_ALIAS
+        self.timeout = timeout or RESPONSE_CACHE_TIMEOUT
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def cache(self):
+        return caches[self.alias]
+
+    def version_key(self, scope):
+        return 'rc:{}:version:{}'.format(self.namespace, scope)
+
+    def get_versions(self, scopes):
+        keys = [self.version_key(scope) for scope in scopes]
+        versions = self.cache.get_many(keys)
+        for key in keys:
+            if key not in versions:
+                # seed with the clock rather than 1 so an evicted counter
+                # can never come back at a value that was used before
+                self.cache.add(key, int(time.time() * 1000), None)
+                versions[key] = self.cache.get(key)
+        return [versions[key] for key in keys]
+
+    def bump(self, *scopes):
+        for scope in scopes:
+            key = self.version_key(scope)
+            try:
+                self.cache.incr(key)
+            except ValueError:
+                self.cache.add(key, int(time.time() * 1000), None)
+
+    def make_key(self, name, scopes, *parts):
+        versions = self.get_versions(scopes)
+        return 'rc:{}:{}:{}:{}'.format(
+            self.namespace,
+            name,
+            '.'.join(str(version) for version in versions),
+            ':'.join(str(part) for part in parts),
+        )
+
+    def get(self, key):
+        payload = self.cache.get(key)
+        with self._lock:
+            if payload is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+        return payload
+
+    def set(self, key, payload):
+        self.cache.set(key, payload, self.timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+            }
+
+    def reset_stats(self):
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
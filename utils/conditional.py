@@ -0,0 +1,163 @@
+import hashlib
+
+from django.conf import settings
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django.utils.http import http_date, parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+
+class NotModified(APIException):
+    status_code = status.HTTP_304_NOT_MODIFIED
+
+
+def aggregate_validators(querysets):
+    """
+    Return ``(Max(last_modified_at), Count(distinct pk))`` for each of the
+    given querysets, computed in a single UNION ALL query.
+    """
+    querysets = list(querysets)
+    results = [(None, 0)] * len(querysets)
+    selects = []
+    params = []
+    for position, queryset in enumerate(querysets):
+        try:
+            sql, sql_params = queryset.order_by().values(
+                validator_pk=F('pk'),
+                validator_modified=F('last_modified_at'),
+            ).query.sql_with_params()
+        except EmptyResultSet:
+            # ``pk__in=[]``, the rows of an empty page
+            continue
+        selects.append(
+            'SELECT %d, MAX(validator_modified), COUNT(DISTINCT validator_pk) '
+            'FROM (%s) validator_%d' % (position, sql, position)
+        )
+        params.extend(sql_params)
+    if not selects:
+        return results
+    with connections[querysets[0].db].cursor() as cursor:
+        cursor.execute(' UNION ALL '.join(selects), params)
+        for position, last, total in cursor.fetchall():
+            results[position] = (_to_datetime(last), total)
+    return results
+
+
+def _to_datetime(value):
+    # raw cursors hand back strings for datetimes on SQLite
+    if isinstance(value, str):
+        value = parse_datetime(value)
+    if value is not None and settings.USE_TZ and timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.utc)
+    return value
+
+
+class ConditionalGetMixin(object):
+    """
+    Adds strong ETag / Last-Modified validators to GET responses of an
+    APIView and answers a matching If-None-Match with 304 Not Modified.
+
+    The validators are computed in ``initial()``, right after authentication
+    and permission checks and before the handler runs, so a 304 never pays
+    for the main queries or for serialization. By default they are derived
+    from ``Max(last_modified_at)`` and ``Count(pk)`` over each queryset
+    returned by ``get_etag_querysets()`` (the count catches hard deletes,
+    the max catches updates and soft deletes). Paginated list views narrow
+    their querysets to the requested page with ``get_etag_page()``, so the
+    validators cost the rows of the page and not whole tables. Views that
+    already track their own versions can override ``get_validator_parts()``
+    instead. All querysets are aggregated in one round trip.
+
+    Only If-None-Match short-circuits the request: Last-Modified can not
+    see hard deletes, so If-Modified-Since alone is not trusted.
+    """
+    conditional_methods = ('GET', 'HEAD')
+
+    def get_etag_querysets(self):
+        """
+        Return the querysets whose rows the GET response is built from.
+        """
+        return []
+
+    def get_etag_page(self, queryset):
+        """
+        Narrow ``queryset`` to the rows ``pagination_class`` answers the
+        request with. The keys of the page are looked up in one query,
+        bounded by the page size, and hashed into the ETag with whether a
+        next page follows, so rows entering or leaving the page change it. Streamed responses
+        (``?stream=1``) hold every row, ``queryset`` is kept whole for them.
+        """
+        wants_stream = getattr(self, 'wants_stream', None)
+        if wants_stream is not None and wants_stream(self.request):
+            return queryset
+        keys, has_next = self.pagination_class().get_page_keys(
+            queryset, self.request)
+        self.etag_page_keys.extend(keys + [has_next])
+        return queryset.filter(pk__in=keys)
+
+    def get_validator_parts(self):
+        """
+        Return ``(parts, last_modified)`` where ``parts`` is a list of
+        values the ETag is hashed from.
+        """
+        parts = []
+        last_modified = None
+        self.etag_page_keys = []
+        for last, total in aggregate_validators(self.get_etag_querysets()):
+            parts.append(last)
+            parts.append(total)
+            if last and (last_modified is None or last > last_modified):
+                last_modified = last
+        parts.extend(self.etag_page_keys)
+        return parts, last_modified
+
+    def compute_etag(self, request, parts):
+        digest = hashlib.sha1()
+        user = getattr(request, 'user', None)
+        for value in [
+                self.__class__.__name__,
+                request.get_full_path(),
+                request.accepted_media_type,
+                getattr(user, 'pk', None),
+                ] + list(parts):
+            digest.update(str(value).encode('utf-8'))
+            digest.update(b'\x00')
+        return quote_etag(digest.hexdigest())
+
+    def initial(self, request, *args, **kwargs):
+        super(ConditionalGetMixin, self).initial(request, *args, **kwargs)
+        self.etag = None
+        self.last_modified = None
+        if request.method not in self.conditional_methods:
+            return
+        parts, self.last_modified = self.get_validator_parts()
+        self.etag = self.compute_etag(request, parts)
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if if_none_match:
+            etags = [
+                etag[2:] if etag.startswith('W/') else etag
+                for etag in parse_etags(if_none_match)
+            ]
+            if '*' in etags or self.etag in etags:
+                raise NotModified()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return Response(status=status.HTTP_304_NOT_MODIFIED)
+        return super(ConditionalGetMixin, self).handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super(ConditionalGetMixin, self).finalize_response(
+            request, response, *args, **kwargs)
+        if getattr(self, 'etag', None) and response.status_code in (
+                status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = self.etag
+            if self.last_modified is not None:
+                response['Last-Modified'] = http_date(
+                    self.last_modified.timestamp())
+        return response
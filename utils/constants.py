@@ -1,7 +1,16 @@
 
+SUBSCRIBER = 1
+INSTRUCTOR = 2
+ADMIN = 3
+
 ROLES = [
-       (1, "Subscriber"),
-       (2, "Instructor"),
-       (3, "Admin"),
+       (SUBSCRIBER, "Subscriber"),
+       (INSTRUCTOR, "Instructor"),
+       (ADMIN, "Admin"),
     ]
 
+# custom claims of the tokens issued at login, Profile.role and the user
+# fields utils.authentication.StatelessJWTAuthentication is built from
+ROLE_CLAIM = 'role'
+EMAIL_CLAIM = 'email'
+IS_ACTIVE_CLAIM = 'is_active'
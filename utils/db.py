@@ -0,0 +1,145 @@
+import random
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+_state = threading.local()
+
+
+def ping_connections():
+    """
+    Ping the open connections of this thread whose database has
+    ``CONN_HEALTH_CHECKS`` set and close the ones that do not answer, so
+    a persistent connection dropped by the server or a failover is
+    reopened by the next query instead of failing it.
+
+    Connections in a transaction are left alone.
+    """
+    for connection in connections.all():
+        if not connection.settings_dict.get('CONN_HEALTH_CHECKS'):
+            continue
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+        if not connection.is_usable():
+            connection.close()
+
+
+class ConnectionHealthCheckMiddleware(object):
+    """
+    Health check of persistent database connections (``CONN_MAX_AGE``)
+    before a request uses them. Connections past their age are already
+    closed by Django when the request starts.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        ping_connections()
+        return self.get_response(request)
+
+
+def get_replicas():
+    return getattr(settings, 'REPLICA_DATABASES', [])
+
+
+def get_sticky_cookie():
+    return getattr(settings, 'REPLICA_STICKY_COOKIE', 'read_primary')
+
+
+@contextmanager
+def read_from(alias):
+    """
+    Route the reads of this thread to the database ``alias``.
+    """
+    previous = getattr(_state, 'read_alias', None)
+    _state.read_alias = alias
+    try:
+        yield
+    finally:
+        _state.read_alias = previous
+
+
+class ReplicaRouter(object):
+    """
+    Sends reads to the replica picked for the current request by
+    ``ReplicaReadMixin``, all other reads and every write to ``default``.
+    Writes are noted, ``ReplicaStickinessMiddleware`` pins the client
+    that made them to ``default`` for a while.
+    """
+
+    def db_for_read(self, model, **hints):
+        return getattr(_state, 'read_alias', None) or DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replicas hold the rows of default
+        return True
+
+
+class ReplicaStickinessMiddleware(object):
+    """
+    Sets a cookie on responses to requests that wrote to the database.
+    While it lives (``REPLICA_STICKY_SECONDS``) the client reads from
+    ``default``, so it sees its own writes despite replication lag.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        _state.wrote = False
+        response = self.get_response(request)
+        if _state.wrote and get_replicas():
+            response.set_cookie(
+                get_sticky_cookie(), '1',
+                max_age=getattr(settings, 'REPLICA_STICKY_SECONDS', 5),
+                httponly=True,
+            )
+        return response
+
+
+def iter_from(alias, content):
+    # a streamed body is read after the view returned, route each chunk
+    # without leaving the thread routed between chunks
+    content = iter(content)
+    while True:
+        with read_from(alias):
+            chunk = next(content, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+class ReplicaReadMixin(object):
+    """
+    Runs GET / HEAD / OPTIONS requests of an APIView against one of
+    ``REPLICA_DATABASES``, unless the client carries the sticky cookie of
+    a recent write. Other methods, and every write, go to ``default``.
+    """
+
+    def get_read_alias(self, request):
+        replicas = get_replicas()
+        if (not replicas or request.method not in SAFE_METHODS or
+                request.COOKIES.get(get_sticky_cookie())):
+            return None
+        return random.choice(replicas)
+
+    def dispatch(self, request, *args, **kwargs):
+        alias = self.get_read_alias(request)
+        if alias is None:
+            return super(ReplicaReadMixin, self).dispatch(
+                request, *args, **kwargs)
+        with read_from(alias):
+            response = super(ReplicaReadMixin, self).dispatch(
+                request, *args, **kwargs)
+        if response.streaming:
+            response.streaming_content = iter_from(
+                alias, response.streaming_content)
+        return response
@@ -0,0 +1,80 @@
+import time
+from threading import Lock
+
+from rest_framework_simplejwt.settings import api_settings
+
+
+class TokenDenylist(object):
+    """
+    In-process record of revoked access tokens.
+
+    A single token is revoked by its ``jti``, and all tokens of a user
+    issued up to now are revoked by user id (on password change or
+    deactivation). Tokens carry no issue time, so it is derived from
+    ``exp`` minus the lifetime of the token type, access or refresh.
+    Entries are dropped once every token they cover has expired, which
+    keeps the record small.
+
+    The record lives in the memory of one process, so a revocation is
+    only seen by the worker that made it.
+    """
+
+    def __init__(self, lifetime=None, refresh_lifetime=None):
+        self.lifetime = (
+            lifetime or api_settings.ACCESS_TOKEN_LIFETIME).total_seconds()
+        self.refresh_lifetime = (
+            refresh_lifetime or api_settings.REFRESH_TOKEN_LIFETIME
+        ).total_seconds()
+        self._lock = Lock()
+        self._tokens = {}
+        self._users = {}
+        self._next_prune = 0
+
+    def revoke_token(self, token):
+        with self._lock:
+            self._tokens[token['jti']] = token['exp']
+
+    def revoke_user(self, user_id):
+        # "exp" only has second resolution: tokens issued within the
+        # revoking second are let through so a fresh login is never refused
+        now = int(time.time())
+        with self._lock:
+            self._users[str(user_id)] = now
+
+    def is_revoked(self, token):
+        now = time.time()
+        with self._lock:
+            self._prune(now)
+            if token.get('jti') in self._tokens:
+                return True
+            revoked_at = self._users.get(
+                str(token.get(api_settings.USER_ID_CLAIM)))
+        if revoked_at is None:
+            return False
+        return token['exp'] - self.token_lifetime(token) < revoked_at
+
+    def token_lifetime(self, token):
+        if token.get(api_settings.TOKEN_TYPE_CLAIM) == 'refresh':
+            return self.refresh_lifetime
+        return self.lifetime
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+            self._users.clear()
+
+    def _prune(self, now):
+        if now < self._next_prune:
+            return
+        self._next_prune = now + 60
+        for jti, exp in list(self._tokens.items()):
+            if exp <= now:
+                del self._tokens[jti]
+        # a user revocation also covers the refresh tokens issued before it
+        retention = max(self.lifetime, self.refresh_lifetime)
+        for user_id, revoked_at in list(self._users.items()):
+            if revoked_at + retention <= now:
+                del self._users[user_id]
+
+
+token_denylist = TokenDenylist()
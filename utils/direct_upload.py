@@ -0,0 +1,150 @@
+import os
+from uuid import uuid4
+
+from django.conf import settings
+from django.core import signing
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from .upload_location import clean_filename
+
+
+DIRECT_UPLOAD_EXPIRES = getattr(settings, 'DIRECT_UPLOAD_EXPIRES', 15 * 60)
+TICKET_SALT = 'utils.direct_upload.ticket'
+
+ALREADY_FINALIZED = 'Upload has already been finalized.'
+PARENT_GONE = 'The parent of the upload no longer exists.'
+
+
+def get_storage():
+    """
+    Return the storage uploads go to if it can hand out upload URLs
+    (``presigned_upload``), None otherwise.
+    """
+    if hasattr(default_storage, 'presigned_upload'):
+        return default_storage
+    return None
+
+
+class UploadTicketSerializer(serializers.Serializer):
+    """
+    Phase one of a direct upload.
+
+    Validates the parent row and the file name, picks the primary key and
+    storage name of the row to be, and returns a signed ticket together
+    with a URL the client PUTs the bytes to, straight to the storage.
+    Subclasses declare the parent field and name it in
+    ``Meta.parent_field``, next to ``Meta.model``. Only the base name of
+    ``filename`` is kept, the object always lands in the folder of its row.
+    """
+    filename = serializers.CharField(max_length=255)
+    content_type = serializers.CharField(max_length=255, required=False)
+
+    file_field = 'file'
+
+    def validate_filename(self, value):
+        filename = clean_filename(value)
+        if filename is None:
+            raise serializers.ValidationError('Invalid file name.')
+        return filename
+
+    def validate(self, attrs):
+        if get_storage() is None:
+            raise serializers.ValidationError(
+                'Direct uploads are not supported by the file storage.')
+        return attrs
+
+    def create(self, validated_data):
+        model = self.Meta.model
+        parent_field = self.Meta.parent_field
+        parent = validated_data[parent_field]
+        instance = model(id=uuid4(), **{parent_field: parent})
+        file_field = model._meta.get_field(self.file_field)
+        name = file_field.generate_filename(
+            instance, validated_data['filename'])
+        # the upload URL may only reach the folder of the row to be
+        folder = os.path.dirname(file_field.generate_filename(instance, 'file'))
+        if os.path.dirname(name) != folder:
+            raise serializers.ValidationError(
+                {'filename': ['Invalid file name.']})
+        ticket = signing.dumps({
+            'model': model._meta.label_lower,
+            'pk': str(instance.pk),
+            'parent': str(parent.pk),
+            'name': name,
+            'user': str(self.context['request'].user.pk),
+        }, salt=TICKET_SALT)
+        return {
+            'ticket': ticket,
+            'upload': get_storage().presigned_upload(
+                name,
+                content_type=validated_data.get('content_type'),
+                expires_in=DIRECT_UPLOAD_EXPIRES,
+            ),
+            'expires_in': DIRECT_UPLOAD_EXPIRES,
+        }
+
+    def to_representation(self, instance):
+        return instance
+
+
+class FinalizeUploadSerializer(serializers.ModelSerializer):
+    """
+    Phase two of a direct upload.
+
+    Checks the ticket issued in phase one, verifies that the object was
+    uploaded, and creates the row with the primary key, parent and file
+    name from the ticket. Subclasses list the remaining model fields in
+    ``Meta.fields`` (next to ``ticket``) and name the parent field in
+    ``Meta.parent_field``.
+
+    A finalize racing another one of the same ticket, or the deletion of
+    the parent, makes ``save()`` raise a ``ValidationError`` on ``ticket``.
+    """
+    ticket = serializers.CharField(write_only=True)
+
+    file_field = 'file'
+
+    def validate_ticket(self, value):
+        model = self.Meta.model
+        try:
+            ticket = signing.loads(
+                value, salt=TICKET_SALT, max_age=DIRECT_UPLOAD_EXPIRES)
+        except signing.SignatureExpired:
+            raise serializers.ValidationError('Upload ticket has expired.')
+        except signing.BadSignature:
+            raise serializers.ValidationError('Invalid upload ticket.')
+        if ticket['model'] != model._meta.label_lower or (
+                ticket['user'] != str(self.context['request'].user.pk)):
+            raise serializers.ValidationError('Invalid upload ticket.')
+        if model.objects.filter(pk=ticket['pk']).exists():
+            raise serializers.ValidationError(ALREADY_FINALIZED)
+        if not self.get_parent_model().objects.filter(
+                pk=ticket['parent']).exists():
+            raise serializers.ValidationError(PARENT_GONE)
+        if not default_storage.exists(ticket['name']):
+            raise serializers.ValidationError('Uploaded file not found.')
+        return ticket
+
+    def get_parent_model(self):
+        return self.Meta.model._meta.get_field(
+            self.Meta.parent_field).related_model
+
+    def create(self, validated_data):
+        model = self.Meta.model
+        ticket = validated_data.pop('ticket')
+        parent_field = model._meta.get_field(self.Meta.parent_field)
+        validated_data['id'] = ticket['pk']
+        validated_data[parent_field.attname] = ticket['parent']
+        validated_data[self.file_field] = ticket['name']
+        try:
+            with transaction.atomic():
+                return super().create(validated_data)
+        except IntegrityError:
+            # lost a race with the checks of validate_ticket()
+            if model.objects.filter(pk=ticket['pk']).exists():
+                message = ALREADY_FINALIZED
+            else:
+                message = PARENT_GONE
+            raise serializers.ValidationError({'ticket': [message]})
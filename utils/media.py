@@ -0,0 +1,101 @@
+import hashlib
+import mimetypes
+from io import BytesIO
+
+from django.core.files.base import ContentFile
+from django.utils import timezone
+
+# bytes read from the storage at a time while hashing
+METADATA_CHUNK_SIZE = 64 * 1024
+RENDITION_QUALITY = 85
+
+
+def _remembered(field_name):
+    return '_stored_{}_name'.format(field_name)
+
+
+def remember_file(instance, field_name='file'):
+    """
+    Note the name of the file ``field_name`` holds, for ``file_changed``.
+    Meant for ``post_init``, so it only reads the raw attribute.
+    """
+    value = instance.__dict__.get(field_name)
+    instance.__dict__[_remembered(field_name)] = getattr(value, 'name', value)
+
+
+def file_changed(instance, field_name='file', created=False):
+    """
+    True when ``instance`` holds a file other than the one it was loaded
+    or last saved with. Meant for ``post_save``, once the file is stored.
+    A row just ``created`` with a file always counts as changed, its name
+    may have been given to the constructor (direct uploads).
+    """
+    field_file = getattr(instance, field_name)
+    previous = instance.__dict__.get(_remembered(field_name))
+    remember_file(instance, field_name)
+    return bool(field_file) and (created or field_file.name != previous)
+
+
+def file_metadata(field_file):
+    """
+    Return the size, sha256 and MIME type of a stored file, read from the
+    storage in chunks. The MIME type is guessed from the file name.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    field_file.open('rb')
+    try:
+        for chunk in field_file.chunks(METADATA_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+    finally:
+        field_file.close()
+    content_type, _ = mimetypes.guess_type(field_file.name)
+    return {
+        'size': size,
+        'checksum': digest.hexdigest(),
+        'content_type': content_type or 'application/octet-stream',
+    }
+
+
+def record_file_metadata(model, pk, field_name='file'):
+    """
+    Compute the metadata of the file of row ``pk`` and store it with an
+    update, so no signal fires. The update only applies while the row
+    still holds the file that was read.
+    """
+    try:
+        instance = model.objects.only(field_name).get(pk=pk)
+    except model.DoesNotExist:
+        return
+    field_file = getattr(instance, field_name)
+    if not field_file:
+        return
+    metadata = file_metadata(field_file)
+    model.objects.filter(pk=pk, **{field_name: field_file.name}).update(
+        last_modified_at=timezone.now(), **metadata)
+
+
+def make_renditions(image_file, sizes, image_format='JPEG'):
+    """
+    Return ``{size: ContentFile}`` with ``image_file`` scaled to fit in
+    ``size`` x ``size`` pixels for each of ``sizes``, keeping its aspect
+    ratio. The image is decoded once, renditions are scaled from the
+    largest down.
+    """
+    from PIL import Image
+
+    renditions = {}
+    image_file.open('rb')
+    try:
+        with Image.open(image_file) as image:
+            if image.mode not in ('RGB', 'L'):
+                image = image.convert('RGB')
+            for size in sorted(sizes, reverse=True):
+                image.thumbnail((size, size), Image.LANCZOS)
+                output = BytesIO()
+                image.save(output, image_format, quality=RENDITION_QUALITY)
+                renditions[size] = ContentFile(output.getvalue())
+    finally:
+        image_file.close()
+    return renditions
@@ -0,0 +1,275 @@
+"""
+Per-view request metrics: in-process histograms labelled with the view
+class and HTTP method, exposed in the Prometheus text format.
+
+Each process keeps its own histograms; Prometheus scrapes every process
+(or the ``/api/internal/metrics`` of each worker) and sums them up.
+"""
+import bisect
+import logging
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db.backends.utils import CursorWrapper
+from django.http import Http404, HttpResponse
+from django.utils.crypto import constant_time_compare
+from rest_framework.serializers import BaseSerializer
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = getattr(settings, 'METRICS_ENABLED', True)
+# queries slower than this many seconds are logged with their view
+METRICS_SLOW_QUERY_SECONDS = getattr(
+    settings, 'METRICS_SLOW_QUERY_SECONDS', 0.5)
+# bearer token of the scraper, INTERNAL_IPS are let in with DEBUG only
+METRICS_TOKEN = getattr(settings, 'METRICS_TOKEN', None)
+
+METHODS = ('GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+SECONDS = (.005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10)
+COUNTS = (1, 2, 5, 10, 20, 50, 100, 200)
+BYTES = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+_state = threading.local()
+
+
+class Histogram(object):
+    """
+    Cumulative histogram per label set, as Prometheus defines it.
+    """
+
+    def __init__(self, name, documentation, buckets):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                # one count per bucket plus +Inf, and the sum
+                series = self._series[labels] = [
+                    [0] * (len(self.buckets) + 1), 0]
+            series[0][index] += 1
+            series[1] += value
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def expose(self):
+        lines = [
+            '# HELP {} {}'.format(self.name, self.documentation),
+            '# TYPE {} histogram'.format(self.name),
+        ]
+        with self._lock:
+            series = sorted(
+                (labels, list(counts), total)
+                for labels, (counts, total) in self._series.items())
+        for labels, counts, total in series:
+            label_text = ','.join(
+                '{}="{}"'.format(key, escape(value)) for key, value in labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + ('+Inf',), counts):
+                cumulative += count
+                lines.append('{}_bucket{{{},le="{}"}} {}'.format(
+                    self.name, label_text, bound, cumulative))
+            lines.append('{}_sum{{{}}} {}'.format(
+                self.name, label_text, repr(float(total))))
+            lines.append('{}_count{{{}}} {}'.format(
+                self.name, label_text, cumulative))
+        return '\n'.join(lines)
+
+
+def escape(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace(
+        '\n', r'\n')
+
+
+REQUEST_SECONDS = Histogram(
+    'oddnary_request_seconds', 'Request latency in seconds.', SECONDS)
+QUERY_COUNT = Histogram(
+    'oddnary_request_queries', 'SQL queries per request.', COUNTS)
+QUERY_SECONDS = Histogram(
+    'oddnary_request_query_seconds', 'SQL time per request in seconds.',
+    SECONDS)
+SERIALIZE_SECONDS = Histogram(
+    'oddnary_request_serialize_seconds',
+    'Serializer time per request in seconds.', SECONDS)
+RENDER_SECONDS = Histogram(
+    'oddnary_request_render_seconds',
+    'Response rendering time per request in seconds.', SECONDS)
+RESPONSE_BYTES = Histogram(
+    'oddnary_response_bytes', 'Response body size in bytes.', BYTES)
+
+HISTOGRAMS = (
+    REQUEST_SECONDS, QUERY_COUNT, QUERY_SECONDS, SERIALIZE_SECONDS,
+    RENDER_SECONDS, RESPONSE_BYTES,
+)
+
+
+@contextmanager
+def serialization_timer():
+    """
+    Add the time spent in the block to the serialization time of the
+    current request; nested blocks count once.
+    """
+    depth = getattr(_state, 'serialize_depth', 0)
+    _state.serialize_depth = depth + 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        _state.serialize_depth = depth
+        if depth == 0 and hasattr(_state, 'serialize_seconds'):
+            _state.serialize_seconds += time.perf_counter() - started
+
+
+def time_serializers():
+    """
+    Time ``BaseSerializer.data``, where every DRF serializer turns its
+    instance into primitives. Done once, on the first middleware set up.
+    """
+    if getattr(BaseSerializer, 'timed_by_metrics', False):
+        return
+    data = BaseSerializer.data
+
+    def timed_data(self):
+        with serialization_timer():
+            return data.fget(self)
+
+    BaseSerializer.data = property(timed_data)
+    BaseSerializer.timed_by_metrics = True
+
+
+def timed(execute):
+    def timed_execute(self, sql, *args):
+        queries = getattr(_state, 'queries', None)
+        if queries is None:
+            return execute(self, sql, *args)
+        started = time.perf_counter()
+        try:
+            return execute(self, sql, *args)
+        finally:
+            seconds = time.perf_counter() - started
+            queries[0] += 1
+            queries[1] += seconds
+            if seconds >= METRICS_SLOW_QUERY_SECONDS:
+                _state.slow_queries.append((seconds, sql))
+
+    return timed_execute
+
+
+def time_queries():
+    """
+    Count and time ``CursorWrapper.execute`` and ``executemany``, which
+    every ORM query goes through, for the request being recorded. Unlike
+    the debug cursor nothing is kept per query but the slow ones. Done
+    once, on the first middleware set up.
+    """
+    if getattr(CursorWrapper, 'timed_by_metrics', False):
+        return
+    CursorWrapper.execute = timed(CursorWrapper.execute)
+    CursorWrapper.executemany = timed(CursorWrapper.executemany)
+    CursorWrapper.timed_by_metrics = True
+
+
+def view_name(view_func):
+    view = getattr(view_func, 'view_class', view_func)
+    return '{}.{}'.format(view.__module__, view.__name__)
+
+
+class MetricsMiddleware(object):
+    """
+    Records, per view class and method, the latency, SQL query count and
+    time, serializer time, render time and response size of requests,
+    and logs queries slower than ``METRICS_SLOW_QUERY_SECONDS``.
+
+    Queries are counted and timed by a wrapper around the cursors' execute
+    methods (see ``time_queries()``). Streamed bodies are produced after
+    the middleware returns, so their queries, serialization and size are
+    not recorded.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if METRICS_ENABLED:
+            time_queries()
+            time_serializers()
+
+    def __call__(self, request):
+        if not METRICS_ENABLED:
+            return self.get_response(request)
+        started = time.perf_counter()
+        _state.serialize_seconds = 0.0
+        _state.render_seconds = 0.0
+        _state.view = '<unresolved>'
+        # count and seconds
+        queries = _state.queries = [0, 0.0]
+        _state.slow_queries = []
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.queries = None
+        self.record(request.method, _state.view, started, queries, response)
+        del _state.serialize_seconds
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if METRICS_ENABLED:
+            _state.view = view_name(view_func)
+
+    def process_template_response(self, request, response):
+        if METRICS_ENABLED:
+            started = time.perf_counter()
+
+            def rendered(response):
+                _state.render_seconds += time.perf_counter() - started
+
+            response.add_post_render_callback(rendered)
+        return response
+
+    def record(self, method, view, started, queries, response):
+        if method not in METHODS:
+            # clients choose the method, keep the label set bounded
+            method = 'other'
+        labels = (('method', method), ('view', view))
+        count, query_seconds = queries
+        for seconds, sql in _state.slow_queries:
+            logger.warning(
+                'Slow query (%.3fs) in %s %s: %s', seconds, method, view, sql)
+        QUERY_COUNT.observe(labels, count)
+        QUERY_SECONDS.observe(labels, query_seconds)
+        SERIALIZE_SECONDS.observe(labels, _state.serialize_seconds)
+        RENDER_SECONDS.observe(labels, _state.render_seconds)
+        if not response.streaming:
+            RESPONSE_BYTES.observe(labels, len(response.content))
+        REQUEST_SECONDS.observe(labels, time.perf_counter() - started)
+
+
+def expose():
+    return '\n'.join(histogram.expose() for histogram in HISTOGRAMS) + '\n'
+
+
+def metrics_view(request):
+    """
+    The histograms in the Prometheus text format, for requests with the
+    ``METRICS_TOKEN`` bearer token. Requests from ``INTERNAL_IPS`` are let
+    in with ``DEBUG`` only: behind a reverse proxy on the same host every
+    request comes from 127.0.0.1.
+    """
+    authorization = request.META.get('HTTP_AUTHORIZATION', '')
+    allowed = bool(METRICS_TOKEN) and constant_time_compare(
+        authorization, 'Bearer {}'.format(METRICS_TOKEN))
+    if settings.DEBUG and request.META.get('REMOTE_ADDR') in getattr(
+            settings, 'INTERNAL_IPS', ()):
+        allowed = True
+    if not allowed:
+        raise Http404
+    return HttpResponse(
+        expose(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,155 @@
+"""
+N+1 query detection: the SELECTs run while serving a request are
+fingerprinted by their SQL shape, and a shape repeated more than
+``NPLUSONE_THRESHOLD`` times is reported with the view and the
+serializer field that ran it.
+"""
+import logging
+import re
+import sys
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.utils import CursorWrapper
+from rest_framework.fields import Field
+
+from .metrics import view_name
+
+logger = logging.getLogger(__name__)
+
+NPLUSONE_ENABLED = getattr(settings, 'NPLUSONE_ENABLED', False)
+# raise NPlusOneError instead of logging a warning, for the test suite
+NPLUSONE_RAISE = getattr(settings, 'NPLUSONE_RAISE', False)
+NPLUSONE_THRESHOLD = getattr(settings, 'NPLUSONE_THRESHOLD', 5)
+
+# placeholders of an IN list, their number depends on the rows
+IN_LIST = re.compile(r'IN \(%s(?:, %s)*\)')
+FIELD_METHODS = ('to_representation', 'get_attribute')
+
+_state = threading.local()
+
+
+class NPlusOneError(Exception):
+    pass
+
+
+def fingerprint(sql):
+    """
+    Shape of a query as Django hands it to the cursor, parameters are
+    still ``%s`` placeholders.
+    """
+    return IN_LIST.sub('IN (...)', sql)
+
+
+def field_label(field):
+    return '{}.{}'.format(type(field.parent).__name__, field.field_name)
+
+
+def serializer_field():
+    """
+    The serializer field being rendered by the current thread, found on
+    the stack. Unbound serializers (``Serializer(..., many=True).data``
+    inside a ``get_<name>`` method) and list children have no field name
+    and are skipped, the field they render for is further out.
+    """
+    frame = sys._getframe(1)
+    while frame is not None:
+        field = frame.f_locals.get('self')
+        if (frame.f_code.co_name in FIELD_METHODS and
+                isinstance(field, Field) and field.field_name):
+            return field_label(field)
+        frame = frame.f_back
+    return None
+
+
+def observe(sql):
+    if sql.lstrip()[:6].upper() != 'SELECT':
+        return
+    shape = fingerprint(sql)
+    seen = _state.shapes.get(shape)
+    if seen is None:
+        _state.shapes[shape] = [1, None]
+        return
+    seen[0] += 1
+    if seen[1] is None:
+        # only repeated shapes pay for the stack walk
+        seen[1] = serializer_field()
+
+
+def watch_cursors():
+    """
+    Observe ``CursorWrapper.execute``, which every ORM query goes through,
+    debug cursor or not. Done once, on the first middleware set up.
+    """
+    if getattr(CursorWrapper, 'watched_by_nplusone', False):
+        return
+    execute = CursorWrapper.execute
+
+    def watched_execute(self, sql, params=None):
+        if getattr(_state, 'shapes', None) is not None:
+            observe(sql)
+        return execute(self, sql, params)
+
+    CursorWrapper.execute = watched_execute
+    CursorWrapper.watched_by_nplusone = True
+
+
+def report(view, shapes):
+    for shape, (count, field) in shapes.items():
+        if count <= NPLUSONE_THRESHOLD:
+            continue
+        if NPLUSONE_RAISE:
+            raise NPlusOneError(
+                'N+1 query in {} ({}), {} times: {}'.format(
+                    view, field, count, shape))
+        logger.warning(
+            'N+1 query in %s (%s), %d times: %s', view, field, count, shape,
+            extra={
+                'view': view,
+                'serializer_field': field,
+                'count': count,
+                'sql': shape,
+            })
+
+
+@contextmanager
+def detect(view=None):
+    """
+    Report the query shapes repeated in the block, as the middleware does
+    for a request. ``view`` labels the report, the middleware sets it once
+    the URL is resolved.
+    """
+    watch_cursors()
+    previous = getattr(_state, 'shapes', None), getattr(_state, 'view', None)
+    shapes = _state.shapes = {}
+    _state.view = view
+    try:
+        yield
+        view = _state.view
+    finally:
+        _state.shapes, _state.view = previous
+    report(view, shapes)
+
+
+class NPlusOneMiddleware(object):
+    """
+    Runs each request under ``detect()``. Off unless ``NPLUSONE_ENABLED``;
+    streamed bodies are rendered after the middleware returns and are not
+    covered.
+    """
+
+    def __init__(self, get_response):
+        if not NPLUSONE_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        watch_cursors()
+
+    def __call__(self, request):
+        with detect('<unresolved>'):
+            response = self.get_response(request)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        _state.view = view_name(view_func)
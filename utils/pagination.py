@@ -0,0 +1,171 @@
+import base64
+import binascii
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+from . import res_codes
+
+
+NEXT = 'next'
+KEYSET_ORDERING = ('-created_at', '-id')
+
+
+def keyset_filter(queryset, ordering, position):
+    """
+    Filter ``queryset``, ordered by the columns of ``ordering``, down to
+    the rows that come after the row whose columns hold ``position``.
+    """
+    after = Q()
+    equal = {}
+    for field, value in zip(ordering, position):
+        name = field.lstrip('-')
+        lookup = '{}__{}'.format(name, 'lt' if field.startswith('-') else 'gt')
+        after |= Q(**equal) & Q(**{lookup: value})
+        equal[name] = value
+    return queryset.filter(after)
+
+
+def keyset_after(queryset, created_at, pk):
+    """
+    Filter ``queryset``, ordered by ``KEYSET_ORDERING``, down to the rows
+    that come after the row at ``(created_at, pk)``.
+    """
+    return keyset_filter(queryset, KEYSET_ORDERING, (created_at, pk))
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over ``(created_at, id)``, newest first.
+    Subclasses may seek over other columns by setting ``ordering``; it has
+    to end with a unique column.
+
+    Both columns come from ``BaseModel`` (and ``account.User``), and ``id``
+    breaks ties between rows created in the same microsecond, so cursors
+    stay stable while rows are inserted. Every page is a single
+    ``WHERE (created_at, id) < cursor ORDER BY created_at DESC, id DESC
+    LIMIT n + 1`` query, so the cost does not depend on how deep the
+    client has paged.
+
+    The ``next`` link is added to the ``res_codes`` envelope next to
+    ``data``; it is relative so that cached envelopes stay host agnostic.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = api_settings.PAGE_SIZE or 10
+    max_page_size = 100
+    ordering = KEYSET_ORDERING
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_position(self, row):
+        names = [field.lstrip('-') for field in self.ordering]
+        if isinstance(row, dict):
+            # ``values()`` rows, see utils.projection
+            return [row[name] for name in names]
+        return [
+            getattr(row, row._meta.get_field(name).attname) for name in names
+        ]
+
+    def encode_cursor(self, row):
+        position = '|'.join(
+            value.isoformat() if hasattr(value, 'isoformat') else str(value)
+            for value in self.get_position(row)
+        )
+        return base64.urlsafe_b64encode(position.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            position = base64.urlsafe_b64decode(encoded.encode('ascii'))
+            values = position.decode('ascii').split('|')
+            if len(values) != len(self.ordering):
+                raise ValueError(position)
+            return tuple(
+                model._meta.get_field(field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, values)
+            )
+        except (binascii.Error, TypeError, ValueError, UnicodeError,
+                ValidationError):
+            raise NotFound(
+                res_codes.get_response_dict(
+                    res_codes.INVALID_CURSOR
+                )
+            )
+
+    def get_page_queryset(self, queryset, request):
+        """
+        ``queryset`` sliced to the rows of the requested page, plus the
+        first row of the next one, which tells whether there is a next page.
+        """
+        position = self.decode_cursor(request, queryset.model)
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = keyset_filter(queryset, self.ordering, position)
+        return queryset[:self.get_page_size(request) + 1]
+
+    def get_page_keys(self, queryset, request):
+        """
+        Return ``(keys, has_next)``: the primary keys of the rows
+        ``paginate_queryset`` answers ``request`` with, found in one query,
+        and whether there is a next page.
+        """
+        page_size = self.get_page_size(request)
+        keys = list(self.get_page_queryset(
+            queryset, request).values_list('pk', flat=True))
+        return keys[:page_size], len(keys) > page_size
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        rows = list(self.get_page_queryset(queryset, request))
+        self.has_next = len(rows) > page_size
+        rows = rows[:page_size]
+        self.next_cursor = self.encode_cursor(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        return replace_query_param(
+            self.request.get_full_path(),
+            self.cursor_query_param,
+            self.next_cursor,
+        )
+
+    def get_paginated_data(self, data):
+        """
+        ``data`` is a ``res_codes`` envelope, the next link is added to it.
+        """
+        data[NEXT] = self.get_next_link()
+        return data
+
+    def get_paginated_response(self, data):
+        return Response(
+            self.get_paginated_data(data),
+            status=status.HTTP_200_OK,
+        )
+
+
+class CourseIndexPagination(KeysetPagination):
+    """
+    Rows of a course in ``index`` order, for the models ordered by
+    ``('course', 'index')`` (sections, assignments), rather than newest
+    first.
+    """
+    ordering = ('course_id', 'index', 'id')
@@ -2,14 +2,19 @@ from rest_framework.permissions import BasePermission
 from rest_framework.exceptions import PermissionDenied
 
 from . import res_codes
+from .constants import ADMIN
+from .roles import get_user_role
 
 class IsAdmin(BasePermission):
     message = 'You are not allowed to view this page.'
     """
     Admin only
+
+    The role comes from the access token claim, or from the role cache
+    for tokens issued without one, never from a profile query per request.
     """
     def has_permission(self, request, view):
-        if not int(request.user.profile.role) == 3:
+        if get_user_role(request.user) != ADMIN:
             raise PermissionDenied(
                 res_codes.get_response_dict(res_codes.NO_ACCESS)
             )
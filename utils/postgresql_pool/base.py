@@ -0,0 +1,58 @@
+"""
+PostgreSQL backend taking its connections from an in-process psycopg2
+pool, for deployments without pgbouncer in front of the database.
+
+    'ENGINE': 'utils.postgresql_pool',
+    'CONN_MAX_AGE': 0,
+    'OPTIONS': {'pool': {'min_size': 1, 'max_size': 10}},
+
+Closing a connection hands it back to the pool, rolled back if needed,
+so keep ``CONN_MAX_AGE`` at 0. ``max_size`` bounds the connections of one
+process and must be at least its number of threads.
+"""
+import os
+import threading
+
+from django.db.backends.postgresql import base
+from psycopg2 import pool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    def get_connection_params(self):
+        conn_params = super().get_connection_params()
+        conn_params.pop('pool', None)
+        return conn_params
+
+    def get_pool(self, conn_params):
+        # a forked worker must not share the sockets of its parent
+        key = (os.getpid(), self.alias)
+        with _pools_lock:
+            if key not in _pools:
+                options = self.settings_dict['OPTIONS'].get('pool', {})
+                _pools[key] = pool.ThreadedConnectionPool(
+                    options.get('min_size', 1),
+                    options.get('max_size', 10),
+                    **conn_params)
+            return _pools[key]
+
+    def get_new_connection(self, conn_params):
+        connection = self.get_pool(conn_params).getconn()
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.get_pool(self.get_connection_params()).putconn(
+                    self.connection, close=bool(self.connection.closed))
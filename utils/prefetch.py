@@ -0,0 +1,45 @@
+
+class PrefetchPlan(object):
+    """
+    Describes the relations a serializer tree reads so that a queryset can
+    load all of them up front.
+
+    ``select_related`` covers forward FK / one-to-one hops that are joined
+    into the main query, ``prefetch_related`` covers reverse and many
+    relations (plain lookups or ``Prefetch`` objects), each of which costs
+    exactly one extra query no matter how many rows the main query returns.
+    """
+
+    def __init__(self, select_related=(), prefetch_related=()):
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+
+    @property
+    def query_count(self):
+        """
+        Number of queries needed to evaluate a queryset with this plan
+        applied (one for the main query plus one per prefetch level).
+        """
+        levels = set()
+        for lookup in self.prefetch_related:
+            path = getattr(lookup, 'prefetch_through', lookup)
+            parts = path.split('__')
+            for depth in range(1, len(parts) + 1):
+                levels.add('__'.join(parts[:depth]))
+        return 1 + len(levels)
+
+    def extend(self, select_related=(), prefetch_related=()):
+        """
+        Return a new plan with the given lookups appended.
+        """
+        return PrefetchPlan(
+            self.select_related + tuple(select_related),
+            self.prefetch_related + tuple(prefetch_related),
+        )
+
+    def apply(self, queryset):
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        return queryset
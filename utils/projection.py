@@ -0,0 +1,139 @@
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import serializers
+
+from .metrics import serialization_timer
+
+
+# DRF fields whose representation is the value ``values()`` reads
+PASSTHROUGH_FIELDS = (
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.IntegerField,
+    serializers.FloatField,
+)
+
+
+def get_converter(field):
+    """
+    Function turning a column value into the representation of the DRF
+    ``field``, None when the value is used as it is.
+    """
+    if isinstance(field, PASSTHROUGH_FIELDS):
+        return None
+    if isinstance(field, serializers.UUIDField) and (
+            field.uuid_format == 'hex_verbose'):
+        return str
+    return field.to_representation
+
+
+class ValuesProjection(object):
+    """
+    Renders what a read-only ``serializer_class`` renders, from rows read
+    with ``values()`` instead of model instances.
+
+    The fields of the serializer are compiled once per class into
+    ``(name, column, converter)``; rendering a row is then a dict built
+    from those, with no model instance and no DRF field lookup per row.
+    Fields that do not map to a column of the model are filled by a
+    ``project_<name>(rows)`` method returning one value per row, reading
+    the ``extra_columns`` the subclass asks for.
+
+    It is used like the serializer on a many=True read: ``values()``
+    builds the queryset, ``data`` renders it, so it also plugs into
+    ``KeysetPagination`` and ``StreamingListMixin``. Passing the same
+    ``fields`` to both reads and renders only those fields.
+    """
+    serializer_class = None
+    # more ``values()`` lookups, read for project_<name> or for pagination
+    extra_columns = ()
+    # lookups only read by project_<name>, selected when <name> is rendered
+    project_columns = {}
+
+    def __init__(self, instance=None, many=True, context=None, fields=None):
+        self.instance = instance
+        self.context = context or {}
+        self.fields = fields
+
+    @classmethod
+    def get_mapping(cls):
+        mapping = cls.__dict__.get('_mapping')
+        if mapping is None:
+            mapping = cls._mapping = tuple(cls.compile())
+        return mapping
+
+    @classmethod
+    def compile(cls):
+        for name, field in cls.serializer_class().fields.items():
+            if field.write_only:
+                continue
+            if hasattr(cls, 'project_{}'.format(name)):
+                yield name, None, None
+            elif isinstance(field, (
+                    serializers.SerializerMethodField,
+                    serializers.BaseSerializer)) or (
+                    field.source == '*' or '.' in field.source):
+                raise ImproperlyConfigured(
+                    '{}.{} does not map to a column, define project_{}().'
+                    .format(cls.__name__, name, name))
+            else:
+                yield name, field.source, get_converter(field)
+
+    @classmethod
+    def get_field_names(cls):
+        return [name for name, _, _ in cls.get_mapping()]
+
+    @classmethod
+    def select(cls, fields=None):
+        """
+        The mapping of ``fields`` only, in field order; all of it for None.
+        """
+        mapping = cls.get_mapping()
+        if fields is None:
+            return mapping
+        return tuple(entry for entry in mapping if entry[0] in fields)
+
+    @classmethod
+    def get_columns(cls, fields=None):
+        mapping = cls.select(fields)
+        columns = [column for _, column, _ in mapping if column]
+        extra = list(cls.extra_columns)
+        for name, column, _ in mapping:
+            if column is None:
+                extra.extend(cls.project_columns.get(name, ()))
+        for column in extra:
+            if column not in columns:
+                columns.append(column)
+        return columns
+
+    @classmethod
+    def values(cls, queryset, fields=None):
+        return queryset.values(*cls.get_columns(fields))
+
+    def to_representation(self, rows):
+        mapping = self.select(self.fields)
+        items = []
+        for row in rows:
+            item = {}
+            for name, column, convert in mapping:
+                if column is None:
+                    # keeps the key at its place in the field order
+                    item[name] = None
+                    continue
+                value = row[column]
+                if value is not None and convert is not None:
+                    value = convert(value)
+                item[name] = value
+            items.append(item)
+        for name, column, _ in mapping:
+            if column is not None:
+                continue
+            values = getattr(self, 'project_{}'.format(name))(rows)
+            for item, value in zip(items, values):
+                item[name] = value
+        return items
+
+    @property
+    def data(self):
+        rows = list(self.instance)
+        with serialization_timer():
+            return self.to_representation(rows)
@@ -0,0 +1,35 @@
+import json
+
+from rest_framework.renderers import JSONRenderer
+
+from .res_codes import STATUS_CODE, MESSAGE
+
+
+class EnvelopeJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` that writes the ``code`` / ``msg`` head of a
+    ``res_codes`` envelope from its pre-encoded prefix and only encodes
+    the rest (``data``, ``next``, ...).
+
+    Anything else, or an envelope whose head was changed, is rendered by
+    ``JSONRenderer`` as usual, and so is indented output.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        envelope = getattr(data, 'envelope', None)
+        if envelope is None or (
+                data.get(STATUS_CODE) != envelope.code or
+                data.get(MESSAGE) != envelope.msg or
+                self.get_indent(accepted_media_type, renderer_context or {})):
+            return super().render(
+                data, accepted_media_type, renderer_context)
+        parts = [envelope.prefix]
+        for key, value in data.items():
+            if key in (STATUS_CODE, MESSAGE):
+                continue
+            parts.append(b',' + json.dumps(key).encode('utf-8') + b':')
+            parts.append(
+                super().render(value, accepted_media_type, renderer_context)
+                if value is not None else b'null')
+        parts.append(b'}')
+        return b''.join(parts)
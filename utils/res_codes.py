@@ -1,6 +1,10 @@
 __author__ = 'viv3kshukla@gmail.com'
 
-from copy import copy
+import json
+from collections import namedtuple
+
+from rest_framework import status
+from rest_framework.response import Response
 
 
 STATUS = "status"
@@ -8,6 +12,43 @@ STATUS_CODE = "code"
 MESSAGE = "msg"
 DATA = 'data'
 
+
+class Envelope(namedtuple('Envelope', ['code', 'msg', 'status', 'prefix'])):
+    """
+    The fixed part of a response: ``code``, ``msg``, the HTTP ``status``
+    that goes with them, and ``prefix``, the JSON of the first two as
+    UTF-8 bytes without the closing brace, which
+    ``utils.renderers.EnvelopeJSONRenderer`` writes as it is.
+    """
+    __slots__ = ()
+
+    def as_dict(self, data=None, substitute=None):
+        response_data = ResponseDict({
+            STATUS_CODE: self.code,
+            MESSAGE: self.msg % substitute if substitute else self.msg,
+        })
+        response_data.envelope = None if substitute else self
+        if data is not None:
+            response_data[DATA] = data
+        return response_data
+
+
+class ResponseDict(dict):
+    """
+    The body of a response, a plain dict that remembers the ``Envelope``
+    it was built from (None once its message was substituted).
+    """
+    envelope = None
+
+
+def make_envelope(lookup, msg, http_status):
+    code = int(lookup)
+    prefix = json.dumps(
+        {STATUS_CODE: code, MESSAGE: msg},
+        ensure_ascii=False, separators=(',', ':'),
+    )[:-1].encode('utf-8')
+    return Envelope(code, msg, http_status, prefix)
+
 INVALID_POST_DATA = "1000"
 NO_ACCESS = "1001"
 NOT_FOUND = "1002"
@@ -15,8 +56,11 @@ LOGIN_SUCCESS = "1003"
 WRONG_PASSWORD_ENTERED = "1004"
 PASSWORD_UPDATE_SUCCESS = "1005"
 USER_PROFILE_UPDATED = "1006"
+INVALID_CURSOR = "1007"
+INVALID_QUERY_PARAMS = "1008"
 
 SUCCESS = "2000"
+UPLOAD_TICKET_ISSUED = "2002"
 COURSE_CREATED = "3000"
 COURSE_UPDATED = "3001"
 COURSE_DELETED = "3002"
@@ -36,6 +80,16 @@ COURSE_DETAIL_TAB_LIST_DELETED = "3015"
 COURSE_NOT_FOUND_FOR_USER = "3016"
 USER_ADDED_COURSE = "3017"
 USER_DELETED_COURSE = "3018"
+COURSE_IMPORTED = "3019"
+UPLOAD_SESSION_CREATED = "3020"
+UPLOAD_CHUNK_RECEIVED = "3021"
+UPLOAD_OFFSET_MISMATCH = "3022"
+UPLOAD_CHECKSUM_MISMATCH = "3023"
+INVALID_UPLOAD_CHUNK = "3024"
+UPLOAD_INCOMPLETE = "3025"
+UPLOAD_SESSION_FINALIZED = "3026"
+UPLOAD_PART_UNAVAILABLE = "3027"
+UPLOAD_TARGET_EXISTS = "3028"
 ASSIGNMENT_CREATED = "5000"
 ASSIGNMENT_UPDATED = "5001"
 ASSIGNMENT_DELETED = "5002"
@@ -63,201 +117,212 @@ SIGNUP_SUCCESS = "2001"
 ############################################################################
 
 RESPONSE_LOOKUP = {
-    INVALID_POST_DATA: {
-        STATUS_CODE: int(INVALID_POST_DATA),
-        MESSAGE: "Invalid post data provided"
-    },
-    NO_ACCESS: {
-        STATUS_CODE: int(NO_ACCESS),
-        MESSAGE: "You don't have authorization access to use this page"
-    },
-    NOT_FOUND: {
-        STATUS_CODE: int(NOT_FOUND),
-        MESSAGE: "Requested entity not found"
-    },
-    LOGIN_SUCCESS: {
-        STATUS_CODE: int(LOGIN_SUCCESS),
-        MESSAGE: "Login authentication is successful"
-    },
+    INVALID_POST_DATA: make_envelope(
+        INVALID_POST_DATA, "Invalid post data provided",
+        status.HTTP_400_BAD_REQUEST),
+    NO_ACCESS: make_envelope(
+        NO_ACCESS, "You don't have authorization access to use this page",
+        status.HTTP_403_FORBIDDEN),
+    NOT_FOUND: make_envelope(
+        NOT_FOUND, "Requested entity not found",
+        status.HTTP_404_NOT_FOUND),
+    LOGIN_SUCCESS: make_envelope(
+        LOGIN_SUCCESS, "Login authentication is successful",
+        status.HTTP_200_OK),
+    INVALID_CURSOR: make_envelope(
+        INVALID_CURSOR, "Invalid pagination cursor",
+        status.HTTP_404_NOT_FOUND),
+    INVALID_QUERY_PARAMS: make_envelope(
+        INVALID_QUERY_PARAMS, "Invalid query parameters provided",
+        status.HTTP_400_BAD_REQUEST),
 
 
-    SUCCESS: {
-        STATUS_CODE: int(SUCCESS),
-        MESSAGE: "Request processed successfully"
-    },
-    PK_NOT_FOUND: {
-        STATUS_CODE: int(PK_NOT_FOUND),
-        MESSAGE: "Such pk not found"
-    },
+    SUCCESS: make_envelope(
+        SUCCESS, "Request processed successfully",
+        status.HTTP_200_OK),
+    PK_NOT_FOUND: make_envelope(
+        PK_NOT_FOUND, "Such pk not found",
+        status.HTTP_400_BAD_REQUEST),
+    UPLOAD_TICKET_ISSUED: make_envelope(
+        UPLOAD_TICKET_ISSUED, "Upload ticket issued",
+        status.HTTP_201_CREATED),
     # account
-    SIGNUP_SUCCESS: {
-        STATUS_CODE: int(SIGNUP_SUCCESS),
-        MESSAGE: "Account created successfully"
-    },
-    WRONG_PASSWORD_ENTERED: {
-        STATUS_CODE: int(WRONG_PASSWORD_ENTERED),
-        MESSAGE: "Wrong password supplied."
-    },
-    PASSWORD_UPDATE_SUCCESS: {
-        STATUS_CODE: int(PASSWORD_UPDATE_SUCCESS),
-        MESSAGE: "Password updated successfully."
-    },
-    USER_PROFILE_UPDATED: {
-        STATUS_CODE: int(USER_PROFILE_UPDATED),
-        MESSAGE: "User detail updated successfully."
-    },
+    SIGNUP_SUCCESS: make_envelope(
+        SIGNUP_SUCCESS, "Account created successfully",
+        status.HTTP_201_CREATED),
+    WRONG_PASSWORD_ENTERED: make_envelope(
+        WRONG_PASSWORD_ENTERED, "Wrong password supplied.",
+        status.HTTP_400_BAD_REQUEST),
+    PASSWORD_UPDATE_SUCCESS: make_envelope(
+        PASSWORD_UPDATE_SUCCESS, "Password updated successfully.",
+        status.HTTP_200_OK),
+    USER_PROFILE_UPDATED: make_envelope(
+        USER_PROFILE_UPDATED, "User detail updated successfully.",
+        status.HTTP_200_OK),
     #course
-    COURSE_CREATED: {
-        STATUS_CODE: int(COURSE_CREATED),
-        MESSAGE: "Course created successfully"
-    },
-    COURSE_UPDATED: {
-        STATUS_CODE: int(COURSE_UPDATED),
-        MESSAGE: "Course updated successfully"
-    },
-    COURSE_DELETED: {
-        STATUS_CODE: int(COURSE_DELETED),
-        MESSAGE: "Course deleted successfully"
-    },
-    COURSE_NOT_FOUND_FOR_USER: {
-        STATUS_CODE: int(COURSE_NOT_FOUND_FOR_USER),
-        MESSAGE: "Course Not found for this user"
-    },
-    USER_ADDED_COURSE: {
-        STATUS_CODE: int(USER_ADDED_COURSE),
-        MESSAGE: "Course added to library successfully"
-    },
-    USER_DELETED_COURSE: {
-        STATUS_CODE: int(USER_DELETED_COURSE),
-        MESSAGE: "Course removed successfully from library"
-    },
+    COURSE_CREATED: make_envelope(
+        COURSE_CREATED, "Course created successfully",
+        status.HTTP_201_CREATED),
+    COURSE_UPDATED: make_envelope(
+        COURSE_UPDATED, "Course updated successfully",
+        status.HTTP_200_OK),
+    COURSE_DELETED: make_envelope(
+        COURSE_DELETED, "Course deleted successfully",
+        status.HTTP_204_NO_CONTENT),
+    COURSE_NOT_FOUND_FOR_USER: make_envelope(
+        COURSE_NOT_FOUND_FOR_USER, "Course Not found for this user",
+        status.HTTP_400_BAD_REQUEST),
+    USER_ADDED_COURSE: make_envelope(
+        USER_ADDED_COURSE, "Course added to library successfully",
+        status.HTTP_201_CREATED),
+    USER_DELETED_COURSE: make_envelope(
+        USER_DELETED_COURSE, "Course removed successfully from library",
+        status.HTTP_204_NO_CONTENT),
+    COURSE_IMPORTED: make_envelope(
+        COURSE_IMPORTED, "Courses imported successfully",
+        status.HTTP_201_CREATED),
+    UPLOAD_SESSION_CREATED: make_envelope(
+        UPLOAD_SESSION_CREATED, "Upload session created successfully",
+        status.HTTP_201_CREATED),
+    UPLOAD_CHUNK_RECEIVED: make_envelope(
+        UPLOAD_CHUNK_RECEIVED, "Chunk received",
+        status.HTTP_200_OK),
+    UPLOAD_OFFSET_MISMATCH: make_envelope(
+        UPLOAD_OFFSET_MISMATCH, "Chunk offset does not match the upload",
+        status.HTTP_409_CONFLICT),
+    UPLOAD_CHECKSUM_MISMATCH: make_envelope(
+        UPLOAD_CHECKSUM_MISMATCH, "Checksum mismatch",
+        status.HTTP_400_BAD_REQUEST),
+    INVALID_UPLOAD_CHUNK: make_envelope(
+        INVALID_UPLOAD_CHUNK, "Invalid chunk",
+        status.HTTP_400_BAD_REQUEST),
+    UPLOAD_INCOMPLETE: make_envelope(
+        UPLOAD_INCOMPLETE, "Upload is incomplete",
+        status.HTTP_400_BAD_REQUEST),
+    UPLOAD_SESSION_FINALIZED: make_envelope(
+        UPLOAD_SESSION_FINALIZED, "Upload has already been finalized",
+        status.HTTP_400_BAD_REQUEST),
+    UPLOAD_PART_UNAVAILABLE: make_envelope(
+        UPLOAD_PART_UNAVAILABLE, "Upload data is not available",
+        status.HTTP_409_CONFLICT),
+    UPLOAD_TARGET_EXISTS: make_envelope(
+        UPLOAD_TARGET_EXISTS, "Upload target already exists",
+        status.HTTP_409_CONFLICT),
     #Course section
-    COURSE_SECTION_CREATED: {
-        STATUS_CODE: int(COURSE_SECTION_CREATED),
-        MESSAGE: "Course Section created successfully"
-    },
-    COURSE_SECTION_UPDATED: {
-        STATUS_CODE: int(COURSE_SECTION_UPDATED),
-        MESSAGE: "Course Section updated successfully"
-    },
-    COURSE_SECTION_DELETED: {
-        STATUS_CODE: int(COURSE_SECTION_DELETED),
-        MESSAGE: "Course Section deleted successfully"
-    },
+    COURSE_SECTION_CREATED: make_envelope(
+        COURSE_SECTION_CREATED, "Course Section created successfully",
+        status.HTTP_201_CREATED),
+    COURSE_SECTION_UPDATED: make_envelope(
+        COURSE_SECTION_UPDATED, "Course Section updated successfully",
+        status.HTTP_200_OK),
+    COURSE_SECTION_DELETED: make_envelope(
+        COURSE_SECTION_DELETED, "Course Section deleted successfully",
+        status.HTTP_204_NO_CONTENT),
     #Course file
-    COURSE_SECTION_FILE_CREATED: {
-        STATUS_CODE: int(COURSE_SECTION_FILE_CREATED),
-        MESSAGE: "Course Section File saved successfully"
-    },
-    COURSE_SECTION_FILE_UPDATED: {
-        STATUS_CODE: int(COURSE_SECTION_FILE_UPDATED),
-        MESSAGE: "Course Section File updated successfully"
-    },
-    COURSE_SECTION_FILE_DELETED: {
-        STATUS_CODE: int(COURSE_SECTION_FILE_DELETED),
-        MESSAGE: "Course Section File deleted successfully"
-    },
+    COURSE_SECTION_FILE_CREATED: make_envelope(
+        COURSE_SECTION_FILE_CREATED, "Course Section File saved successfully",
+        status.HTTP_201_CREATED),
+    COURSE_SECTION_FILE_UPDATED: make_envelope(
+        COURSE_SECTION_FILE_UPDATED, "Course Section File updated successfully",
+        status.HTTP_200_OK),
+    COURSE_SECTION_FILE_DELETED: make_envelope(
+        COURSE_SECTION_FILE_DELETED, "Course Section File deleted successfully",
+        status.HTTP_204_NO_CONTENT),
     # Course Detail Tab
-     COURSE_DETAIL_TAB_CREATED: {
-        STATUS_CODE: int(COURSE_DETAIL_TAB_CREATED),
-        MESSAGE: "Course Detail Tab created successfully"
-    },
-    COURSE_DETAIL_TAB_UPDATED: {
-        STATUS_CODE: int(COURSE_DETAIL_TAB_UPDATED),
-        MESSAGE: "Course Detail Tab updated successfully"
-    },
-    COURSE_DETAIL_TAB_DELETED: {
-        STATUS_CODE: int(COURSE_DETAIL_TAB_DELETED),
-        MESSAGE: "Course Detail Tab deleted successfully"
-    },
+    COURSE_DETAIL_TAB_CREATED: make_envelope(
+       COURSE_DETAIL_TAB_CREATED, "Course Detail Tab created successfully",
+        status.HTTP_201_CREATED),
+    COURSE_DETAIL_TAB_UPDATED: make_envelope(
+        COURSE_DETAIL_TAB_UPDATED, "Course Detail Tab updated successfully",
+        status.HTTP_200_OK),
+    COURSE_DETAIL_TAB_DELETED: make_envelope(
+        COURSE_DETAIL_TAB_DELETED, "Course Detail Tab deleted successfully",
+        status.HTTP_204_NO_CONTENT),
     # Course Detail Tab List
-    COURSE_DETAIL_TAB_LIST_CREATED: {
-        STATUS_CODE: int(COURSE_DETAIL_TAB_LIST_CREATED),
-        MESSAGE: "Course Detail Tab List created successfully"
-    },
-    COURSE_DETAIL_TAB_LIST_UPDATED: {
-        STATUS_CODE: int(COURSE_DETAIL_TAB_LIST_UPDATED),
-        MESSAGE: "Course Detail Tab List updated successfully"
-    },
-    COURSE_DETAIL_TAB_LIST_DELETED: {
-        STATUS_CODE: int(COURSE_DETAIL_TAB_LIST_DELETED),
-        MESSAGE: "Course Detail Tab List deleted successfully"
-    },
+    COURSE_DETAIL_TAB_LIST_CREATED: make_envelope(
+        COURSE_DETAIL_TAB_LIST_CREATED, "Course Detail Tab List created successfully",
+        status.HTTP_201_CREATED),
+    COURSE_DETAIL_TAB_LIST_UPDATED: make_envelope(
+        COURSE_DETAIL_TAB_LIST_UPDATED, "Course Detail Tab List updated successfully",
+        status.HTTP_200_OK),
+    COURSE_DETAIL_TAB_LIST_DELETED: make_envelope(
+        COURSE_DETAIL_TAB_LIST_DELETED, "Course Detail Tab List deleted successfully",
+        status.HTTP_204_NO_CONTENT),
     # Assignment
-    ASSIGNMENT_CREATED: {
-        STATUS_CODE: int(ASSIGNMENT_CREATED),
-        MESSAGE: "Assignment created successfully"
-    },
-    ASSIGNMENT_UPDATED: {
-        STATUS_CODE: int(ASSIGNMENT_UPDATED),
-        MESSAGE: "Assignment updated successfully"
-    },
-    ASSIGNMENT_DELETED: {
-        STATUS_CODE: int(ASSIGNMENT_DELETED),
-        MESSAGE: "Assignment deleted successfully"
-    },
+    ASSIGNMENT_CREATED: make_envelope(
+        ASSIGNMENT_CREATED, "Assignment created successfully",
+        status.HTTP_201_CREATED),
+    ASSIGNMENT_UPDATED: make_envelope(
+        ASSIGNMENT_UPDATED, "Assignment updated successfully",
+        status.HTTP_200_OK),
+    ASSIGNMENT_DELETED: make_envelope(
+        ASSIGNMENT_DELETED, "Assignment deleted successfully",
+        status.HTTP_204_NO_CONTENT),
     # Assignment File
-    ASSIGNMENT_FILE_CREATED: {
-        STATUS_CODE: int(ASSIGNMENT_FILE_CREATED),
-        MESSAGE: "Assignment File saved successfully"
-    },
-    ASSIGNMENT_FILE_UPDATED: {
-        STATUS_CODE: int(ASSIGNMENT_FILE_UPDATED),
-        MESSAGE: "Assignment File updated successfully"
-    },
-    ASSIGNMENT_FILE_DELETED: {
-        STATUS_CODE: int(ASSIGNMENT_FILE_DELETED),
-        MESSAGE: "Assignment File deleted successfully"
-    },
+    ASSIGNMENT_FILE_CREATED: make_envelope(
+        ASSIGNMENT_FILE_CREATED, "Assignment File saved successfully",
+        status.HTTP_201_CREATED),
+    ASSIGNMENT_FILE_UPDATED: make_envelope(
+        ASSIGNMENT_FILE_UPDATED, "Assignment File updated successfully",
+        status.HTTP_200_OK),
+    ASSIGNMENT_FILE_DELETED: make_envelope(
+        ASSIGNMENT_FILE_DELETED, "Assignment File deleted successfully",
+        status.HTTP_204_NO_CONTENT),
     # Assignment File
-    ASSIGNMENT_SOLUTION_CREATED: {
-        STATUS_CODE: int(ASSIGNMENT_SOLUTION_CREATED),
-        MESSAGE: "Assignment Solution Created successfully"
-    },
+    ASSIGNMENT_SOLUTION_CREATED: make_envelope(
+        ASSIGNMENT_SOLUTION_CREATED, "Assignment Solution Created successfully",
+        status.HTTP_201_CREATED),
     # Assignment Solution File
-    ASSIGNMENT_SOLUTION_FILE_UPLOADED: {
-        STATUS_CODE: int(ASSIGNMENT_SOLUTION_FILE_UPLOADED),
-        MESSAGE: "Assignment Solution File Uploaded successfully"
-    },
+    ASSIGNMENT_SOLUTION_FILE_UPLOADED: make_envelope(
+        ASSIGNMENT_SOLUTION_FILE_UPLOADED, "Assignment Solution File Uploaded successfully",
+        status.HTTP_201_CREATED),
     # category
-    CATEGORY_CREATED: {
-        STATUS_CODE: int(CATEGORY_CREATED),
-        MESSAGE: "Category created successfully"
-    },
-    CATEGORY_UPDATED: {
-        STATUS_CODE: int(CATEGORY_UPDATED),
-        MESSAGE: "Category updated successfully"
-    },
-    CATEGORY_DELETED: {
-        STATUS_CODE: int(CATEGORY_DELETED),
-        MESSAGE: "Category deleted successfully"
-    },
+    CATEGORY_CREATED: make_envelope(
+        CATEGORY_CREATED, "Category created successfully",
+        status.HTTP_201_CREATED),
+    CATEGORY_UPDATED: make_envelope(
+        CATEGORY_UPDATED, "Category updated successfully",
+        status.HTTP_200_OK),
+    CATEGORY_DELETED: make_envelope(
+        CATEGORY_DELETED, "Category deleted successfully",
+        status.HTTP_204_NO_CONTENT),
     # category course
-    CATEGORY_COURSE_CREATED: {
-        STATUS_CODE: int(CATEGORY_COURSE_CREATED),
-        MESSAGE: "Category course created successfully"
-    },
-    CATEGORY_COURSE_UPDATED: {
-        STATUS_CODE: int(CATEGORY_COURSE_UPDATED),
-        MESSAGE: "Category course updated successfully"
-    },
-    CATEGORY_COURSE_DELETED: {
-        STATUS_CODE: int(CATEGORY_COURSE_DELETED),
-        MESSAGE: "Category course deleted successfully"
-    },
-
+    CATEGORY_COURSE_CREATED: make_envelope(
+        CATEGORY_COURSE_CREATED, "Category course created successfully",
+        status.HTTP_201_CREATED),
+    CATEGORY_COURSE_UPDATED: make_envelope(
+        CATEGORY_COURSE_UPDATED, "Category course updated successfully",
+        status.HTTP_200_OK),
+    CATEGORY_COURSE_DELETED: make_envelope(
+        CATEGORY_COURSE_DELETED, "Category course deleted successfully",
+        status.HTTP_204_NO_CONTENT),
 }
 
 
+UNKNOWN = make_envelope(
+    "0", "Something Went Wrong", status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+def get_envelope(lookup):
+    return RESPONSE_LOOKUP.get(lookup, UNKNOWN)
+
+
 def get_response_dict(lookup, data=None, substitute=None):
-    response_data = copy(RESPONSE_LOOKUP.get(lookup, {
-        STATUS_CODE: 0,
-        MESSAGE: "Something Went Wrong",
-        DATA: ''
-    }))
-    if data is not None:
-        response_data[DATA] = data
-    if substitute:
-        response_data[MESSAGE] = response_data[MESSAGE] % substitute
-    return response_data
+    envelope = get_envelope(lookup)
+    if envelope is UNKNOWN and data is None:
+        data = ''
+    return envelope.as_dict(data, substitute)
+
+
+def respond(lookup, data=None, status=None, substitute=None, **kwargs):
+    """
+    ``Response`` with the envelope of ``lookup`` around ``data``, sent
+    with the HTTP status of the envelope unless ``status`` is given.
+    """
+    envelope = get_envelope(lookup)
+    return Response(
+        get_response_dict(lookup, data, substitute),
+        status=status or envelope.status,
+        **kwargs
+    )
 
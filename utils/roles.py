@@ -0,0 +1,44 @@
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+
+
+ROLE_CACHE_ALIAS = getattr(settings, 'ROLE_CACHE_ALIAS', 'default')
+ROLE_CACHE_TIMEOUT = getattr(settings, 'ROLE_CACHE_TIMEOUT', 60)
+
+
+def role_key(user_id):
+    return 'role:{}'.format(user_id)
+
+
+def get_cached_role(user_id):
+    """
+    Return ``Profile.role`` of the given user, read through a short lived
+    cache so repeated checks cost at most one query per timeout.
+    """
+    cache = caches[ROLE_CACHE_ALIAS]
+    key = role_key(user_id)
+    role = cache.get(key)
+    if role is None:
+        Profile = apps.get_model('account', 'Profile')
+        role = Profile.objects.filter(
+            user_id=user_id,
+        ).values_list('role', flat=True).first()
+        if role is not None:
+            cache.set(key, role, ROLE_CACHE_TIMEOUT)
+    return role
+
+
+def invalidate_role(user_id):
+    caches[ROLE_CACHE_ALIAS].delete(role_key(user_id))
+
+
+def get_user_role(user):
+    """
+    Return the role of ``user``: the claim of the token it authenticated
+    with when there is one, the role cache otherwise.
+    """
+    role = getattr(user, 'token_role', None)
+    if role is None and user.pk is not None:
+        role = get_cached_role(user.pk)
+    return role
@@ -0,0 +1,67 @@
+import time
+
+from django.core import signing
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.urlresolvers import reverse
+from rest_framework import status
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from . import res_codes
+
+
+LOCAL_UPLOAD_SALT = 'utils.storage.local_upload'
+
+
+class DirectUploadFileSystemStorage(FileSystemStorage):
+    """
+    FileSystemStorage that also hands out upload URLs, so the direct upload
+    flow (``utils.direct_upload``) works without S3, in development and in
+    tests. The URL points at ``LocalUploadView`` with the object name and
+    its expiry signed into it, standing in for an S3 presigned URL.
+    """
+
+    def presigned_upload(self, name, content_type=None, expires_in=None):
+        token = signing.dumps({
+            'name': name,
+            'expires': time.time() + expires_in if expires_in else None,
+        }, salt=LOCAL_UPLOAD_SALT)
+        headers = {}
+        if content_type:
+            headers['Content-Type'] = content_type
+        return {
+            'url': reverse('local_upload', kwargs={'token': token}),
+            'method': 'PUT',
+            'headers': headers,
+        }
+
+
+class LocalUploadView(APIView):
+    """
+    Receives the PUT of a ``DirectUploadFileSystemStorage`` upload URL.
+    The signed URL is the only credential, as with S3.
+    """
+    authentication_classes = ()
+    permission_classes = ()
+
+    def put(self, request, token, *args, **kwargs):
+        if not isinstance(default_storage, DirectUploadFileSystemStorage):
+            raise NotFound(res_codes.get_response_dict(res_codes.NOT_FOUND))
+        try:
+            upload = signing.loads(token, salt=LOCAL_UPLOAD_SALT)
+        except signing.BadSignature:
+            raise NotFound(res_codes.get_response_dict(res_codes.NOT_FOUND))
+        if upload['expires'] is not None and upload['expires'] < time.time():
+            raise NotFound(res_codes.get_response_dict(res_codes.NOT_FOUND))
+        # an upload URL only ever creates the object it was issued for, it
+        # never replaces a file that is already stored under that name
+        if default_storage.exists(upload['name']):
+            return res_codes.respond(res_codes.UPLOAD_TARGET_EXISTS)
+        name = default_storage.save(upload['name'], ContentFile(request.body))
+        if name != upload['name']:
+            # lost a race with a concurrent PUT of the same URL
+            default_storage.delete(name)
+            return res_codes.respond(res_codes.UPLOAD_TARGET_EXISTS)
+        return Response(status=status.HTTP_200_OK)
@@ -0,0 +1,152 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from django.conf import settings
+from django.db import models
+from django.utils.encoding import filepath_to_uri
+from django.utils.functional import LazyObject, empty
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+STORAGE_URL_CACHE_SIZE = getattr(settings, 'STORAGE_URL_CACHE_SIZE', 4096)
+
+
+def unwrap(storage):
+    # default_storage is a LazyObject, key on the storage it stands for
+    if isinstance(storage, LazyObject):
+        if storage._wrapped is empty:
+            storage._setup()
+        return storage._wrapped
+    return storage
+
+
+def storage_key(storage):
+    """
+    What a URL depends on besides the file name: the storage class and
+    where it points to.
+    """
+    return (
+        type(storage),
+        getattr(storage, 'bucket_name', None),
+        getattr(storage, 'custom_domain', None),
+        getattr(storage, 'location', None),
+        getattr(storage, 'base_url', None),
+    )
+
+
+def signed_url_lifetime(storage):
+    """
+    Seconds a URL of ``storage`` stays valid, None when its URLs are not
+    signed and never expire.
+    """
+    if getattr(storage, 'querystring_auth', False) and not getattr(
+            storage, 'custom_domain', None):
+        return storage.querystring_expire
+    return None
+
+
+def public_base_url(storage):
+    """
+    Base of unsigned URLs of an S3 storage whose objects are public
+    (``custom_domain`` set or ``querystring_auth`` off), None otherwise.
+    """
+    if not hasattr(storage, 'bucket_name'):
+        return None
+    if storage.custom_domain:
+        return '{}//{}/'.format(storage.url_protocol, storage.custom_domain)
+    if not storage.querystring_auth:
+        return 'https://{}.s3.amazonaws.com/'.format(storage.bucket_name)
+    return None
+
+
+def build_url(storage, name):
+    """
+    URL of ``name``. Public S3 objects get a plain string URL instead of
+    ``storage.url()``, which without a custom domain signs the URL with
+    boto and then strips the signature again.
+    """
+    base = public_base_url(storage)
+    if base is None:
+        return storage.url(name)
+    return base + filepath_to_uri(
+        storage._normalize_name(storage._clean_name(name)))
+
+
+class StorageURLCache(object):
+    """
+    Bounded LRU cache of storage URLs, keyed by ``(storage, name, expiry
+    bucket)``.
+
+    URLs that never expire sit in a single bucket. Signed URLs are cached
+    per half of their lifetime, so a URL handed out is always valid for at
+    least half of it. The cache lives in the memory of one process.
+    """
+
+    def __init__(self, maxsize=STORAGE_URL_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._urls = OrderedDict()
+        self._lock = Lock()
+
+    def url(self, storage, name):
+        storage = unwrap(storage)
+        lifetime = signed_url_lifetime(storage)
+        bucket = int(time.time() // max(lifetime // 2, 1)) if lifetime else 0
+        key = (storage_key(storage), name, bucket)
+        with self._lock:
+            url = self._urls.get(key)
+            if url is not None:
+                self._urls.move_to_end(key)
+                return url
+        url = build_url(storage, name)
+        with self._lock:
+            self._urls[key] = url
+            while len(self._urls) > self.maxsize:
+                self._urls.popitem(last=False)
+        return url
+
+    def clear(self):
+        with self._lock:
+            self._urls.clear()
+
+    def __len__(self):
+        return len(self._urls)
+
+
+storage_url_cache = StorageURLCache()
+
+
+def storage_url(field_file):
+    """
+    Cached URL of a ``FieldFile``, None when it holds no file.
+    """
+    if not field_file:
+        return None
+    return storage_url_cache.url(field_file.storage, field_file.name)
+
+
+class CachedFileField(serializers.FileField):
+    """
+    ``FileField`` whose URL comes from ``storage_url_cache``.
+    """
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        if not getattr(self, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+            return value.name
+        url = storage_url(value)
+        request = self.context.get('request', None)
+        if request is not None:
+            return request.build_absolute_uri(url)
+        return url
+
+
+class CachedFileURLMixin(object):
+    """
+    Makes a ``ModelSerializer`` render the model's file fields with
+    ``CachedFileField``.
+    """
+    serializer_field_mapping = dict(
+        serializers.ModelSerializer.serializer_field_mapping)
+    serializer_field_mapping[models.FileField] = CachedFileField
@@ -0,0 +1,86 @@
+import json
+from itertools import islice
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+from . import res_codes
+from .pagination import KEYSET_ORDERING, keyset_after
+
+
+STREAM_CHUNK_SIZE = 200
+
+
+def iter_chunks(queryset, chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield lists of at most ``chunk_size`` rows of ``queryset``.
+
+    Plain querysets are read once through ``.iterator()``. ``iterator()``
+    skips ``prefetch_related``, so querysets with prefetches are read in
+    keyset batches on ``(created_at, id)`` instead, each batch with its
+    prefetches applied.
+    """
+    if not queryset._prefetch_related_lookups:
+        rows = queryset.iterator()
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    queryset = queryset.order_by(*KEYSET_ORDERING)
+    position = None
+    while True:
+        batch = queryset
+        if position is not None:
+            batch = keyset_after(batch, *position)
+        chunk = list(batch[:chunk_size])
+        if chunk:
+            yield chunk
+        if len(chunk) < chunk_size:
+            return
+        position = chunk[-1].created_at, chunk[-1].pk
+
+
+def iter_envelope(lookup, queryset, serializer_class, context=None,
+                  chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Yield the ``res_codes`` envelope of ``lookup`` as JSON, with ``data``
+    being ``queryset`` serialized chunk by chunk.
+    """
+    yield res_codes.get_envelope(lookup).prefix + b',"data":['
+    separator = ''
+    for chunk in iter_chunks(queryset, chunk_size):
+        data = serializer_class(chunk, many=True, context=context).data
+        for item in data:
+            yield separator + json.dumps(
+                item, cls=JSONEncoder, separators=(',', ':'))
+            separator = ','
+    yield ']}'
+
+
+class StreamingListMixin(object):
+    """
+    Lets a list view answer ``?stream=1`` with the whole, unpaginated
+    result streamed as one JSON envelope, so memory stays flat however
+    many rows there are.
+    """
+    stream_query_param = 'stream'
+    stream_chunk_size = STREAM_CHUNK_SIZE
+
+    def wants_stream(self, request):
+        value = request.query_params.get(self.stream_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    def get_streaming_response(self, queryset, serializer_class,
+                               lookup=res_codes.SUCCESS):
+        return StreamingHttpResponse(
+            iter_envelope(
+                lookup,
+                queryset,
+                serializer_class,
+                context={'request': self.request, 'view': self},
+                chunk_size=self.stream_chunk_size,
+            ),
+            content_type='application/json',
+        )
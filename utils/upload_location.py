@@ -1,26 +1,58 @@
+"""
+``upload_to`` path builders.
+
+Only the direct parent of the file is read as an object, every id past
+it comes from a ``*_id`` attribute. Serializers hand the parent over
+already loaded (with the relations named below selected), so building a
+path costs no query.
+
+Client file names go through ``clean_filename()`` first, the builders put
+them in the folder of the row as they are.
+"""
+import os
+
+from django.utils.text import get_valid_filename
+
+
+def clean_filename(filename):
+    """
+    The last component of a client supplied ``filename``, reduced to
+    characters safe in a storage name, None when nothing usable is left.
+    """
+    name = get_valid_filename(os.path.basename(filename.replace('\\', '/')))
+    if not name.strip('.'):
+        return None
+    return name
 
 
 def course_file_location(instance, filename):
+    # instance.section: loaded
+    section = instance.section
     return "{}/{}/{}/{}".format(
-        instance.section.course.id,
-        instance.section.id,
+        section.course_id,
+        section.pk,
         instance.id,
         filename,
     )
 
 
 def assignment_file_location(instance, filename):
+    # instance.assignment: loaded
+    assignment = instance.assignment
     return "{}/{}/{}/{}".format(
-        instance.assignment.course.id,
-        instance.assignment.id,
+        assignment.course_id,
+        assignment.pk,
         instance.id,
         filename,
     )
 
+
 def assignment_solution_file_location(instance, filename):
+    # instance.assignment_solution: loaded, with its assignment selected
+    assignment = instance.assignment_solution.assignment
     return "{}/{}/{}/{}".format(
-        instance.assignment_solution.assignment.course.id,
-        instance.assignment_solution.assignment.id,
+        assignment.course_id,
+        assignment.pk,
         instance.id,
         filename,
-    )
\ No newline at end of file
+    )